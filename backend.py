@@ -3,12 +3,17 @@ from monseigneur.mbackend.core.fetcher import Fetcher
 from pytz import timezone
 from googlemaps_matrix.module.constants import LANGUAGES, SHORT_LANGUAGES, COUNTRIES, ratings as RATINGS
 from googlemaps_matrix.module.exceptions import InvalidUrl
+from googlemaps_matrix.module.reparse import ArchiveReparser
+from googlemaps_matrix.results.exports import COLUMNS, OPTIONAL_COLUMNS, WRITERS, CsvResultWriter
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from collections import deque
 import re
 import math
 import logging
 import os
 import sys
-import csv
+import copy
+import time
 from datetime import datetime
 
 
@@ -43,6 +48,30 @@ class Backend():
     # With contact collection enabled
     backend = Backend(collect_contact=True)
 
+    # Enrich 16 results at once, yield them as soon as they are done, stop collecting contacts after 2 minutes
+    backend = Backend(collect_contact=True, contact_workers=16, contact_order="completion", contact_deadline=120)
+
+    # Sweep the whole viewport with concurrent tiles instead of a single 200 results query
+    backend = Backend(tiling=True)
+
+    # Request the listing pages of a search at once instead of one after the other
+    backend = Backend(speculative=True)
+
+    # Keep responses on disk so that overlapping searches are not requested again
+    backend = Backend(http_cache="~/.cache/googlemaps_matrix/http.sqlite")
+
+    # Stop visiting a website once a professional email, a facebook and an instagram are found
+    backend = Backend(collect_contact=True, contact_targets="professional_mail,facebook,instagram")
+
+    # Visit the website of a chain once, its contacts are reused by the other results on its domain
+    backend = Backend(collect_contact=True, contact_cache="~/.cache/googlemaps_matrix/contacts.sqlite")
+
+    # Archive 10% of the responses (and every error) in compressed segments instead of one file per response
+    backend = Backend(archive_dir="~/logging/archive", archive_sample_rate=0.1)
+
+    # Replay the archived responses with 200ms ± 100ms of latency instead of requesting google.com
+    backend = Backend(replay_dir="~/logging/archive", replay_latency=0.2, replay_jitter=0.1)
+
     # Iterate through results
     for result in backend.iter_results():
         print(f"Name: {result.name}, Rating: {result.score}")
@@ -50,6 +79,9 @@ class Backend():
     # Save results to CSV
     results = list(backend.iter_results())
     backend.save_to_csv(results, filename="my_results.csv")
+
+    # Or stream them to CSV/JSONL without keeping them in memory
+    backend.save_results(backend.iter_results(), filename="my_results.jsonl", format="jsonl")
     ```
     """
 
@@ -59,6 +91,9 @@ class Backend():
     DESCRIPTION = "Search for places on Google Maps"
     SHORT_DESCRIPTION = "Search for places on Google Maps"
 
+    # Results read ahead of the contact workers, per worker, to find websites on idle hosts
+    CONTACT_LOOKAHEAD = 4
+
     def __init__(self, *args, **kwargs):
         """
         Initialize the backend with necessary components
@@ -71,6 +106,24 @@ class Backend():
                 - country: Default country code (default: "FR")
                 - collect_contact: Whether to collect contact info from websites (default: True)
                 - default_rating: Default rating filter (default: "Any rating")
+                - tiling: Split the search viewport into concurrent tiles (default: False)
+                - speculative: Request all the listing pages at once (default: False)
+                - http_cache: Path of the SQLite HTTP cache, None to disable it (default: None)
+                - http_cache_size: Bytes of responses kept in the HTTP cache (default: 1 GiB)
+                - contact_cache: Path of the SQLite cache of the contacts of each website domain, None to disable it (default: None)
+                - contact_cache_ttl: Seconds during which cached contacts are reused (default: 7 days)
+                - archive_dir: Directory of the response archive, None to write one file per response (default: None)
+                - archive_sample_rate: Ratio of responses archived, errors are always archived (default: 1.0)
+                - replay_dir: Directory of a response archive to answer requests from, without any network access (default: None)
+                - replay_latency: Mean delay of the replayed responses, in seconds (default: 0)
+                - replay_jitter: Replayed responses are delayed by replay_latency ± replay_jitter seconds (default: 0)
+                - replay_error_rate: Ratio of replayed responses replaced by a 503 error (default: 0)
+                - replay_server: Replay through a local HTTP server instead of an in-process adapter (default: False)
+                - contact_workers: Number of websites visited at once (default: 8)
+                - contact_order: "original" to yield results in search order, "completion" to yield them as soon as enriched (default: "original")
+                - contact_timeout: Seconds allowed to collect the contacts of one result (default: 30)
+                - contact_deadline: Seconds allowed to collect contacts for the whole iteration, None for no limit (default: None)
+                - contact_targets: Contacts after which a website is not visited any further, e.g. "professional_mail,facebook,instagram", None to visit every contact link (default: None)
         """
         # Setup logger
         self.logger = kwargs.get('logger', logging.getLogger(self.APPNAME))
@@ -110,6 +163,26 @@ class Backend():
         self.default_country = kwargs.get('country', 'FR')
         self.default_rating = kwargs.get('default_rating', 'Any rating')
         self.collect_contact = kwargs.get('collect_contact', False)
+        self.tiling = kwargs.get('tiling', False)
+        self.speculative = kwargs.get('speculative', False)
+        self.http_cache = kwargs.get('http_cache', None)
+        self.http_cache_size = kwargs.get('http_cache_size', None)
+        self.contact_cache = kwargs.get('contact_cache', None)
+        self.contact_cache_ttl = kwargs.get('contact_cache_ttl', None)
+        self.archive_dir = kwargs.get('archive_dir', None)
+        self.archive_sample_rate = kwargs.get('archive_sample_rate', 1.0)
+        self.replay_dir = kwargs.get('replay_dir', None)
+        self.replay_latency = kwargs.get('replay_latency', 0)
+        self.replay_jitter = kwargs.get('replay_jitter', 0)
+        self.replay_error_rate = kwargs.get('replay_error_rate', 0)
+        self.replay_server = kwargs.get('replay_server', False)
+        self.contact_workers = kwargs.get('contact_workers', 8)
+        self.contact_order = kwargs.get('contact_order', 'original')
+        self.contact_timeout = kwargs.get('contact_timeout', 30)
+        self.contact_deadline = kwargs.get('contact_deadline', None)
+        self.contact_targets = kwargs.get('contact_targets', None)
+        if self.contact_order not in ('original', 'completion'):
+            raise ValueError(f"Invalid contact_order: {self.contact_order}. Expected 'original' or 'completion'")
         self.special_message = ''
 
 
@@ -121,11 +194,28 @@ class Backend():
             self.fetcher = Fetcher(absolute_path=module_path)
             self.module = self.fetcher.build_backend("module", params={}, logger=self.logger)
             self.logger.info("Backend module initialized successfully")
+            if self.http_cache:
+                self.module.set_http_cache(self.http_cache, self.http_cache_size)
+                self.logger.info(f"Using HTTP cache: {self.http_cache}")
+            if self.contact_cache:
+                self.module.set_contact_cache(self.contact_cache, self.contact_cache_ttl)
+                self.logger.info(f"Using contact cache: {self.contact_cache}")
+            if self.contact_targets:
+                self.module.set_contact_targets(self.contact_targets)
+                self.logger.info(f"Contact targets: {self.contact_targets}")
+            if self.archive_dir:
+                self.module.set_archive(self.archive_dir, self.archive_sample_rate)
+                self.logger.info(f"Archiving responses in: {self.archive_dir}")
+            if self.replay_dir:
+                self.module.set_replay(
+                    self.replay_dir, self.replay_latency, self.replay_jitter, self.replay_error_rate, self.replay_server
+                )
+                self.logger.info(f"Replaying responses from: {self.replay_dir}")
         except Exception as e:
             self.logger.error(f"Failed to initialize backend module: {str(e)}")
             raise
 
-    def go_results(self, url, page=1, language=None, country=None, ratings=None):
+    def go_results(self, url, page=1, language=None, country=None, ratings=None, tiling=None, speculative=None):
         """
         Navigate to search results page
 
@@ -135,6 +225,8 @@ class Backend():
             language: Language code to use (default: None, uses instance default)
             country: Country code to use (default: None, uses instance default)
             ratings: Minimum rating filter (default: None, uses instance default)
+            tiling: Split the viewport into concurrent tiles (default: None, uses instance default)
+            speculative: Request all the listing pages at once (default: None, uses instance default)
 
         Returns:
             Search results page
@@ -144,6 +236,8 @@ class Backend():
         language = language or self.default_language
         country = country or self.default_country
         ratings = ratings or self.default_rating
+        tiling = self.tiling if tiling is None else tiling
+        speculative = self.speculative if speculative is None else speculative
 
         # Validate ratings parameter
         if ratings not in RATINGS:
@@ -169,8 +263,8 @@ class Backend():
 
         # Handle search URLs
         url = url.replace(' ', '%20')
-        self.logger.info(f"Processing search URL: {url} with language={language}, country={country}, ratings={ratings}")
-        return self.module.go_results(url, language, country, page, ratings)
+        self.logger.info(f"Processing search URL: {url} with language={language}, country={country}, ratings={ratings}, tiling={tiling}, speculative={speculative}")
+        return self.module.go_results(url, language, country, page, ratings, tiling=tiling, speculative=speculative)
 
     def fill_details(self, module_session, Result, existing_result_obj, result_obj, module_params, params):
         """
@@ -191,6 +285,20 @@ class Backend():
         result_obj = existing_result_obj or result_obj
         return self.module.fill_result_details(result_obj)
 
+    def fill_results_details(self, results, concurrency=None):
+        """
+        Fill details of several results, fetching their detail pages concurrently
+
+        Args:
+            results: List of result objects to fill
+            concurrency: Number of detail pages fetched at once (default: None, uses GoogleMapsBrowser.DETAIL_WORKERS)
+
+        Returns:
+            List of filled result objects, in the same order
+        """
+        self.logger.info(f"Filling details for {len(results)} results")
+        return self.module.fill_results_details(results, concurrency)
+
     def fill_images(self, module_session, Result, existing_result_obj, result_obj, module_params, params):
         """
         Fill images for a result
@@ -255,6 +363,12 @@ class Backend():
         """
         Iterate through search results
 
+        When contact collection is enabled, websites are visited by a pool of
+        `contact_workers` threads. Results are yielded in search order or in
+        completion order depending on `contact_order`; a result whose contacts
+        are not collected within `contact_timeout` seconds of a worker picking
+        it, or once `contact_deadline` is reached, is yielded without them.
+
         Args:
             *args: Variable length argument list
             **kwargs: Arbitrary keyword arguments
@@ -265,63 +379,185 @@ class Backend():
         self.logger.info("Starting to iterate through results")
 
         try:
-            for result in self.module.iter_results():
+            results = self.module.iter_results()
+            if self.collect_contact:
+                results = self.iter_enriched_results(results)
+            else:
+                results = ((result, '') for result in results)
+
+            for result, special_message in results:
                 self.logger.debug(f"Processing result: {getattr(result, 'name', 'Unknown')}")
-                self.special_message = ''
+                self.special_message = special_message
+                yield result
 
-                # Collect contact information if website is available
-                if self.collect_contact and result.website:
-                    self.logger.debug(f"Collecting contact information from website: {result.website}")
+        except Exception as e:
+            self.logger.error(f"Error iterating through results: {str(e)}")
+            raise
 
-                    # Save original phone number
-                    result_phone = result.phone
+    def iter_enriched_results(self, results):
+        """
+        Collect contacts of results with a bounded pool of workers
 
-                    # Get contacts from website
-                    try:
-                        result = self.module.get_contacts(result)
-                        result.additional_phone = result.phone
-                        result.phone = result_phone
+        Results are read ahead of the workers so that, when the website of the
+        next result is on a throttled host, a result whose host is idle is
+        enriched first.
 
-                        # Add special messages for found contact information
-                        if result.facebook:
-                            word = "Facebook" + ("s" if result.facebook.count(', ') else '')
-                            self.special_message += f'✨ {word} found: {result.facebook} (*)\n'
+        Args:
+            results: Iterable of result objects
 
-                        if result.instagram:
-                            word = "Instagram" + ("s" if result.instagram.count(', ') else '')
-                            self.special_message += f'✨ {word} found: {result.instagram} (*)\n'
+        Yields:
+            (result, special_message) tuples
+        """
+        deadline = time.monotonic() + self.contact_deadline if self.contact_deadline is not None else None
+        lookahead = self.contact_workers * self.CONTACT_LOOKAHEAD
+        results = enumerate(results)
+        queued = deque()
+        running = {}
+        started = {}
+        stuck = set()
+        finished = {}
+        next_index = 0
+        executor = ThreadPoolExecutor(max_workers=self.contact_workers)
+
+        def get_expires(index, now):
+            # the timeout of a result starts once a worker picks it
+            expires = started.get(index, now + self.contact_timeout)
+            return expires if deadline is None else min(expires, deadline)
+
+        def collect(index, result):
+            expires = get_expires(index, time.monotonic())
+            started[index] = expires
+            return self._collect_contacts(result, expires)
+
+        def pick():
+            for position, (index, result) in enumerate(queued):
+                if self.module.is_contact_host_ready(result.website):
+                    break
+            else:
+                position = 0
+            index, result = queued[position]
+            del queued[position]
+            return index, result
+
+        def outcome(result, future):
+            if future.done():
+                return future.result()
+            if not future.cancel():
+                # a running worker cannot be stopped, it holds its thread until it gives up
+                stuck.add(future)
+            self.logger.warning(f"Timed out collecting contacts from website: {result.website}")
+            return result, ''
 
-                        if result.email:
-                            word = "Email" + ("s" if result.email.count(', ') else '')
-                            self.special_message += f'✨ {word} found: {result.email} (*)\n'
+        try:
+            while True:
+                while len(queued) + len(running) + len(finished) < lookahead:
+                    index, result = next(results, (None, None))
+                    if result is None:
+                        break
+                    if not result.website or (deadline is not None and time.monotonic() >= deadline):
+                        finished[index] = (result, '')
+                    else:
+                        queued.append((index, result))
+
+                if queued and deadline is not None and time.monotonic() >= deadline:
+                    while queued:
+                        index, result = queued.popleft()
+                        finished[index] = (result, '')
+
+                stuck.difference_update([future for future in stuck if future.done()])
+                while queued and len(running) + len(stuck) < self.contact_workers:
+                    index, result = pick()
+                    running[index] = (result, executor.submit(collect, index, result))
+
+                if (running or queued) and not (self.contact_order == 'original' and next_index in finished):
+                    now = time.monotonic()
+                    if running:
+                        timeout = max(0, min(get_expires(index, now) for index in running) - now)
+                    else:
+                        # every worker is held by a timed out website
+                        timeout = None if deadline is None else max(0, deadline - now)
+                    wait([future for _, future in running.values()] + list(stuck), timeout=timeout, return_when=FIRST_COMPLETED)
+                    now = time.monotonic()
+                    for index, (result, future) in list(running.items()):
+                        if future.done() or now >= get_expires(index, now):
+                            del running[index]
+                            started.pop(index, None)
+                            finished[index] = outcome(result, future)
+
+                if self.contact_order == 'original':
+                    while next_index in finished:
+                        yield finished.pop(next_index)
+                        next_index += 1
+                else:
+                    for index in list(finished):
+                        yield finished.pop(index)
+
+                if not (queued or running or finished):
+                    break
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
 
-                        self.special_message = self.special_message.strip()
+    def _collect_contacts(self, result, deadline=None):
+        """
+        Collect contacts of a single result from its website
 
-                    except Exception as e:
-                        self.logger.warning(f"Error collecting contacts from {result.website}: {str(e)}")
+        The result is copied so that a result yielded after a timeout is never
+        modified afterwards by its worker.
 
-                yield result
+        Args:
+            result: Result object with a website
+            deadline: time.monotonic() value after which no more page is visited
+
+        Returns:
+            (result, special_message) tuple
+        """
+        self.logger.debug(f"Collecting contact information from website: {result.website}")
+        special_message = ''
+
+        # Save original phone number
+        result_phone = result.phone
+
+        # Get contacts from website
+        try:
+            enriched = self.module.get_contacts(copy.copy(result), deadline=deadline)
+            enriched.additional_phone = enriched.phone
+            enriched.phone = result_phone
+
+            # Add special messages for found contact information
+            if enriched.facebook:
+                word = "Facebook" + ("s" if enriched.facebook.count(', ') else '')
+                special_message += f'✨ {word} found: {enriched.facebook} (*)\n'
+
+            if enriched.instagram:
+                word = "Instagram" + ("s" if enriched.instagram.count(', ') else '')
+                special_message += f'✨ {word} found: {enriched.instagram} (*)\n'
+
+            if enriched.email:
+                word = "Email" + ("s" if enriched.email.count(', ') else '')
+                special_message += f'✨ {word} found: {enriched.email} (*)\n'
+
+            return enriched, special_message.strip()
 
         except Exception as e:
-            self.logger.error(f"Error iterating through results: {str(e)}")
-            raise
+            self.logger.warning(f"Error collecting contacts from {result.website}: {str(e)}")
+            return result, ''
 
-    def save_to_csv(self, results, filename=None, directory=None):
+    def get_output_path(self, filename=None, directory=None, extension="csv"):
         """
-        Save search results to a CSV file with proper column names
+        Build the path of an output file, creating its directory
 
         Args:
-            results: List of result objects to save
-            filename: Optional custom filename (default: googlemaps_results_YYYY-MM-DD_HH-MM-SS.csv)
+            filename: Optional custom filename (default: googlemaps_results_YYYY-MM-DD_HH-MM-SS.<extension>)
             directory: Optional directory to save the file (default: current directory)
+            extension: Extension of the default filename (default: "csv")
 
         Returns:
-            Path to the saved CSV file
+            Path to the output file
         """
         # Generate default filename if not provided
         if not filename:
             timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-            filename = f"googlemaps_results_{timestamp}.csv"
+            filename = f"googlemaps_results_{timestamp}.{extension}"
 
         # Use current directory if not specified
         if not directory:
@@ -330,46 +566,92 @@ class Backend():
         # Create directory if it doesn't exist
         os.makedirs(directory, exist_ok=True)
 
+        return os.path.join(directory, filename)
+
+    def save_results(self, results, filename=None, directory=None, format="csv"):
+        """
+        Stream search results to a file as they are yielded
+
+        Unlike save_to_csv, results are never held in memory: rows use a fixed
+        schema and are written as soon as they come, to a `.part` file which is
+        renamed once every result has been written. No file is left when there
+        is no result.
+
+        Args:
+            results: Iterable of result objects, e.g. backend.iter_results()
+            filename: Optional custom filename (default: googlemaps_results_YYYY-MM-DD_HH-MM-SS.<format>)
+            directory: Optional directory to save the file (default: current directory)
+            format: Output format, one of "csv", "jsonl" or "parquet" (default: "csv")
+
+        Returns:
+            Path to the saved file, None when there was no result to save
+        """
+        if format not in WRITERS:
+            raise ValueError(f"Invalid format: {format}. Available formats: {', '.join(WRITERS)}")
+
+        writer_class = WRITERS[format]
+        filepath = self.get_output_path(filename, directory, writer_class.EXTENSION)
+        self.logger.info(f"Streaming results to {format.upper()}: {filepath}")
+
+        try:
+            with writer_class(filepath) as writer:
+                count = writer.write_all(results)
+                if not count:
+                    writer.discard()
+                    self.logger.warning("No results found to save")
+                    return None
+
+            self.logger.info(f"Successfully saved {count} results to {filepath}")
+            return filepath
+
+        except Exception as e:
+            self.logger.error(f"Error saving results to {format.upper()}: {str(e)}")
+            raise
+
+    def reparse(self, archive_dir, filename=None, directory=None, format="csv", workers=None):
+        """
+        Extract results again from the responses of an archive, without any request
+
+        Listing, detail and website responses are parsed with the current
+        pages by a pool of processes, so that results can be fixed after a
+        change of the Google Maps responses without scraping them again.
+
+        Args:
+            archive_dir: Directory of the response archive (see the archive_dir kwarg)
+            filename: Optional custom filename (default: googlemaps_results_YYYY-MM-DD_HH-MM-SS.<format>)
+            directory: Optional directory to save the file (default: current directory)
+            format: Output format, one of "csv", "jsonl" or "parquet" (default: "csv")
+            workers: Number of processes (default: None, number of CPUs)
+
+        Returns:
+            Path to the saved file, None when there was no result to save
+        """
+        self.logger.info(f"Reparsing responses archived in {archive_dir}")
+        reparser = ArchiveReparser(archive_dir, workers=workers, collect_contact=self.collect_contact, logger=self.logger)
+        return self.save_results(reparser, filename=filename, directory=directory, format=format)
+
+    def save_to_csv(self, results, filename=None, directory=None):
+        """
+        Save search results to a CSV file with proper column names
+
+        Args:
+            results: List of result objects to save
+            filename: Optional custom filename (default: googlemaps_results_YYYY-MM-DD_HH-MM-SS.csv)
+            directory: Optional directory to save the file (default: current directory)
+
+        Returns:
+            Path to the saved CSV file
+        """
         # Full path to the CSV file
-        filepath = os.path.join(directory, filename)
-
-        # Define columns to include in the CSV
-        columns = [
-            'name', 'address', 'city', 'zip_code', 'country', 'phone', 'additional_phone',
-            'email', 'website', 'facebook', 'instagram', 'category', 'score', 'ratings',
-            'opening_hours', 'is_temporarily_closed', 'is_permanently_closed',
-            'lat', 'lng', 'url'
-        ]
-
-        # Optional columns that might not be present in all results
-        optional_columns = [
-            'description', 'price', 'menu', 'booking_link', 'popular_times',
-            'special_category', 'has_owner', 'about', 'poi'
-        ]
+        filepath = self.get_output_path(filename, directory)
 
         self.logger.info(f"Saving {len(results)} results to CSV: {filepath}")
 
         try:
-            with open(filepath, 'w', newline='', encoding='utf-8') as csvfile:
-                writer = csv.writer(csvfile, quoting=csv.QUOTE_MINIMAL)
-
-                # Write header row
-                header = columns + [col for col in optional_columns if any(hasattr(r, col) for r in results)]
-                writer.writerow(header)
-
-                # Write data rows
-                for result in results:
-                    row = []
-                    for column in header:
-                        if hasattr(result, column):
-                            value = getattr(result, column)
-                            # Handle lists and complex objects
-                            if isinstance(value, (list, tuple)):
-                                value = ', '.join(str(v) for v in value)
-                            row.append(value)
-                        else:
-                            row.append('')
-                    writer.writerow(row)
+            # Optional columns are only kept when at least one result has them
+            header = COLUMNS + [col for col in OPTIONAL_COLUMNS if any(hasattr(r, col) for r in results)]
+            with CsvResultWriter(filepath, fields=header) as writer:
+                writer.write_all(results)
 
             self.logger.info(f"Successfully saved results to {filepath}")
             return filepath
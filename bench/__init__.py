@@ -0,0 +1,8 @@
+"""
+Benchmarks of the scraper hot paths
+
+Each module can be run on its own, e.g. `python -m bench.result_memory`,
+and exposes a `run()` function returning its measures as a dict.
+`python -m bench.suite` (or `python run.py bench`) runs all of them and
+compares their measures to the baselines stored in `bench/baselines.json`.
+"""
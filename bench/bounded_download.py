@@ -0,0 +1,125 @@
+"""
+Download of slow, large and non-HTML websites
+
+    python -m bench.bounded_download [pages]
+
+A local HTTP server answers `pages` requests of each kind: an HTML page,
+one sent byte after byte every 20ms (3s) in chunks or with its length
+announced, a 20MB page and a PDF. They are
+downloaded with the read timeout alone, as ContactBrowser did, then within
+the bounds of a BoundedHTTPAdapter (0.5s deadline, 1MB, HTML only).
+"""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+import sys
+import time
+
+import requests
+
+from googlemaps_matrix.module.contact_browser import BoundedHTTPAdapter, TimeoutHTTPAdapter, ContactBrowser
+from bench.fixtures import make_website_html
+
+
+HTML = make_website_html(20000)[1].encode('utf-8')
+DRIP_BYTES = 150
+DRIP_DELAY = 0.02
+LARGE_SIZE = 20 * 1024 * 1024
+
+
+class WebsiteHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        if self.path.startswith('/drip'):
+            self.send_page(b'<' * DRIP_BYTES, 'text/html', delay=DRIP_DELAY)
+        elif self.path.startswith('/length_drip'):
+            self.send_page(b'<' * DRIP_BYTES, 'text/html', delay=DRIP_DELAY, chunked=False)
+        elif self.path.startswith('/large'):
+            self.send_page(b'<p>' + b' ' * LARGE_SIZE + b'</p>', 'text/html')
+        elif self.path.startswith('/pdf'):
+            self.send_page(b'%PDF-1.4' + b' ' * (2 * 1024 * 1024), 'application/pdf')
+        else:
+            self.send_page(HTML, 'text/html; charset=utf-8')
+
+    def send_page(self, body, content_type, delay=None, chunked=True):
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        if chunked:
+            # as dynamic pages are, for the size not to be announced
+            self.send_header('Transfer-Encoding', 'chunked')
+        else:
+            self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        try:
+            step = 1 if delay else 1024 * 1024
+            for index in range(0, len(body), step):
+                chunk = body[index:index + step]
+                self.wfile.write(b'%x\r\n%s\r\n' % (len(chunk), chunk) if chunked else chunk)
+                if delay:
+                    self.wfile.flush()
+                    time.sleep(delay)
+            if chunked:
+                self.wfile.write(b'0\r\n\r\n')
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+
+    def log_message(self, *args):
+        pass
+
+
+class WebsiteServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # connections aborted by the bounded downloads
+        pass
+
+
+def download(session, urls):
+    received = 0
+    errors = 0
+    start = time.perf_counter()
+    for url in urls:
+        try:
+            received += len(session.get(url, timeout=ContactBrowser.TIMEOUT).content)
+        except Exception:
+            errors += 1
+    return time.perf_counter() - start, received, errors
+
+
+def run(pages=2):
+    server = WebsiteServer(('127.0.0.1', 0), WebsiteHandler)
+    Thread(target=server.serve_forever, daemon=True).start()
+    root = 'http://127.0.0.1:%d/' % server.server_address[1]
+    urls = [root + kind for _ in range(pages) for kind in ('page', 'drip', 'length_drip', 'large', 'pdf')]
+
+    measures = {}
+    try:
+        for name, adapter in [
+            ('unbounded', TimeoutHTTPAdapter(timeout=ContactBrowser.TIMEOUT)),
+            ('bounded', BoundedHTTPAdapter(
+                timeout=ContactBrowser.TIMEOUT, max_size=1024 * 1024, deadline=0.5,
+                content_types=ContactBrowser.CONTENT_TYPES,
+            )),
+        ]:
+            session = requests.Session()
+            session.mount('http://', adapter)
+            elapsed, received, errors = download(session, urls)
+            session.close()
+            measures.update({
+                '%s_s' % name: elapsed,
+                '%s_received_bytes' % name: received,
+                '%s_rejected' % name: errors,
+            })
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert measures['bounded_rejected'] == 4 * pages
+    measures['bounded_speedup'] = measures['unbounded_s'] / measures['bounded_s']
+    return measures
+
+
+if __name__ == '__main__':
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 2
+    for key, value in run(pages).items():
+        print('%-24s %10.2f' % (key, value))
@@ -0,0 +1,92 @@
+"""
+Contact collection on searches where websites repeat
+
+    python -m bench.contact_cache [results] [repeat_ratio]
+
+Results are enriched by 8 threads, the way Backend does, from websites
+answered by a ReplayAdapter with 10ms of latency. `repeat_ratio` of the
+results are stores of a chain, on the website of an earlier result, their
+URL carrying tracking parameters. The enrichment is run without contact
+cache, with an empty one and with the cache left by the previous run, as a
+later job would.
+"""
+from concurrent.futures import ThreadPoolExecutor
+import os
+import sys
+import tempfile
+import time
+
+from monseigneur.monseigneur.core.browser.replay import ReplayStore, ReplayProfile
+from googlemaps_matrix.module.contact_cache import ContactCache
+from bench.contacts import make_contact_browser
+from bench.fixtures import make_results, make_website_html
+
+
+def make_chain_websites(results, repeat_ratio, size=20000):
+    """
+    Replay store of the websites of `results`, a ratio of them being the
+    store pages of an earlier website.
+    """
+    store = ReplayStore()
+    sites = []
+    for index, result in enumerate(results):
+        if sites and index % 10 < repeat_ratio * 10:
+            site, html = sites[index % len(sites)]
+            pages = ['%smagasin-%d/' % (site, index)]
+            # as Google gives the websites of chain stores
+            result.website = pages[0] + '?utm_source=google_my_business&utm_medium=organic'
+        else:
+            site, html = make_website_html(size, seed=index)
+            sites.append((site, html))
+            result.website = site
+            pages = [site, site + 'contact', site + 'about-us']
+        for page_url in pages:
+            store.add_response(page_url, html, headers={'Content-Type': 'text/html; charset=utf-8'})
+    return store
+
+
+def enrich(browser, websites, workers=8):
+    requests = []
+    browser.session.hooks['response'].append(lambda response, *args, **kwargs: requests.append(response.url))
+    to_enrich = make_results(len(websites))
+    for result, website in zip(to_enrich, websites):
+        result.website = website
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        enriched = list(executor.map(browser.get_contacts, to_enrich))
+    return time.perf_counter() - start, len(requests), enriched
+
+
+def run(results=100, repeat_ratio=0.3):
+    to_enrich = make_results(results)
+    store = make_chain_websites(to_enrich, repeat_ratio)
+    websites = [result.website for result in to_enrich]
+
+    def make_browser(cache=None):
+        browser = make_contact_browser(store, ReplayProfile(latency=0.01))
+        if cache is not None:
+            browser.set_contact_cache(cache)
+        return browser
+
+    measures = {}
+    uncached_s, measures['uncached_requests'], expected = enrich(make_browser(), websites)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'contacts.sqlite')
+        cached_s, measures['cached_requests'], enriched = enrich(make_browser(ContactCache(path)), websites)
+        assert [result.email for result in enriched] == [result.email for result in expected]
+        warm_s, measures['warm_requests'], _ = enrich(make_browser(ContactCache(path)), websites)
+    measures.update({
+        'uncached_s': uncached_s,
+        'cached_s': cached_s,
+        'warm_s': warm_s,
+        'cached_speedup': uncached_s / cached_s,
+        'warm_speedup': uncached_s / warm_s,
+    })
+    return measures
+
+
+if __name__ == '__main__':
+    results = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    repeat_ratio = float(sys.argv[2]) if len(sys.argv) > 2 else 0.3
+    for key, value in run(results, repeat_ratio).items():
+        print('%-24s %10.2f' % (key, value))
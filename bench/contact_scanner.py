@@ -0,0 +1,49 @@
+"""
+Single pass contact scanner against one regex pass per contact type
+
+    python -m bench.contact_scanner [size ...]
+
+The per-pattern route is the one PersoPage used: seven replaces for the
+obfuscations then Regex.mail over the result, Regex.phone and the four
+social network patterns over the page text. Both must find the same
+contacts on the synthetic website pages.
+"""
+import sys
+
+from googlemaps_matrix.module.regexer import Regex
+from googlemaps_matrix.module.scanner import ContactScanner, deobfuscate
+from bench.dict_selectors import timed
+from bench.fixtures import make_website_html
+
+
+def scan_per_pattern(text):
+    return (
+        Regex.mail.findall(deobfuscate(text)),
+        Regex.phone.findall(text),
+        [regex.findall(text) for regex in (Regex.instagram, Regex.facebook, Regex.twitter, Regex.linkedin)],
+    )
+
+
+def scan_single_pass(text):
+    contacts = ContactScanner().scan(text)
+    return contacts.mails, contacts.phones, [contacts.instagram, contacts.facebook, contacts.twitter, contacts.linkedin]
+
+
+def run(sizes=(100000, 1000000, 5000000), repeat=3):
+    measures = {}
+    for size in sizes:
+        url, html = make_website_html(size)
+        assert scan_single_pass(html) == scan_per_pattern(html)
+        label = '%dk' % (size // 1000)
+        measures['per_pattern_%s_ms' % label] = timed(lambda: scan_per_pattern(html), repeat) * 1e3
+        measures['single_pass_%s_ms' % label] = timed(lambda: scan_single_pass(html), repeat) * 1e3
+        measures['single_pass_%s_speedup' % label] = (
+            measures['per_pattern_%s_ms' % label] / measures['single_pass_%s_ms' % label]
+        )
+    return measures
+
+
+if __name__ == '__main__':
+    sizes = [int(arg) for arg in sys.argv[1:]] or (100000, 1000000, 5000000)
+    for key, value in run(sizes).items():
+        print('%-28s %10.2f' % (key, value))
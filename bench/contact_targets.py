@@ -0,0 +1,48 @@
+"""
+Contact collection stopped once the contact targets are found
+
+    python -m bench.contact_targets [results]
+
+Results are enriched as in bench.contact_cache, each on its own website,
+visiting every contact link then stopping once a professional email, a
+facebook and an instagram are found.
+"""
+import sys
+
+from monseigneur.monseigneur.core.browser.replay import ReplayProfile
+from googlemaps_matrix.module.crawl_policy import ContactTargets
+from bench.contact_cache import enrich, make_chain_websites
+from bench.contacts import make_contact_browser
+from bench.fixtures import make_results
+
+
+TARGETS = 'professional_mail,facebook,instagram'
+
+
+def run(results=50):
+    to_enrich = make_results(results)
+    store = make_chain_websites(to_enrich, 0)
+    websites = [result.website for result in to_enrich]
+
+    def make_browser(targets=None):
+        browser = make_contact_browser(store, ReplayProfile(latency=0.01))
+        browser.set_contact_targets(targets)
+        return browser
+
+    measures = {}
+    all_links_s, measures['all_links_requests'], _ = enrich(make_browser(), websites)
+    targets = ContactTargets.parse(TARGETS)
+    targets_s, measures['targets_requests'], enriched = enrich(make_browser(targets), websites)
+    assert all(result.email and result.facebook and result.instagram for result in enriched)
+    measures.update({
+        'all_links_s': all_links_s,
+        'targets_s': targets_s,
+        'targets_speedup': all_links_s / targets_s,
+    })
+    return measures
+
+
+if __name__ == '__main__':
+    results = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    for key, value in run(results).items():
+        print('%-24s %10.2f' % (key, value))
@@ -0,0 +1,86 @@
+"""
+Contact extraction from websites
+
+    python -m bench.contacts [size]
+
+PersoPage.iter_mails, iter_phones and iter_social_media are run on a large
+website page, then ContactBrowser.get_contacts enriches results whose
+websites (home, contact and about pages) are answered by a ReplayAdapter.
+Host politeness is lifted so that only the browser work is measured.
+"""
+import logging
+import sys
+
+from monseigneur.monseigneur.core.browser.replay import ReplayStore, ReplayAdapter
+from googlemaps_matrix.module.contact_browser import ContactBrowser
+from googlemaps_matrix.module.pages import PersoPage
+from googlemaps_matrix.module.reparse import get_browser
+from bench.dict_selectors import timed
+from bench.fixtures import make_results, make_response, make_website_html
+
+
+class BenchContactBrowser(ContactBrowser):
+    HOST_RATE = 1e6
+    HOST_BURST = 1e6
+
+
+def make_contact_browser(store, profile=None):
+    logger = logging.getLogger('bench')
+    logger.setLevel(logging.ERROR)
+    logger.settings = {'ssl_insecure': False}
+    browser = BenchContactBrowser(logger=logger)
+    browser.save_logs = False
+    ReplayAdapter(store, profile).install(browser.session)
+    return browser
+
+
+def make_websites(results, size):
+    """
+    Replay store of the websites of `results`, which get their website set.
+    """
+    store = ReplayStore()
+    for index, result in enumerate(results):
+        url, html = make_website_html(size, seed=index)
+        result.website = url
+        for page_url in (url, url + 'contact', url + 'about-us'):
+            store.add_response(page_url, html, headers={'Content-Type': 'text/html; charset=utf-8'})
+    return store
+
+
+def run(size=1000000, results=20, website_size=50000, repeat=5):
+    url, html = make_website_html(size)
+    response = make_response(url, html)
+    page = PersoPage(get_browser(), response)
+    counts = {
+        'mails': len(list(page.iter_mails())),
+        'phones': len(list(page.iter_phones())),
+        'social_media': len(list(page.iter_social_media())),
+    }
+
+    measures = {
+        'iter_mails_ms': timed(lambda: list(page.iter_mails()), repeat) * 1e3,
+        'iter_phones_ms': timed(lambda: list(page.iter_phones()), repeat) * 1e3,
+        'iter_social_media_ms': timed(lambda: list(page.iter_social_media()), repeat) * 1e3,
+    }
+
+    to_enrich = make_results(results)
+    store = make_websites(to_enrich, website_size)
+    browser = make_contact_browser(store)
+
+    websites = [result.website for result in to_enrich]
+
+    def enrich():
+        for result, website in zip(make_results(results), websites):
+            result.website = website
+            browser.get_contacts(result)
+
+    measures['get_contacts_ms'] = timed(enrich, 1) / results * 1e3
+    measures['replay_misses'] = browser.session.adapters['https://'].misses
+    measures.update(('page_%s' % key, value) for key, value in counts.items())
+    return measures
+
+
+if __name__ == '__main__':
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    for key, value in run(size).items():
+        print('%-24s %10.2f' % (key, value))
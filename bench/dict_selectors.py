@@ -0,0 +1,60 @@
+"""
+Dict selectors and listing page parsing
+
+    python -m bench.dict_selectors [saved_listing.json]
+
+A listing JSON saved by ListingPage.build_doc (responses directory) can be
+given, a synthetic listing of 200 results is used otherwise.
+"""
+import json
+import sys
+import time
+
+from monseigneur.monseigneur.core.browser.filters.json import Dict
+from googlemaps_matrix.module.pages import ListingPage
+from bench.fixtures import make_listing_doc, make_page
+
+
+# Selectors of the listing fields (googlemaps_matrix.module.fields.LISTING_FIELDS)
+SELECTORS = [
+    '10', '11', '9/3', '9/2', '4/7', '4/8', '39', '183/1/4', '243', '183/1/3', '13', '64/3',
+    '178/0/3', '32/1/1', '7/0', '51/0/1/0', '4/10', '37/1', '34/1', '160/0', '23', '49/1',
+    '75/0/0/2/0/1/2/0', '84/0', '38/0', '89', '42', '78',
+]
+
+
+def timed(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def run(doc=None, repeat=20):
+    if doc is None:
+        doc = make_listing_doc(200)
+    places = [el[14] for el in Dict('0/1', default=[])(doc) if Dict('14/9/3', default=None)(el)]
+
+    def select():
+        for place in places:
+            for selector in SELECTORS:
+                Dict(selector, default=None)(place)
+
+    def parse_page():
+        list(make_page(ListingPage, doc).iter_results())
+
+    lookups = len(places) * len(SELECTORS)
+    return {
+        'results': len(places),
+        'select_us': timed(select, repeat) / lookups * 1e6,
+        'listing_page_ms': timed(parse_page, repeat) * 1e3,
+    }
+
+
+if __name__ == '__main__':
+    doc = None
+    if len(sys.argv) > 1:
+        with open(sys.argv[1]) as f:
+            doc = json.load(f)
+    for key, value in run(doc).items():
+        print('%-24s %10.2f' % (key, value))
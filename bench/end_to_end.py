@@ -0,0 +1,100 @@
+"""
+Search and details end to end, against replayed responses
+
+    python -m bench.end_to_end [latency] [jitter]
+
+A GoogleMapsBrowser lists a search (go_results + iter_results) then fills the
+details of its results, every request being answered by a ReplayAdapter, or
+by a local ReplayServer, with synthetic listing and preview responses. No
+network access is needed, and the same responses are served from a run to
+another.
+"""
+import json
+import logging
+import sys
+import time
+
+from monseigneur.monseigneur.core.browser.replay import ReplayProfile, ReplayStore, ReplayAdapter, ReplayServer
+from googlemaps_matrix.module.browser import GoogleMapsBrowser, LISTING_PAGES, PER_PAGE
+from googlemaps_matrix.module.cache import GoogleMapsFingerprint
+from googlemaps_matrix.module.pages import ListingPage
+from bench.fixtures import make_listing_doc, make_detail_doc, make_page
+
+
+SEARCH_URL = 'https://www.google.com/maps/search/restaurants/@48.8566,2.3522,14z'
+JSON_HEADERS = {'Content-Type': 'application/json; charset=utf-8'}
+
+
+def make_browser():
+    logger = logging.getLogger('bench')
+    logger.setLevel(logging.WARNING)
+    logger.settings = {'ssl_insecure': False}
+    browser = GoogleMapsBrowser(logger=logger)
+    browser.save_logs = False
+    browser.contact_collector.save_logs = False
+    # listing pages save their JSON, which has nowhere to go without logs
+    browser.save_custom_response = lambda content, ext, precision='': None
+    browser.language = 'en'
+    browser.country = 'US'
+    return browser
+
+
+def make_store(browser, url=SEARCH_URL):
+    """
+    Listing pages of `url` and the previews of their results, as browser
+    would request them.
+    """
+    store = ReplayStore(GoogleMapsFingerprint())
+    search_term, lat, lng, zoom = browser.extract_params(url)
+    alt = browser.zoom_to_alt(lat, zoom)
+    for page in range(LISTING_PAGES):
+        doc = make_listing_doc(PER_PAGE, seed=page)
+        listing_url = browser.build_listing_url(search_term, lat, lng, alt, page * PER_PAGE)
+        store.add_response(listing_url, ")]}'\n" + json.dumps(doc), headers=JSON_HEADERS)
+        for index, result in enumerate(make_page(ListingPage, doc).iter_results()):
+            place = make_detail_doc(index, seed=page * PER_PAGE)
+            place[10] = result.zero_x
+            store.add_response(browser.build_result_url(result), ")]}'\n" + json.dumps([None] * 6 + [place]), headers=JSON_HEADERS)
+    return store
+
+
+def scrape(browser, url=SEARCH_URL, speculative=False):
+    start = time.perf_counter()
+    browser.go_results(url, 'en', 'US', 1, speculative=speculative)
+    results = list(browser.iter_results())
+    listed = time.perf_counter()
+    browser.fill_results_details(results)
+    done = time.perf_counter()
+    return results, listed - start, done - listed
+
+
+def run(latency=0.05, jitter=0.02, server=False, speculative=False):
+    browser = make_browser()
+    store = make_store(browser)
+    profile = ReplayProfile(latency=latency, jitter=jitter, seed=0)
+    if server:
+        transport = ReplayServer(store, profile).start()
+    else:
+        transport = ReplayAdapter(store, profile)
+    browser.set_replay(transport)
+    try:
+        results, listing_time, details_time = scrape(browser, speculative=speculative)
+    finally:
+        if server:
+            transport.stop()
+    return {
+        'results': len(results),
+        'misses': transport.misses,
+        'listing_s': listing_time,
+        'details_s': details_time,
+        'results_per_s': len(results) / (listing_time + details_time),
+    }
+
+
+if __name__ == '__main__':
+    latency = float(sys.argv[1]) if len(sys.argv) > 1 else 0.05
+    jitter = float(sys.argv[2]) if len(sys.argv) > 2 else latency / 2
+    for server in (False, True):
+        print('server' if server else 'adapter')
+        for key, value in run(latency, jitter, server=server).items():
+            print('  %-16s %10.3f' % (key, value))
@@ -0,0 +1,53 @@
+"""
+CSV exports of detailed results
+
+    python -m bench.exports [rows ...]
+
+Backend.save_to_csv, which holds the results, against Backend.save_results
+streaming them, at 10k and 100k rows by default. The backend is not
+initialized, as exports do not use its module.
+"""
+import logging
+import os
+import sys
+import tempfile
+import time
+
+from backend import Backend
+from bench.fixtures import make_detailed_result
+
+
+def make_backend():
+    backend = Backend.__new__(Backend)
+    backend.logger = logging.getLogger('bench')
+    backend.logger.setLevel(logging.WARNING)
+    return backend
+
+
+def run(rows=(10000, 100000)):
+    backend = make_backend()
+    template = [make_detailed_result(index) for index in range(1000)]
+    measures = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for count in rows:
+            results = [template[index % len(template)] for index in range(count)]
+
+            start = time.perf_counter()
+            path = backend.save_to_csv(results, filename='save_to_csv.csv', directory=directory)
+            elapsed = time.perf_counter() - start
+            measures['save_to_csv_%dk_s' % (count // 1000)] = elapsed
+            measures['save_to_csv_%dk_rows_per_s' % (count // 1000)] = count / elapsed
+            os.remove(path)
+
+            start = time.perf_counter()
+            path = backend.save_results(iter(results), filename='save_results.csv', directory=directory)
+            elapsed = time.perf_counter() - start
+            measures['save_results_%dk_s' % (count // 1000)] = elapsed
+            os.remove(path)
+    return measures
+
+
+if __name__ == '__main__':
+    rows = [int(arg) for arg in sys.argv[1:]] or (10000, 100000)
+    for key, value in run(rows).items():
+        print('%-32s %12.2f' % (key, value))
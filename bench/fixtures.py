@@ -0,0 +1,266 @@
+"""
+Synthetic data shared by the benchmarks
+"""
+from collections import OrderedDict
+from datetime import timedelta
+import base64
+import json
+import logging
+import random
+import string
+
+from requests.models import Request, Response
+
+from googlemaps_matrix.results.models import Result
+
+
+CATEGORIES = ['Restaurant', 'Cafe', 'Bakery', 'Hotel', 'Bar', 'Florist', 'Hair salon', 'Pharmacy']
+CITIES = ['Paris', 'Lyon', 'Marseille', 'Bordeaux', 'Lille', 'Nantes']
+
+
+def random_word(rng, length=8):
+    return ''.join(rng.choice(string.ascii_lowercase) for _ in range(length))
+
+
+def make_result_kwargs(index, rng):
+    """
+    Fields of a listing result as filled by ListingPage, without details
+    """
+    name = '%s %s' % (random_word(rng).capitalize(), random_word(rng, 5).capitalize())
+    return dict(
+        zero_x='0x%x:0x%x' % (rng.getrandbits(60), rng.getrandbits(60)),
+        cid=str(rng.getrandbits(63)),
+        name=name,
+        address='%d rue %s, %05d %s' % (rng.randint(1, 200), random_word(rng), rng.randint(1000, 95999), rng.choice(CITIES)),
+        country='France',
+        country_code='FR',
+        city=rng.choice(CITIES),
+        lat=48.8 + rng.random() / 10,
+        lng=2.3 + rng.random() / 10,
+        url='https://www.google.com/maps/place/%s' % name.replace(' ', '+'),
+        ratings=rng.randint(0, 5000),
+        score=round(rng.uniform(1, 5), 1),
+        category=rng.choice(CATEGORIES),
+        phone='+33 1 %02d %02d %02d %02d' % tuple(rng.randint(0, 99) for _ in range(4)),
+        website='https://www.%s.fr/' % random_word(rng),
+        opening_hours='Monday 9AM-7PM, Tuesday 9AM-7PM',
+        images_count=rng.randint(0, 300),
+    )
+
+
+def make_results(count, seed=0):
+    rng = random.Random(seed)
+    return [Result(**make_result_kwargs(index, rng)) for index in range(count)]
+
+
+def make_detailed_result(index=0, seed=0):
+    """
+    A result after fill_result_details and contact collection
+    """
+    rng = random.Random(seed + index)
+    result = Result(**make_result_kwargs(index, rng))
+    result.images = ['https://lh5.googleusercontent.com/p/%s' % random_word(rng, 40) for _ in range(5)]
+    result.about = json.dumps({'about_description': random_word(rng, 60), 'Service options': ['Dine-in', 'Takeout']})
+    result.email = 'contact@%s.fr' % random_word(rng)
+    return result
+
+
+def set_path(doc, path, value):
+    """
+    Set `value` at a '/' separated list path, growing the nested lists as needed
+    """
+    keys = [int(key) for key in path.split('/')]
+    for key in keys[:-1]:
+        while len(doc) <= key:
+            doc.append(None)
+        if doc[key] is None:
+            doc[key] = []
+        doc = doc[key]
+    while len(doc) <= keys[-1]:
+        doc.append(None)
+    doc[keys[-1]] = value
+
+
+def make_listing_place(index, rng):
+    kwargs = make_result_kwargs(index, rng)
+    place = []
+    set_path(place, '10', kwargs['zero_x'])
+    set_path(place, '11', kwargs['name'])
+    set_path(place, '9/2', kwargs['lat'])
+    set_path(place, '9/3', kwargs['lng'])
+    set_path(place, '4/7', kwargs['score'])
+    set_path(place, '4/8', kwargs['ratings'])
+    set_path(place, '39', kwargs['address'])
+    set_path(place, '183/1/3', kwargs['city'])
+    set_path(place, '183/1/4', '75001')
+    set_path(place, '243', 'FR')
+    set_path(place, '13', [kwargs['category']])
+    set_path(place, '178/0/3', kwargs['phone'])
+    set_path(place, '7/0', '/url?q=%s&opi=1' % kwargs['website'])
+    set_path(place, '51/0/1/0', random_word(rng, 40))
+    set_path(place, '37/1', kwargs['images_count'])
+    set_path(place, '34/1', [[day, ['9AM-7PM']] for day in ('Monday', 'Tuesday', 'Wednesday')])
+    set_path(place, '49/1', 'Claim this business' if index % 4 else '')
+    set_path(place, '78', 'ChIJ' + random_word(rng, 23))
+    set_path(place, '84/0', [[None, [[None, rng.randint(0, 100), None, None, '%dh' % hour] for hour in range(8, 20)]] for _ in range(7)])
+    return place
+
+
+def make_listing_doc(count=200, seed=0):
+    """
+    A listing response shaped like the ones parsed by ListingPage, after build_doc
+    """
+    rng = random.Random(seed)
+    doc = []
+    set_path(doc, '0/1', [[None] * 14 + [make_listing_place(index, rng)] for index in range(count)])
+    return doc
+
+
+def make_page(page_class, doc):
+    """
+    A page holding `doc`, without browser nor response, for parsing benchmarks
+    """
+    page = page_class.__new__(page_class)
+    page.browser = None
+    page.response = None
+    page.url = None
+    page.params = {}
+    page.logger = logging.getLogger(page_class.__name__.lower())
+    page.doc = doc
+    return page
+
+
+def make_detail_doc(index=0, seed=0):
+    """
+    A place preview response shaped like the ones parsed by DetailPage, after build_doc
+    """
+    rng = random.Random(seed + index)
+    place = make_listing_place(index, rng)
+    set_path(place, '32', [None, [None, random_word(rng, 40)], [random_word(rng, 30), 'https://example.com']])
+    set_path(place, '100/1', [
+        ['service_options', 'Service options', [[None, 'Dine-in', None, 1], [None, 'Takeout', None, 0]]],
+        ['health_and_safety', 'Health & safety', [[None, 'Mask required', None, 1]]],
+    ])
+    set_path(place, '64/2', [[None, None, 'Wi-Fi', 1], [None, None, 'Parking', 0]])
+    set_path(place, '96/5', [[None, None, None, 'Open now']])
+    set_path(place, '183/2/2/0', '8FW4V75V+8Q')
+    set_path(place, '203/5/0', 'Updated by this business 2 weeks ago')
+    set_path(place, '38/0', '/url?q=https://menu.example.com/&opi=2')
+    return place
+
+
+def make_response(url, content, content_type='text/html; charset=utf-8'):
+    """
+    A response received from `url`, to build pages from
+    """
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    response = Response()
+    response.status_code = 200
+    response.reason = 'OK'
+    response.headers['Content-Type'] = content_type
+    response.encoding = 'utf-8'
+    response.url = url
+    response.request = Request('GET', url).prepare()
+    response._content = content
+    response._content_consumed = True
+    response.elapsed = timedelta(0)
+    return response
+
+
+def make_website_html(size=500000, seed=0):
+    """
+    A website page of about `size` characters: paragraphs of text with
+    contacts spread across them, as links, attributes, plain and obfuscated
+    text, the way PersoPage finds them
+    """
+    rng = random.Random(seed)
+    domain = '%s.fr' % random_word(rng)
+    blocks = [
+        '<!DOCTYPE html><html><head><title>%s</title>' % domain,
+        '<meta name="description" content="Contact us at hello@%s">' % domain,
+        '</head><body><nav><a href="/contact">Contact</a> <a href="/about-us">About us</a></nav>',
+    ]
+    length = sum(len(block) for block in blocks)
+    index = 0
+    while length < size:
+        words = ' '.join(random_word(rng, rng.randint(2, 10)) for _ in range(80))
+        kind = index % 8
+        if kind == 0:
+            contact = '<a href="mailto:%s@%s">Write us</a>' % (random_word(rng, 6), domain)
+        elif kind == 1:
+            contact = '<span> +33 1 %02d %02d %02d %02d </span>' % tuple(rng.randint(0, 99) for _ in range(4))
+        elif kind == 2:
+            contact = '<p>%s [at] %s [dot] fr</p>' % (random_word(rng, 6), domain[:-3])
+        elif kind == 3:
+            contact = '<a href="https://www.facebook.com/%s">Facebook</a>' % random_word(rng)
+        elif kind == 4:
+            contact = '<a href="https://www.instagram.com/%s/">Instagram</a>' % random_word(rng)
+        elif kind == 5:
+            contact = '<input type="hidden" value="%s@gmail.com">' % random_word(rng, 7)
+        elif kind == 6:
+            contact = '<a href="https://www.linkedin.com/company/%s">LinkedIn</a>' % random_word(rng)
+        else:
+            contact = '<span data-email="%s@%s">mail</span> <span>(0)6 %02d %02d %02d %02d</span>' % (
+                random_word(rng, 5), domain, *(rng.randint(0, 99) for _ in range(4)))
+        block = '<div class="section"><p>%s</p>%s</div>\n' % (words, contact)
+        blocks.append(block)
+        length += len(block)
+        index += 1
+    blocks.append('</body></html>')
+    return 'https://www.%s/' % domain, ''.join(blocks)
+
+
+def repeat_to(size, make_block):
+    blocks = []
+    length = 0
+    while length < size:
+        block = make_block(len(blocks))
+        blocks.append(block)
+        length += len(block)
+    return ''.join(blocks)
+
+
+def make_pathological_texts(size=200000, seed=0):
+    """
+    Pages of about `size` characters on which the contact patterns backtrack
+    or read far: minified scripts, base64 blobs, long runs of word
+    characters around at signs, digit runs and links without an end
+    """
+    rng = random.Random(seed)
+    identifiers = [random_word(rng, rng.randint(1, 12)) for _ in range(200)]
+    blob = base64.b64encode(bytes(rng.getrandbits(8) for _ in range(size))).decode('ascii')
+    return OrderedDict([
+        ('minified_js', repeat_to(size, lambda index: '%s.%s(%s@%s,0%d)||' % (
+            identifiers[index % 200], identifiers[index * 7 % 200], identifiers[index * 3 % 200],
+            identifiers[index * 11 % 200], index % 10))),
+        ('base64_blob', '<img src="data:image/png;base64,%s">' % blob[:size]),
+        ('word_runs', repeat_to(size, lambda index: '%s@%s ' % ('w' * 500, 'x' * 500))),
+        ('long_domains', repeat_to(size, lambda index: 'contact@%s.%s.%s%s' % (
+            'd' * 99, 'a' * 99, 'b' * 300, ' ' if index % 10 == 0 else '!'))),
+        ('digit_runs', repeat_to(size, lambda index: '"0' + ' 12' * 500)),
+        ('unclosed_links', repeat_to(size, lambda index: 'href="https://www.facebook.com/%s ' % ('p' * 3000))),
+    ])
+
+
+def make_links_html(links=20000, seed=0):
+    """
+    A website page holding `links` links, a few of them to email addresses,
+    with meta tags and form values, the way large catalogue pages are
+    """
+    rng = random.Random(seed)
+    domain = '%s.fr' % random_word(rng)
+    blocks = [
+        '<!DOCTYPE html><html><head><title>%s</title>' % domain,
+        '<meta name="description" content="Contact us at hello@%s">' % domain,
+        '<meta property="og:image" content="https://www.%s/static/%s.jpg">' % (domain, random_word(rng)),
+        '</head><body><form><input type="hidden" name="data" value="%s"></form><ul>' % random_word(rng, 32),
+    ]
+    for index in range(links):
+        if index % 1000 == 0:
+            href = 'mailto:%s@%s' % (random_word(rng, 6), domain)
+        else:
+            href = 'https://www.%s/category/%s/%s-%d' % (domain, random_word(rng, 5), random_word(rng), index)
+        blocks.append('<li><a href="%s" data-path="%s">%s</a></li>' % (href, random_word(rng, 4), random_word(rng)))
+    blocks.append('</ul></body></html>')
+    return 'https://www.%s/' % domain, ''.join(blocks)
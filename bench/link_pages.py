@@ -0,0 +1,59 @@
+"""
+Email extraction on pages with many links
+
+    python -m bench.link_pages [links ...]
+
+PersoPage.iter_mails against the route it used to take: the values of every
+href, data-email, content and value attribute appended to the page text one
+by one, seven replaces for the obfuscations, then Regex.mail over the
+result. Both must find the same emails on pages of 10k and 50k links.
+"""
+import sys
+
+from googlemaps_matrix.module.pages import PersoPage
+from googlemaps_matrix.module.regexer import Regex
+from googlemaps_matrix.module.reparse import get_browser
+from googlemaps_matrix.module.scanner import deobfuscate
+from bench.dict_selectors import timed
+from bench.fixtures import make_links_html, make_response
+
+
+def iter_mails_concatenated(page):
+    content = page.response.text
+    for element in page.doc.xpath('//*[@href or @data-email or @content or @value]'):
+        for attr in ['href', 'data-email', 'content', 'value']:
+            attr_value = element.get(attr, '')
+            if attr_value:
+                content += ' ' + attr_value
+    return Regex.mail.findall(deobfuscate(content))
+
+
+def iter_mails(page):
+    # the text is scanned again at each call
+    page._scanned_contacts = None
+    return [contact.value for contact in page.iter_mails()]
+
+
+def run(links=(10000, 50000), repeat=3):
+    measures = {}
+    for count in links:
+        url, html = make_links_html(count)
+        page = PersoPage(get_browser(), make_response(url, html))
+        expected = set(filter(None, map(page.normalize_email, iter_mails_concatenated(page))))
+        found = iter_mails(page)
+        assert set(found) == expected
+
+        label = '%dk' % (count // 1000)
+        measures['concatenated_%s_ms' % label] = timed(lambda: iter_mails_concatenated(page), repeat) * 1e3
+        measures['iter_mails_%s_ms' % label] = timed(lambda: iter_mails(page), repeat) * 1e3
+        measures['iter_mails_%s_speedup' % label] = (
+            measures['concatenated_%s_ms' % label] / measures['iter_mails_%s_ms' % label]
+        )
+        measures['mails_%s' % label] = len(found)
+    return measures
+
+
+if __name__ == '__main__':
+    links = [int(arg) for arg in sys.argv[1:]] or (10000, 50000)
+    for key, value in run(links).items():
+        print('%-28s %10.2f' % (key, value))
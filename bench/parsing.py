@@ -0,0 +1,49 @@
+"""
+Listing and detail pages, from the raw response to the results
+
+    python -m bench.parsing
+
+ListingPage is built from a 200 results response (build_doc + iter_results),
+DetailPage from a place preview response (build_doc + get_result), both
+through the real Page constructors.
+"""
+import json
+
+from googlemaps_matrix.module.pages import ListingPage, DetailPage
+from googlemaps_matrix.module.reparse import get_browser
+from bench.dict_selectors import timed
+from bench.fixtures import make_listing_doc, make_detail_doc, make_response
+
+
+LISTING_URL = 'https://www.google.com/search?tbm=map&q=restaurants'
+DETAIL_URL = 'https://www.google.com/maps/preview/place?q=restaurant'
+
+
+def run(results=200, details=50, repeat=10):
+    browser = get_browser()
+    listing = make_response(LISTING_URL, ")]}'\n" + json.dumps(make_listing_doc(results)), 'application/json')
+    previews = [
+        make_response(DETAIL_URL, ")]}'\n" + json.dumps([None] * 6 + [make_detail_doc(index)]), 'application/json')
+        for index in range(details)
+    ]
+    assert len(list(ListingPage(browser, listing).iter_results())) == results
+
+    def parse_listing():
+        list(ListingPage(browser, listing).iter_results())
+
+    def parse_details():
+        for response in previews:
+            DetailPage(browser, response).get_result()
+
+    listing_time = timed(parse_listing, repeat)
+    details_time = timed(parse_details, repeat)
+    return {
+        'listing_page_ms': listing_time * 1e3,
+        'listing_results_per_s': results / listing_time,
+        'detail_page_ms': details_time / details * 1e3,
+    }
+
+
+if __name__ == '__main__':
+    for key, value in run().items():
+        print('%-24s %10.2f' % (key, value))
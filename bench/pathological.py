@@ -0,0 +1,36 @@
+"""
+Contact extraction on pathological pages
+
+    python -m bench.pathological [size]
+
+The per-pattern route of bench.contact_scanner against ContactScanner on
+pages where the contact patterns backtrack or read up to the end of the
+page (see fixtures.make_pathological_texts). Both must find the same
+contacts, except for the links longer than ContactScanner.LINK_MAX which
+only the scanner drops.
+"""
+import sys
+
+from bench.contact_scanner import scan_per_pattern, scan_single_pass
+from bench.dict_selectors import timed
+from bench.fixtures import make_pathological_texts
+
+
+def run(size=200000, repeat=3):
+    measures = {}
+    for name, text in make_pathological_texts(size).items():
+        expected = scan_per_pattern(text)
+        found = scan_single_pass(text)
+        assert found[:2] == expected[:2]
+        if name != 'unclosed_links':
+            assert found == expected
+        measures['%s_per_pattern_ms' % name] = timed(lambda: scan_per_pattern(text), repeat) * 1e3
+        measures['%s_single_pass_ms' % name] = timed(lambda: scan_single_pass(text), repeat) * 1e3
+        measures['%s_speedup' % name] = measures['%s_per_pattern_ms' % name] / measures['%s_single_pass_ms' % name]
+    return measures
+
+
+if __name__ == '__main__':
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    for key, value in run(size).items():
+        print('%-32s %10.2f' % (key, value))
@@ -0,0 +1,97 @@
+"""
+Place field tables against the ItemElement route
+
+    python -m bench.place_fields [saved_listing.json]
+
+Both parsers are driven by the same field table (googlemaps_matrix.module.fields):
+`extract_place` runs it in one loop, the ItemElement is generated with one
+`obj_*` method per field, selecting paths with Dict filters as the pages did.
+A listing JSON saved by ListingPage.build_doc (responses directory) can be
+given, a synthetic listing of 200 results is used otherwise.
+"""
+import json
+import sys
+
+from monseigneur.monseigneur.core.browser.elements import ItemElement
+from monseigneur.monseigneur.core.browser.filters.json import Dict
+from googlemaps_matrix.module.fields import LISTING_FIELDS, DETAIL_FIELDS, extract_place
+from googlemaps_matrix.module.pages import DetailPage
+from googlemaps_matrix.results.models import Result
+from bench.dict_selectors import timed
+from bench.fixtures import make_listing_doc, make_detail_doc, make_page
+
+
+def make_obj_method(field):
+    selector = field.path
+
+    def obj_method(self):
+        if field.keep and getattr(self.obj, field.name):
+            return getattr(self.obj, field.name)
+        if field.compute is not None:
+            return field.compute(self.el, self.obj)
+        if field.required:
+            value = Dict(selector)(self)
+        else:
+            value = Dict(selector, default=field.default)(self)
+        if field.transform is not None:
+            value = field.transform(value)
+        return value
+    return obj_method
+
+
+def make_item_element(fields):
+    attrs = {'klass': Result}
+    for field in fields:
+        attrs['obj_%s' % field.name] = make_obj_method(field)
+    return type('PlaceElement', (ItemElement,), attrs)
+
+
+def run(doc=None, repeat=20):
+    if doc is None:
+        doc = make_listing_doc(200)
+    places = [el[14] for el in Dict('0/1', default=[])(doc) if Dict('14/9/3', default=None)(el)]
+    details = [make_detail_doc(index) for index in range(len(places))]
+    listing_element = make_item_element(LISTING_FIELDS)
+    detail_element = make_item_element(DETAIL_FIELDS)
+    page = make_page(DetailPage, None)
+
+    for place in places[:10]:
+        assert extract_place(place, LISTING_FIELDS).to_dict() == listing_element(page, None, place)().to_dict()
+    for place in details[:10]:
+        assert extract_place(place, DETAIL_FIELDS).to_dict() == detail_element(page, None, place)().to_dict()
+
+    def listing_table():
+        for place in places:
+            extract_place(place, LISTING_FIELDS)
+
+    def listing_element_route():
+        for place in places:
+            listing_element(page, None, place)()
+
+    def detail_table():
+        for place in details:
+            extract_place(place, DETAIL_FIELDS)
+
+    def detail_element_route():
+        for place in details:
+            detail_element(page, None, place)()
+
+    results = {
+        'results': len(places),
+        'listing_table_us': timed(listing_table, repeat) / len(places) * 1e6,
+        'listing_element_us': timed(listing_element_route, repeat) / len(places) * 1e6,
+        'detail_table_us': timed(detail_table, repeat) / len(details) * 1e6,
+        'detail_element_us': timed(detail_element_route, repeat) / len(details) * 1e6,
+    }
+    results['listing_speedup'] = results['listing_element_us'] / results['listing_table_us']
+    results['detail_speedup'] = results['detail_element_us'] / results['detail_table_us']
+    return results
+
+
+if __name__ == '__main__':
+    doc = None
+    if len(sys.argv) > 1:
+        with open(sys.argv[1]) as f:
+            doc = json.load(f)
+    for key, value in run(doc).items():
+        print('%-24s %10.2f' % (key, value))
@@ -0,0 +1,64 @@
+"""
+Bytes per Result, slotted model against the former __dict__ layout
+
+    python -m bench.result_memory [count]
+"""
+import random
+import sys
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+from googlemaps_matrix.results.models import Result, RESULT_FIELDS, RESULT_CONTAINERS
+from bench.fixtures import make_result_kwargs
+
+
+def make_dict_result(**kwargs):
+    """
+    Result as it was stored before __slots__: every field in a per-instance
+    __dict__ and every container allocated
+    """
+    data = dict.fromkeys(RESULT_FIELDS)
+    data.update(kwargs)
+    for name, factory in RESULT_CONTAINERS.items():
+        data[name] = data[name] or factory()
+    return SimpleNamespace(**data)
+
+
+def measure(factory, all_kwargs):
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    objs = [factory(**kwargs) for kwargs in all_kwargs]
+    size = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    del objs
+    return size / len(all_kwargs)
+
+
+def run(count=100000):
+    rng = random.Random(0)
+    # Field values are built beforehand, only the objects themselves are measured
+    all_kwargs = [make_result_kwargs(index, rng) for index in range(count)]
+
+    results = [Result(**kwargs) for kwargs in all_kwargs]
+    start = time.perf_counter()
+    dicts = [result.to_dict() for result in results]
+    to_dict_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for data in dicts:
+        Result.from_dict(data)
+    from_dict_time = time.perf_counter() - start
+    del results, dicts
+
+    return {
+        'dict_bytes_per_result': measure(make_dict_result, all_kwargs),
+        'slots_bytes_per_result': measure(Result, all_kwargs),
+        'to_dict_us': to_dict_time / count * 1e6,
+        'from_dict_us': from_dict_time / count * 1e6,
+    }
+
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    for key, value in run(count).items():
+        print('%-24s %10.1f' % (key, value))
@@ -0,0 +1,173 @@
+"""
+Every benchmark, compared to stored baselines
+
+    python -m bench.suite [--save-baseline] [--baseline baselines.json] [--threshold 0.25] [name ...]
+
+or `python run.py bench`. Measures are compared to the baseline file and a
+metric moving the wrong way by more than its threshold is reported as a
+regression: timings (`_s`, `_ms`, `_us`) and sizes (`_bytes`) must not grow,
+rates (`_per_s`) and speedups must not drop, other metrics are only shown.
+Thresholds can be set per metric in the `thresholds` of the baseline file,
+e.g. `"contacts.get_contacts_ms": 0.5`.
+
+Baselines only hold for the machine they were saved on (see `machine`),
+save them again with --save-baseline before comparing on another one.
+"""
+from collections import OrderedDict
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+from bench import (
+    bounded_download, contact_cache, contact_scanner, contact_targets, contacts, dict_selectors, end_to_end, exports,
+    link_pages, parsing, pathological, place_fields, result_memory,
+)
+
+
+BENCHMARKS = OrderedDict([
+    ('parsing', (parsing.run, {})),
+    ('dict_selectors', (dict_selectors.run, {})),
+    ('place_fields', (place_fields.run, {})),
+    ('contacts', (contacts.run, {})),
+    ('contact_cache', (contact_cache.run, {})),
+    ('contact_targets', (contact_targets.run, {})),
+    ('bounded_download', (bounded_download.run, {})),
+    ('contact_scanner', (contact_scanner.run, {})),
+    ('pathological', (pathological.run, {})),
+    ('link_pages', (link_pages.run, {})),
+    ('end_to_end', (end_to_end.run, {'latency': 0, 'jitter': 0})),
+    ('exports', (exports.run, {})),
+    ('result_memory', (result_memory.run, {})),
+])
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines.json')
+DEFAULT_THRESHOLD = 0.25
+
+
+def get_direction(metric):
+    """
+    1 when the metric should grow, -1 when it should drop, 0 when it is only shown.
+    """
+    if metric.endswith('_per_s') or metric.endswith('speedup'):
+        return 1
+    if metric.endswith(('_s', '_ms', '_us')) or '_bytes' in metric:
+        return -1
+    return 0
+
+
+def run_suite(names=None, log=None):
+    measures = OrderedDict()
+    for name, (func, kwargs) in BENCHMARKS.items():
+        if names and name not in names:
+            continue
+        if log is not None:
+            log('Running %s' % name)
+        start = time.perf_counter()
+        measures[name] = func(**kwargs)
+        if log is not None:
+            log('  done in %.1fs' % (time.perf_counter() - start))
+    return measures
+
+
+def get_machine():
+    return {
+        'platform': platform.platform(),
+        'python': platform.python_version(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def load_baseline(path=DEFAULT_BASELINE):
+    if not os.path.exists(path):
+        return {'machine': None, 'thresholds': {}, 'benchmarks': {}}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_baseline(measures, path=DEFAULT_BASELINE):
+    """
+    Store `measures` in the baseline file, keeping the thresholds and the
+    benchmarks which were not run.
+    """
+    baseline = load_baseline(path)
+    baseline['machine'] = get_machine()
+    baseline.setdefault('thresholds', {})
+    baseline.setdefault('benchmarks', {}).update(measures)
+    with open(path, 'w') as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+        f.write('\n')
+    return baseline
+
+
+def compare(measures, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Rows of (benchmark, metric, baseline value, value, relative change, regression).
+    """
+    thresholds = baseline.get('thresholds', {})
+    rows = []
+    for name, metrics in measures.items():
+        reference = baseline.get('benchmarks', {}).get(name, {})
+        for metric, value in metrics.items():
+            base = reference.get(metric)
+            change = (value - base) / base if base else None
+            direction = get_direction(metric)
+            limit = thresholds.get('%s.%s' % (name, metric), threshold)
+            regression = bool(change is not None and direction and -direction * change > limit)
+            rows.append((name, metric, base, value, change, regression))
+    return rows
+
+
+def format_rows(rows):
+    lines = []
+    for name, metric, base, value, change, regression in rows:
+        lines.append('%-16s %-30s %14s %14.3f %9s%s' % (
+            name, metric,
+            '-' if base is None else '%.3f' % base,
+            value,
+            '-' if change is None else '%+.1f%%' % (change * 100),
+            '  REGRESSION' if regression else '',
+        ))
+    return '\n'.join(lines)
+
+
+def main(names=None, baseline_path=None, save=False, threshold=None, log=print):
+    """
+    Run the benchmarks and compare them to the baseline, returns 1 when a
+    metric regressed and 0 otherwise.
+    """
+    baseline_path = baseline_path or DEFAULT_BASELINE
+    threshold = DEFAULT_THRESHOLD if threshold is None else threshold
+    unknown = set(names or []) - set(BENCHMARKS)
+    if unknown:
+        raise ValueError('Unknown benchmarks: %s. Available benchmarks: %s' % (
+            ', '.join(sorted(unknown)), ', '.join(BENCHMARKS)))
+
+    measures = run_suite(names, log=log)
+    baseline = load_baseline(baseline_path)
+    if baseline.get('machine') and baseline['machine'] != get_machine():
+        log('Warning: the baseline was saved on another machine (%s)' % baseline['machine'])
+    rows = compare(measures, baseline, threshold)
+    log(format_rows(rows))
+
+    if save:
+        save_baseline(measures, baseline_path)
+        log('Baseline saved to %s' % baseline_path)
+        return 0
+    regressions = [row for row in rows if row[-1]]
+    if regressions:
+        log('%d metrics regressed by more than their threshold' % len(regressions))
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Run the benchmarks and compare them to the baseline')
+    parser.add_argument('names', nargs='*', help='Benchmarks to run (default: all of them)')
+    parser.add_argument('--baseline', help='Baseline file (default: bench/baselines.json)')
+    parser.add_argument('--save-baseline', action='store_true', help='Store the measures as the new baseline')
+    parser.add_argument('--threshold', type=float, help='Relative change allowed (default: %.2f)' % DEFAULT_THRESHOLD)
+    args = parser.parse_args()
+    sys.exit(main(args.names, args.baseline, args.save_baseline, args.threshold))
@@ -1,14 +1,17 @@
 # -*- coding: utf-8 -*-
-from monseigneur.monseigneur.core.browser import URL, PagesBrowser
+from monseigneur.monseigneur.core.browser import URL, PagesBrowser, AsyncBrowserMixin
 from monseigneur.monseigneur.core.browser.exceptions import ServerError
 from monseigneur.monseigneur.core.tools.decorators import retry
 from googlemaps_matrix.module.exceptions import IncompletePageError, PageInaccessible, WrongInput
 from googlemaps_matrix.results.models import Result
 from googlemaps_matrix.module.contact_browser import ContactBrowser
 from .pages import ListingPage, ListingHtmlPage, DetailPage, ConsentPage, ImagesPage
+from .tiling import Tile
+from requests import Request
 from requests.exceptions import ProxyError, ConnectionError, ChunkedEncodingError
 from urllib.parse import urlparse, unquote, quote
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 import time
 import random
 import re
@@ -24,9 +27,10 @@ TILE_SIZE = 256
 SCREEN_PIXEL_HEIGHT = 768
 RADIUS_X_PIXEL_HEIGHT = 27.3611 * EARTH_RADIUS_IN_METERS * SCREEN_PIXEL_HEIGHT
 PER_PAGE = 200
+LISTING_PAGES = 3
 
 
-class GoogleMapsBrowser(PagesBrowser):
+class GoogleMapsBrowser(AsyncBrowserMixin, PagesBrowser):
     BASEURL = "https://www.google.com/"
 
     listing_page = URL(r"/search\?(.*)", ListingPage)
@@ -42,6 +46,26 @@ class GoogleMapsBrowser(PagesBrowser):
     language = "en"
     image_id = None
 
+    TILE_MAX_DEPTH = 4
+    """
+    How many times a saturated tile can be split in four.
+    """
+
+    TILE_WORKERS = 8
+    """
+    Maximum of tiles queried at the same time.
+    """
+
+    DETAIL_WORKERS = 16
+    """
+    Maximum of detail pages fetched at the same time by fill_results_details.
+    """
+
+    SPECULATIVE_PAGES = LISTING_PAGES
+    """
+    Listing pages requested at once in speculative mode, their offsets being known up front.
+    """
+
     def __init__(self, is_superuser=False, *args, **kwargs):
         super(GoogleMapsBrowser, self).__init__(*args, **kwargs)
         self.contact_collector = ContactBrowser(*args, **kwargs)
@@ -55,6 +79,8 @@ class GoogleMapsBrowser(PagesBrowser):
         self.is_superuser = is_superuser
         self.objs = []
         self.map_dates = []
+        self.listing_pages = None
+        self.http_cache = None
 
     def set_random_proxy(self):
         self.session.cookies.set("CONSENT", "YES+cb.20230123-17-p1.en+FX+715")
@@ -65,6 +91,8 @@ class GoogleMapsBrowser(PagesBrowser):
         form = forms[0]
         self.location(form['action'], data=form['data'], method=form['method'])
 
+    @retry(ProxyError, tries=4, delay=2, backoff=0)
+    @retry(ConnectionError, tries=4, delay=2, backoff=0)
     def get_app_initialization(self, url):
         self.location(url)
         if self.consent_page.is_here():
@@ -140,8 +168,54 @@ class GoogleMapsBrowser(PagesBrowser):
     ):
         return "".join(random.choice(chars + extra_chars) for _ in range(length))
 
-    def get_contacts(self, result):
-        return self.contact_collector.get_contacts(result)
+    def set_http_cache(self, cache):
+        """
+        Answer requests from `cache` when possible, for the contact collector too.
+        """
+        self.http_cache = cache
+        cache.install(self.session)
+        cache.install(self.contact_collector.session)
+
+    def forget_response(self, url):
+        """
+        Drop the cached response of `url`, for a retry to fetch it again
+        rather than read the same broken page.
+        """
+        if self.http_cache is not None:
+            self.http_cache.delete(Request('GET', url).prepare())
+
+    def set_contact_cache(self, cache):
+        """
+        Read the contacts of websites from `cache`, see ContactBrowser.set_contact_cache.
+        """
+        self.contact_collector.set_contact_cache(cache)
+
+    def set_contact_targets(self, targets):
+        """
+        Stop visiting a website once `targets` are found, see ContactBrowser.set_contact_targets.
+        """
+        self.contact_collector.set_contact_targets(targets)
+
+    def set_archive(self, archive):
+        """
+        Archive responses in `archive` instead of writing them to responses_dirname.
+        """
+        self.archive = archive
+        self.contact_collector.archive = archive
+
+    def set_replay(self, transport):
+        """
+        Answer requests from a ReplayAdapter or a ReplayServer instead of the
+        network, for the contact collector too.
+        """
+        transport.install(self.session)
+        transport.install(self.contact_collector.session)
+
+    def get_contacts(self, result, deadline=None):
+        return self.contact_collector.get_contacts(result, deadline=deadline)
+
+    def is_contact_host_ready(self, url):
+        return self.contact_collector.scheduler.ready(url)
 
     def single_url_param(self, url):
         params = {
@@ -183,10 +257,9 @@ class GoogleMapsBrowser(PagesBrowser):
             return match.group(1)
         return None
 
-    @retry(ProxyError, tries=4, delay=2, backoff=0)
-    @retry(ConnectionError, tries=4, delay=2, backoff=0)
-    @retry(IncompletePageError, tries=3, delay=2, backoff=0)
-    def go_results(self, url, language, country, page, ratings=None):
+    # Requests are retried by the methods sending them (fetch_listing_page,
+    # go_result, ...), retrying the whole search would multiply the attempts.
+    def go_results(self, url, language, country, page, ratings=None, tiling=False, speculative=False):
         rating_id = {
             "4.5+": "44857",
             "4.0+": "8294",
@@ -199,6 +272,9 @@ class GoogleMapsBrowser(PagesBrowser):
         self.language = language
         self.country = country
         self.objs = []
+        self.map_dates = []
+        self.stop_listing()
+        self.contact_collector.reset_seen_pages()
         if '/place/' in url:
             single_params = self.single_url_param(url)
             result_obj = Result()
@@ -212,7 +288,7 @@ class GoogleMapsBrowser(PagesBrowser):
                 self.total_pages = 1
                 self.go_result(result_obj)
             elif single_params['zero_x']:
-                self.location(url)
+                self.go_place(url)
             else:
                 raise WrongInput
             if self.consent_page.is_here():
@@ -227,54 +303,192 @@ class GoogleMapsBrowser(PagesBrowser):
                 alt = self.zoom_to_alt(lat, zoom)
             except ValueError:
                 raise WrongInput
-            for page in range(1, 3 + 1):
-                ratings = f'!4m1!2i{rating_id}' if rating_id else ''
-                ratings_data = '!50m31!1m27!1m5!1u2!2m3!2m2!2m1!2e9' if rating_id else '!50m25!1m21'
-                random_23 = self.gen_random(23)
-                ratings_extra = f'!22m5!1s{random_23}:94!2z{self.gen_random(60)}' if rating_id else f'!22m2!1s{random_23}'
-                url = "https://www.google.com/search?tbm=map&gl={country}&authuser=0&hl={lang}&pb=!4m8!1m3!1d{alt}!2d{lng}!3d{lat}!3m2!1i1024!2i768!4f13.1!7i{per_page}!8i{start}!10b1!12m37!1m2!18b1!30b1!2m3!5m1!6e2!20e3!6m17!4b1!49b1!63m0!66b1!73m0!74i150000!75b1!85b1!89b1!91b1!110m0!114b1!149b1!166f1.35!183m0!196b1!201b1!10b1!12b1!13b1!14b1!16b1!17m1!3e1!20m3!5e2!6b1!14b1!94b1!19m4!2m3!1i360!2i120!4i8!20m57!2m2!1i203!2i100!3m2!2i4!5b1!6m6!1m2!1i86!2i86!1m2!1i408!2i240!7m42!1m3!1e1!2b0!3e3!1m3!1e2!2b1!3e2!1m3!1e2!2b0!3e3!1m3!1e8!2b0!3e3!1m3!1e10!2b0!3e3!1m3!1e10!2b1!3e2!1m3!1e9!2b1!3e2!1m3!1e10!2b0!3e3!1m3!1e10!2b1!3e2!1m3!1e10!2b0!3e4!2b1!4b1!9b0{ratings_extra}{ratings}!7e81!24m103!1m28!13m9!2b1!3b1!4b1!6i1!8b1!9b1!14b1!20b1!25b1!18m17!3b1!4b1!5b1!6b1!13b1!14b1!17b1!21b1!22b1!25b1!27m1!1b0!28b0!31b0!32b0!33m1!1b0!5m5!2b1!5b1!6b1!7b1!10b1!10m1!8e3!11m1!3e1!14m1!3b1!17b1!20m2!1e3!1e6!24b1!25b1!26b1!29b1!30m1!2b1!36b1!39m3!2m2!2i1!3i1!43b1!52b1!54m1!1b1!55b1!56m1!1b1!65m5!3m4!1m3!1m2!1i224!2i298!71b1!72m19!1m5!1b1!2b1!3b1!5b1!7b1!4b1!8m10!1m6!4m1!1e1!4m1!1e3!4m1!1e4!3sother_user_reviews!6m1!1e1!9b1!89b1!103b1!113b1!114m3!1b1!2m1!1b1!117b1!122m1!1b1!125b0!126b1!127b1!26m4!2m3!1i80!2i92!4i8!30m28!1m6!1m2!1i0!2i0!2m2!1i530!2i768!1m6!1m2!1i974!2i0!2m2!1i1024!2i768!1m6!1m2!1i0!2i0!2m2!1i1024!2i20!1m6!1m2!1i0!2i748!2m2!1i1024!2i768!34m19!2b1!3b1!4b1!6b1!7b1!8m6!1b1!3b1!4b1!5b1!6b1!7b1!9b1!12b1!14b1!20b1!23b1!25b1!26b1!37m1!1e81!42b1!46m1!1e9!47m0!49m9!3b1!6m2!1b1!2b1!7m2!1e3!2b1!8b1!9b1{ratings_data}!2m7!1u3!4sOpen now!5e1!9s{random_23}!10m2!3m1!1e1!2m7!1u2!4sTop rated!5e1!9s{random_23}!10m2!2m1!1e1!3m1!1u2!3m1!1u3!4BIAE!2e2!3m1!3b1!59BQ2dBd0Fn!61b1!67m3!7b1!10b1!14b0!69i701&q={search_term}&tch=1&ech=1&psi={random_20}.{timestamp}.1".format(
-                    country=country,
-                    lang=language,
-                    per_page=PER_PAGE,
-                    alt=alt,
-                    lat=lat,
-                    lng=lng,
-                    start=((page - 1) * PER_PAGE),
-                    random_23=self.gen_random(40),
-                    random_20=self.gen_random(length=20),
-                    ratings=ratings,
-                    ratings_extra=ratings_extra,
-                    ratings_data=ratings_data,
-                    search_term=search_term,
-                    timestamp=int(time.time() * 1000),
-                )
+            if tiling:
+                return self.go_tiled_results(search_term, lat, lng, zoom, rating_id)
+            # only the first page is fetched here, the next ones are listed by iter_results
+            self.listing_pages = self.iter_listing_pages(search_term, lat, lng, alt, rating_id, speculative)
+            self.list_next_page()
+
+    def list_next_page(self):
+        """
+        Parse the next listing page of the current search into self.objs.
+
+        Returns False once the search is fully listed.
+        """
+        if self.listing_pages is None:
+            return False
+        listing_page = next(self.listing_pages, None)
+        if listing_page is None:
+            self.listing_pages = None
+            return False
+        self.map_dates = listing_page.get_dates()
+        self.objs.extend(listing_page.iter_results())
+        if len(self.objs) >= 200:
+            self.stop_listing()
+        return True
 
-                try:
-                    self.location(url)
-                except ServerError:
-                    raise MatrixException(PageInaccessible)
-                assert self.listing_page.is_here()
-                self.map_dates = self.page.get_dates()
-                self.page.search_term = search_term
-                self.objs.extend(list(self.page.iter_results()))
+    def stop_listing(self):
+        if self.listing_pages is not None:
+            # cancels the speculative requests still pending
+            self.listing_pages.close()
+            self.listing_pages = None
+
+    def iter_listing_pages(self, search_term, lat, lng, alt, rating_id=None, speculative=False):
+        """
+        Listing pages of a search, in order, until one says there is no next page.
+
+        In speculative mode the LISTING_PAGES requests are sent at once, as
+        their offsets do not depend on the previous pages. Pages after the
+        last one are discarded, and the ones still pending are cancelled.
+        """
+        urls = [
+            self.build_listing_url(search_term, lat, lng, alt, (page - 1) * PER_PAGE, rating_id)
+            for page in range(1, LISTING_PAGES + 1)
+        ]
+        if not speculative:
+            for url in urls:
+                listing_page = self.fetch_listing_page(url, search_term)
+                yield listing_page
+                if not listing_page.has_next_page():
+                    return
+            return
+
+        executor = ThreadPoolExecutor(max_workers=min(self.SPECULATIVE_PAGES, len(urls)))
+        try:
+            futures = [executor.submit(self.fetch_listing_page, url, search_term) for url in urls]
+            for future in futures:
+                listing_page = future.result()
+                yield listing_page
+                if not listing_page.has_next_page():
+                    return
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def build_listing_url(self, search_term, lat, lng, alt, start, rating_id=None):
+        ratings = f'!4m1!2i{rating_id}' if rating_id else ''
+        ratings_data = '!50m31!1m27!1m5!1u2!2m3!2m2!2m1!2e9' if rating_id else '!50m25!1m21'
+        random_23 = self.gen_random(23)
+        ratings_extra = f'!22m5!1s{random_23}:94!2z{self.gen_random(60)}' if rating_id else f'!22m2!1s{random_23}'
+        return "https://www.google.com/search?tbm=map&gl={country}&authuser=0&hl={lang}&pb=!4m8!1m3!1d{alt}!2d{lng}!3d{lat}!3m2!1i1024!2i768!4f13.1!7i{per_page}!8i{start}!10b1!12m37!1m2!18b1!30b1!2m3!5m1!6e2!20e3!6m17!4b1!49b1!63m0!66b1!73m0!74i150000!75b1!85b1!89b1!91b1!110m0!114b1!149b1!166f1.35!183m0!196b1!201b1!10b1!12b1!13b1!14b1!16b1!17m1!3e1!20m3!5e2!6b1!14b1!94b1!19m4!2m3!1i360!2i120!4i8!20m57!2m2!1i203!2i100!3m2!2i4!5b1!6m6!1m2!1i86!2i86!1m2!1i408!2i240!7m42!1m3!1e1!2b0!3e3!1m3!1e2!2b1!3e2!1m3!1e2!2b0!3e3!1m3!1e8!2b0!3e3!1m3!1e10!2b0!3e3!1m3!1e10!2b1!3e2!1m3!1e9!2b1!3e2!1m3!1e10!2b0!3e3!1m3!1e10!2b1!3e2!1m3!1e10!2b0!3e4!2b1!4b1!9b0{ratings_extra}{ratings}!7e81!24m103!1m28!13m9!2b1!3b1!4b1!6i1!8b1!9b1!14b1!20b1!25b1!18m17!3b1!4b1!5b1!6b1!13b1!14b1!17b1!21b1!22b1!25b1!27m1!1b0!28b0!31b0!32b0!33m1!1b0!5m5!2b1!5b1!6b1!7b1!10b1!10m1!8e3!11m1!3e1!14m1!3b1!17b1!20m2!1e3!1e6!24b1!25b1!26b1!29b1!30m1!2b1!36b1!39m3!2m2!2i1!3i1!43b1!52b1!54m1!1b1!55b1!56m1!1b1!65m5!3m4!1m3!1m2!1i224!2i298!71b1!72m19!1m5!1b1!2b1!3b1!5b1!7b1!4b1!8m10!1m6!4m1!1e1!4m1!1e3!4m1!1e4!3sother_user_reviews!6m1!1e1!9b1!89b1!103b1!113b1!114m3!1b1!2m1!1b1!117b1!122m1!1b1!125b0!126b1!127b1!26m4!2m3!1i80!2i92!4i8!30m28!1m6!1m2!1i0!2i0!2m2!1i530!2i768!1m6!1m2!1i974!2i0!2m2!1i1024!2i768!1m6!1m2!1i0!2i0!2m2!1i1024!2i20!1m6!1m2!1i0!2i748!2m2!1i1024!2i768!34m19!2b1!3b1!4b1!6b1!7b1!8m6!1b1!3b1!4b1!5b1!6b1!7b1!9b1!12b1!14b1!20b1!23b1!25b1!26b1!37m1!1e81!42b1!46m1!1e9!47m0!49m9!3b1!6m2!1b1!2b1!7m2!1e3!2b1!8b1!9b1{ratings_data}!2m7!1u3!4sOpen now!5e1!9s{random_23}!10m2!3m1!1e1!2m7!1u2!4sTop rated!5e1!9s{random_23}!10m2!2m1!1e1!3m1!1u2!3m1!1u3!4BIAE!2e2!3m1!3b1!59BQ2dBd0Fn!61b1!67m3!7b1!10b1!14b0!69i701&q={search_term}&tch=1&ech=1&psi={random_20}.{timestamp}.1".format(
+                country=self.country,
+                lang=self.language,
+                per_page=PER_PAGE,
+                alt=alt,
+                lat=lat,
+                lng=lng,
+                start=start,
+                random_23=self.gen_random(40),
+                random_20=self.gen_random(length=20),
+                ratings=ratings,
+                ratings_extra=ratings_extra,
+                ratings_data=ratings_data,
+                search_term=search_term,
+                timestamp=int(time.time() * 1000),
+            )
 
-                if not self.page.has_next_page() or len(self.objs) >= 200:
-                    break
+    @retry(ProxyError, tries=4, delay=2, backoff=0)
+    @retry(ConnectionError, tries=4, delay=2, backoff=0)
+    @retry(IncompletePageError, tries=3, delay=2, backoff=0)
+    def fetch_listing_page(self, url, search_term):
+        """Fetch one listing request without touching the browser state, so it can run in any thread."""
+        try:
+            response = self.open(url)
+        except ServerError:
+            raise PageInaccessible(url)
+        except (IncompletePageError, json.decoder.JSONDecodeError):
+            self.forget_response(url)
+            raise IncompletePageError(str(url))
+        assert isinstance(response.page, ListingPage)
+        response.page.search_term = search_term
+        return response.page
+
+    def go_tiled_results(self, search_term, lat, lng, zoom, rating_id=None):
+        """
+        Sweep the viewport with a quad-tree of listing requests.
+
+        Every tile is queried concurrently; a tile coming back saturated
+        (a full page of PER_PAGE hits) is split in four and its quadrants are
+        queried in the next wave, until TILE_MAX_DEPTH is reached. Results are
+        deduplicated across tiles on zero_x/cid.
+        """
+        seen = set()
+        wave = [Tile(lat, lng, zoom)]
+        with ThreadPoolExecutor(max_workers=self.TILE_WORKERS) as executor:
+            while wave:
+                self.logger.info('Querying %d tiles at depth %d', len(wave), wave[0].depth)
+                next_wave = []
+                for tile, pages in zip(wave, executor.map(lambda tile: self.fetch_tile(search_term, tile, rating_id), wave)):
+                    if not self.map_dates:
+                        self.map_dates = pages[0].get_dates()
+                    for listing_page in pages:
+                        for result in listing_page.iter_results():
+                            key = result.zero_x or result.cid or result.url
+                            if key in seen:
+                                continue
+                            seen.add(key)
+                            self.objs.append(result)
+                    if pages[-1].has_next_page() and tile.depth < self.TILE_MAX_DEPTH:
+                        next_wave.extend(tile.split())
+                wave = next_wave
+        self.logger.info('Tiled sweep found %d unique results', len(self.objs))
+
+    def fetch_tile(self, search_term, tile, rating_id=None):
+        alt = self.zoom_to_alt(tile.lat, tile.zoom)
+        pages = []
+        for page in range(1, LISTING_PAGES + 1):
+            url = self.build_listing_url(search_term, tile.lat, tile.lng, alt, (page - 1) * PER_PAGE, rating_id)
+            pages.append(self.fetch_listing_page(url, search_term))
+            # only tiles which cannot be split anymore are paginated
+            if tile.depth < self.TILE_MAX_DEPTH or not pages[-1].has_next_page():
+                break
+        return pages
 
     def get_total_pages(self):
         return 1
 
     def get_total_results(self):
+        """
+        Results listed so far, the next listing pages are only fetched by iter_results.
+        """
         return len(self.objs)
 
     def iter_results(self):
-        for result_obj in self.objs:
-            yield result_obj
+        """
+        Yield results as their listing page is parsed, fetching the next
+        page once the results of the previous ones are consumed.
+        """
+        index = 0
+        while True:
+            while index < len(self.objs):
+                yield self.objs[index]
+                index += 1
+            if not self.list_next_page():
+                return
 
     @retry(ConnectionError, tries=4, delay=2, backoff=0)
     @retry(IncompletePageError, tries=3, delay=2, backoff=0)
     @retry(ChunkedEncodingError, tries=3, delay=2, backoff=0)
     def go_result(self, result):
+        url = self.build_result_url(result)
+        if self.detail_page.is_here() and url == self.response.url:
+            return True
+        try:
+            self.location(url)
+        except ServerError:
+            return False
+        except (IncompletePageError, json.decoder.JSONDecodeError):
+            self.forget_response(url)
+            raise IncompletePageError(str(url))
+        assert self.detail_page.is_here()
+        self.image_id = self.page.image_id()
+        return True
+
+    @retry(ProxyError, tries=4, delay=2, backoff=0)
+    @retry(ConnectionError, tries=4, delay=2, backoff=0)
+    def go_place(self, url):
+        self.location(url)
+
+    def build_result_url(self, result):
         term = quote(self.term).replace("%", "*")[:50]
         if not result.name:
             name = self.get_search_term_from_url(result.url)
@@ -319,17 +533,36 @@ class GoogleMapsBrowser(PagesBrowser):
                     to_day=to_.split("-")[2],
                     query_name=name.replace("%20", "+").replace('%21', '').strip('+')
                 )
-        if self.detail_page.is_here() and url == self.response.url:
-            return True
+        return url
+
+    @retry(ConnectionError, tries=4, delay=2, backoff=0)
+    @retry(IncompletePageError, tries=3, delay=2, backoff=0)
+    @retry(ChunkedEncodingError, tries=3, delay=2, backoff=0)
+    def fetch_result_page(self, result):
+        url = self.build_result_url(result)
         try:
-            self.location(url)
+            response = self.open(url)
         except ServerError:
-            return False
-        except json.decoder.JSONDecodeError:
+            return None
+        except (IncompletePageError, json.decoder.JSONDecodeError):
+            self.forget_response(url)
             raise IncompletePageError(str(url))
-        assert self.detail_page.is_here()
-        self.image_id = self.page.image_id()
-        return True
+        assert isinstance(response.page, DetailPage)
+        return response.page
+
+    def fill_result(self, result):
+        try:
+            page = self.fetch_result_page(result)
+        except (ConnectionError, IncompletePageError, ChunkedEncodingError) as e:
+            self.logger.warning('Unable to fill details of %s: %s', result.name or result.url, e)
+            return result
+        if page is None:
+            return result
+        return page.get_result(obj=result)
+
+    def fill_results_details(self, results, concurrency=None):
+        with ThreadPoolExecutor(concurrency or self.DETAIL_WORKERS) as executor:
+            return list(executor.map(self.fill_result, results))
 
     def get_result(self, obj):
         assert self.detail_page.is_here()
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+import re
+
+from monseigneur.monseigneur.core.browser.cache import HttpCache, RequestFingerprint
+
+
+__all__ = ['GoogleMapsFingerprint', 'GoogleMapsHttpCache']
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+# Tokens of the listing `pb` parameter drawn by GoogleMapsBrowser.gen_random for each request
+RANDOM_PB_TOKENS = re.compile(r'(!22m\d+!1s|!2z|!9s)[^!]*')
+
+# Google endpoints answering JSON, prefixed by )]}' or wrapped in {"c":..,"d":..}/*""*/
+JSON_URLS = re.compile(r'^https://www\.google\.com/(search\?tbm=map|maps/preview/place|maps/rpc/photo/listentityphotos)')
+
+
+class GoogleMapsFingerprint(RequestFingerprint):
+    """
+    Requests fingerprint ignoring the `psi` parameter and the random tokens of
+    the listing `pb` parameter.
+    """
+
+    VOLATILE_PARAMS = ['psi']
+
+    def normalize_params(self, url, params):
+        params = super(GoogleMapsFingerprint, self).normalize_params(url, params)
+        return [
+            (key, RANDOM_PB_TOKENS.sub(r'\1', value) if key == 'pb' else value)
+            for key, value in params
+        ]
+
+
+class GoogleMapsHttpCache(HttpCache):
+    """
+    HTTP cache of the Google Maps and contact browsers.
+
+    Listings are kept a few hours, places and their photos a few days, and
+    the websites visited to collect contacts a few weeks. Consent and HTML
+    search pages are never cached, as they set the session cookies.
+    """
+
+    FINGERPRINT = GoogleMapsFingerprint
+
+    TTLS = [
+        (r'^https://consent\.google\.', 0),
+        (r'^https://www\.google\.com/maps/search', 0),
+        (r'^https://www\.google\.com/search\?tbm=map', 6 * HOUR),
+        (r'^https://www\.google\.com/maps/preview/place', 7 * DAY),
+        (r'^https://www\.google\.com/maps/place', 7 * DAY),
+        (r'^https://www\.google\.com/maps/rpc/photo/listentityphotos', 7 * DAY),
+        (r'^https://[^/]*google\.', 0),
+    ]
+
+    # Websites of the places
+    DEFAULT_TTL = 21 * DAY
+
+    def is_valid(self, request, response):
+        """
+        JSON answers are stored only when framed as Google sends them, so that
+        a truncated body or an HTML error page is fetched again on retry.
+        """
+        if not JSON_URLS.match(request.url):
+            return True
+        content = response.content.strip()
+        return content.startswith((b")]}'", b'{')) and content.endswith((b']', b'/*""*/'))
@@ -3,14 +3,25 @@ import urllib3
 import tldextract
 import os
 import random
+import time
+from threading import Lock
 from urllib.parse import urlparse
 from requests.adapters import HTTPAdapter
+from requests.exceptions import ChunkedEncodingError, ContentDecodingError, ReadTimeout, SSLError as RequestsSSLError
+from urllib3.util.response import is_fp_closed
 from monseigneur.monseigneur.core.browser import URL
-from monseigneur.monseigneur.core.browser import PagesBrowser
+from monseigneur.monseigneur.core.browser import PagesBrowser, AsyncBrowserMixin
+from monseigneur.monseigneur.core.tools.lrudict import LimitedLRUDict
 
 from googlemaps_matrix.module.pages import PersoPage
 from googlemaps_matrix.results.models import Contact
 from googlemaps_matrix.module.decorators import location_error_handler
+from googlemaps_matrix.module.exceptions import (
+    HostThrottled, UnsupportedContentType, ResponseTooLarge, DownloadDeadlineExceeded,
+)
+from googlemaps_matrix.module.scheduler import HostScheduler
+from googlemaps_matrix.module.urls import canonicalize_url, get_url_key
+from googlemaps_matrix.module.crawl_policy import rank_contact_link
 
 
 class TimeoutHTTPAdapter(HTTPAdapter):
@@ -27,10 +38,105 @@ class TimeoutHTTPAdapter(HTTPAdapter):
         return super().send(request, **kwargs)
 
 
-__all__ = ['ContactBrowser']
+class BoundedHTTPAdapter(TimeoutHTTPAdapter):
+    """
+    Adapter reading the responses of third-party websites within bounds.
 
+    The content type and length are checked on the headers, before the body
+    is read; the body is then read as it arrives and the download aborted
+    once it goes over `max_size` bytes or `deadline` seconds since the
+    request was sent. The socket read timeout alone lets a slow-drip website
+    hold a worker for minutes, as it restarts with every byte received.
+    """
 
-class ContactBrowser(PagesBrowser):
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, *args, **kwargs):
+        self.max_size = kwargs.pop('max_size', None)
+        self.deadline = kwargs.pop('deadline', None)
+        self.content_types = kwargs.pop('content_types', None)
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, **kwargs):
+        start = time.monotonic()
+        response = super().send(request, **kwargs)
+        timeout = kwargs.get('timeout') or getattr(self, 'timeout', None)
+        if isinstance(timeout, tuple):
+            timeout = timeout[1]
+        try:
+            self.check_headers(response)
+            response._content = self.read_body(response, start, timeout)
+        except Exception:
+            response.close()
+            raise
+        response._content_consumed = True
+        return response
+
+    def check_headers(self, response):
+        if self.content_types and 200 <= response.status_code < 300:
+            content_type = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+            # a response without content type may still be a page
+            if content_type and content_type not in self.content_types:
+                raise UnsupportedContentType('%s content is not read from %s' % (content_type, response.url))
+        length = response.headers.get('Content-Length', '')
+        if self.max_size is not None and length.isdigit() and int(length) > self.max_size:
+            raise ResponseTooLarge('%s bytes announced by %s' % (length, response.url))
+
+    @staticmethod
+    def get_socket(raw):
+        connection = getattr(raw, 'connection', None) or getattr(raw, '_connection', None)
+        sock = getattr(connection, 'sock', None)
+        if sock is None:
+            try:
+                sock = raw._fp.fp.raw._sock
+            except AttributeError:
+                return None
+        return sock
+
+    def read_body(self, response, start, timeout=None):
+        """
+        Body of `response`, each read returning what already arrived (read1,
+        urllib3 >= 2) within the time left before the deadline.
+        """
+        raw = response.raw
+        sock = self.get_socket(raw)
+        read = getattr(raw, 'read1', raw.read)
+        chunks = []
+        size = 0
+        while True:
+            if self.deadline is not None:
+                left = self.deadline - (time.monotonic() - start)
+                if left <= 0:
+                    raise DownloadDeadlineExceeded('%s not downloaded within %ss' % (response.url, self.deadline))
+                if sock is not None:
+                    sock.settimeout(left if timeout is None else min(left, timeout))
+            try:
+                chunk = read(self.CHUNK_SIZE, decode_content=True)
+            except urllib3.exceptions.ReadTimeoutError as e:
+                if self.deadline is not None and time.monotonic() - start >= self.deadline:
+                    raise DownloadDeadlineExceeded('%s not downloaded within %ss' % (response.url, self.deadline))
+                raise ReadTimeout(e, request=response.request)
+            except urllib3.exceptions.ProtocolError as e:
+                raise ChunkedEncodingError(e)
+            except urllib3.exceptions.DecodeError as e:
+                raise ContentDecodingError(e)
+            except urllib3.exceptions.SSLError as e:
+                raise RequestsSSLError(e)
+            if not chunk:
+                if raw.closed or is_fp_closed(raw._fp):
+                    break
+                continue
+            chunks.append(chunk)
+            size += len(chunk)
+            if self.max_size is not None and size > self.max_size:
+                raise ResponseTooLarge('More than %d bytes sent by %s' % (self.max_size, response.url))
+        return b''.join(chunks)
+
+
+__all__ = ['ContactBrowser', 'BoundedHTTPAdapter']
+
+
+class ContactBrowser(AsyncBrowserMixin, PagesBrowser):
 
     BASEURL = ''
     VERIFY = True
@@ -38,22 +144,131 @@ class ContactBrowser(PagesBrowser):
     MAX_RETRIES = 1
     TIMEOUT = 10
 
+    REQUEST_DEADLINE = 20
+    """
+    Seconds allowed to download a page, whatever the pace of the website.
+    """
+
+    SITE_DEADLINE = 60
+    """
+    Seconds allowed to collect the contacts of a result, for all its pages.
+    """
+
+    MAX_BODY_SIZE = 5 * 1024 * 1024
+    """
+    Bytes of a page read at most, larger pages are not read.
+    """
+
+    CONTENT_TYPES = ['text/html', 'application/xhtml+xml']
+    """
+    Content types of the pages read, other responses are not read.
+    """
+
+    HOST_CONCURRENCY = 2
+    """
+    Maximum of requests sent to the same host at the same time.
+    """
+
+    HOST_RATE = 1.0
+    """
+    Requests per second allowed on the same host, once HOST_BURST is spent.
+    """
+
+    HOST_BURST = 2
+    """
+    Requests which can be sent to an idle host without waiting.
+    """
+
+    MAX_RETRY_AFTER = 120
+    """
+    Longest delay in seconds honoured from a `Retry-After` header.
+    """
+
+    contact_cache = None
+    """
+    :class:`ContactCache` of the contacts collected by domain, see set_contact_cache.
+    """
+
+    contact_targets = None
+    """
+    :class:`ContactTargets` after which no more page of a website is
+    visited, None to visit every contact link. See set_contact_targets.
+    """
+
+    SEEN_PAGES = 10000
+    """
+    Pages whose contact links and contacts are kept during a search, for
+    the results sharing them not to fetch them again.
+    """
+
     perso_page = URL('(.*)', PersoPage)
 
+    # Pages are read from the returned response and never from self.page, so
+    # that a single ContactBrowser can enrich several results at once.
+
     def __init__(self, *args, **kwargs):
         super(ContactBrowser, self).__init__(*args, **kwargs)
-        self.session.mount('http://', TimeoutHTTPAdapter(timeout=self.TIMEOUT))
-        self.session.mount('https://', TimeoutHTTPAdapter(timeout=self.TIMEOUT))
+        for prefix in ('http://', 'https://'):
+            self.session.mount(prefix, BoundedHTTPAdapter(
+                timeout=self.TIMEOUT,
+                max_size=self.MAX_BODY_SIZE,
+                deadline=self.REQUEST_DEADLINE,
+                content_types=self.CONTENT_TYPES,
+            ))
+        self.resize_pools()
+        self.scheduler = HostScheduler(
+            concurrency=self.HOST_CONCURRENCY,
+            rate=self.HOST_RATE,
+            burst=self.HOST_BURST,
+            max_retry_after=self.MAX_RETRY_AFTER,
+            respect_retry_after=self.RESPECT_RETRY_AFTER_HEADER,
+        )
+        self.session.hooks['response'].append(self.scheduler.observe)
+        self.seen_pages = LimitedLRUDict()
+        self.seen_pages.max_entries = self.SEEN_PAGES
+        self.seen_lock = Lock()
+
+    def get_timeout(self, deadline=None):
+        if deadline is None:
+            return self.TIMEOUT
+        return min(self.TIMEOUT, deadline - time.monotonic())
+
+    def reset_seen_pages(self):
+        """
+        Forget the pages seen, when a new search starts.
+        """
+        with self.seen_lock:
+            self.seen_pages.clear()
+
+    def get_seen(self, key):
+        with self.seen_lock:
+            if key in self.seen_pages:
+                return self.seen_pages[key]
+        return None
+
+    def add_seen(self, key, value):
+        with self.seen_lock:
+            self.seen_pages[key] = value
 
     @location_error_handler
-    def get_contact_links(self, url):
+    def get_contact_links(self, url, deadline=None, pages=None):
+        """
+        Contact and about links of the website at `url`. Its page is stored
+        in `pages` (under the requested and the final URL) when given, for
+        get_contact_items not to fetch it again. The links are kept until the
+        next search, for the results with the same website. None when
+        the host was throttled or `deadline` was reached before the page
+        could be fetched.
+        """
         if not url:
             return []
         if url and url.strip('?# ') == '':
             self.logger.error('Invalid URL provided %s', url)
             return []
-        if not url.startswith('http'):
-            url = 'http://' + url
+        url = canonicalize_url(url)
+        seen_links = self.get_seen(('links', get_url_key(url)))
+        if seen_links is not None:
+            return list(seen_links)
         contact_links = []
         self.logger.warning('Now going to: {!r}'.format(url))
         headers = {
@@ -73,25 +288,48 @@ class ContactBrowser(PagesBrowser):
             'user-agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36',
         }
         try:
-            self.location(url, headers=headers, allow_redirects=True)
-            assert self.perso_page.is_here()
-            assert 'http' in self.page.url
-            for contact_link in self.page.get_contact_links():
+            with self.scheduler.slot(url, deadline=deadline):
+                # the time left is only known once the host let us in
+                timeout = self.get_timeout(deadline)
+                if timeout <= 0:
+                    return None
+                page = self.open(url, headers=headers, timeout=timeout, allow_redirects=True).page
+            assert isinstance(page, PersoPage)
+            assert 'http' in page.url
+            if pages is not None:
+                pages[get_url_key(url)] = page
+                pages[get_url_key(page.url)] = page
+            for contact_link in page.get_contact_links():
                 contact_links.append(contact_link)
-            return contact_links
+            self.add_seen(('links', get_url_key(url)), contact_links)
+            return list(contact_links)
         except urllib3.exceptions.LocationParseError:
             return []
+        except HostThrottled as e:
+            self.logger.warning(e)
+            return None
         except ValueError as e:
             raise e
 
     @location_error_handler
-    def get_contact_items(self, url, is_phone, is_mail, is_social_media):
+    def get_contact_items(self, url, is_phone, is_mail, is_social_media, deadline=None, pages=None):
+        """
+        Contacts of the page at `url`, read from `pages` when it was fetched
+        already while enriching the result. The contacts are kept until the
+        next search, for the results linking to the same page. None when
+        the host was throttled or `deadline` was reached before the page
+        could be fetched.
+        """
         if not url:
             self.logger.error('Invalid URL provided %s', url)
             return []
         if url and url.strip('?# ') == '':
             self.logger.error('Invalid URL provided %s', url)
             return []
+        seen_key = ('contacts', get_url_key(url), is_phone, is_mail, is_social_media)
+        seen_contacts = self.get_seen(seen_key)
+        if seen_contacts is not None:
+            return list(seen_contacts)
         contact_objects = []
         self.logger.warning('Now going to: {!r}'.format(url))
 
@@ -142,22 +380,31 @@ class ContactBrowser(PagesBrowser):
                 'user-agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36',
             }
 
-            self.location(url, headers=headers, proxies=proxies, allow_redirects=True)
+            page = pages.get(get_url_key(url)) if pages is not None else None
+            if page is None:
+                with self.scheduler.slot(url, deadline=deadline):
+                    timeout = self.get_timeout(deadline)
+                    if timeout <= 0:
+                        return None
+                    page = self.open(url, headers=headers, proxies=proxies, timeout=timeout, allow_redirects=True).page
+        except HostThrottled as e:
+            self.logger.warning(e)
+            return None
         except ValueError as e:
             if 'IPv6 address' in str(e):
                 return contact_objects
             raise
 
-        assert self.perso_page.is_here()
+        assert isinstance(page, PersoPage)
 
         if is_mail:
-            for contact_object in self.page.iter_mails():
+            for contact_object in page.iter_mails():
                 contact_objects.append(contact_object)
         if is_phone:
-            for contact_object in self.page.iter_phones():
+            for contact_object in page.iter_phones():
                 contact_objects.append(contact_object)
         if is_social_media:
-            for contact_object in self.page.iter_social_media():
+            for contact_object in page.iter_social_media():
                 contact_objects.append(contact_object)
 
         clean_contact_obj_list = []
@@ -166,7 +413,8 @@ class ContactBrowser(PagesBrowser):
                 if contact_obj.value not in [el.value for el in clean_contact_obj_list]:
                     clean_contact_obj_list.append(contact_obj)
 
-        return clean_contact_obj_list
+        self.add_seen(seen_key, clean_contact_obj_list)
+        return list(clean_contact_obj_list)
 
 
     def set_random_proxy(self):
@@ -213,28 +461,133 @@ class ContactBrowser(PagesBrowser):
 
         return result
 
-    def get_contacts(self, result, is_phone=True, is_mail=True, is_social_media=True):
+    def set_contact_cache(self, cache):
+        """
+        Read the contacts of websites from `cache` when their domain was
+        collected already, and store the others there.
+        """
+        self.contact_cache = cache
+
+    def set_contact_targets(self, targets):
+        """
+        Stop visiting the pages of a website once `targets` (a
+        :class:`ContactTargets`) are found, None to visit all of them.
+        """
+        self.contact_targets = targets
+
+    def get_contacts(self, result, is_phone=True, is_mail=True, is_social_media=True, deadline=None):
+        """
+        `deadline` is a time.monotonic() value after which no more contact
+        link is visited, the contacts found so far are kept.
+
+        Each page is fetched and parsed once per result: the home page is
+        read both for its contact links and for its contacts. Links are
+        visited in the order of rank_contact_link, until the contact targets
+        are found. No page is visited after SITE_DEADLINE seconds.
+        """
+        site_deadline = time.monotonic() + self.SITE_DEADLINE
+        deadline = site_deadline if deadline is None else min(deadline, site_deadline)
         result = self.fix_result(result)
 
-        contact_links: list = self.get_contact_links(result.website) or []
-
-        if result.website and result.website not in contact_links:
-            contact_links.append(result.website)
-        if hasattr(result, 'facebook') and result.facebook and len(result.facebook) == 1:
-            contact_links.append(result.facebook[0])
+        pages = {}
+        contacts = self.get_website_contacts(
+            result.website, is_phone, is_mail, is_social_media, deadline=deadline, pages=pages
+        )
+        satisfied = self.contact_targets is not None and self.contact_targets.is_satisfied(contacts)
+        if hasattr(result, 'facebook') and result.facebook and len(result.facebook) == 1 and not satisfied:
+            contacts = contacts + self.collect_contacts(
+                result.website, [result.facebook[0]], is_phone, is_mail, is_social_media, deadline=deadline, pages=pages
+            )[0]
+
+        duplicates = set()
+        for contact in contacts:
+            if contact.value in duplicates:
+                continue
+            duplicates.add(contact.value)
+            result = self.handle_contact(result, contact)
+        return self.clean_contacts(result)
 
-        duplicates = []
+    def get_website_contacts(self, website, is_phone=True, is_mail=True, is_social_media=True, deadline=None, pages=None):
+        """
+        Contacts of the home and contact pages of `website`.
+
+        With a contact cache, and when every kind of contact is collected,
+        they are read from the cache if its domain was collected already. A
+        website where no contact was found is not stored, as nothing tells it
+        from a website which failed to answer.
+        """
+        domain = None
+        if self.contact_cache is not None and is_phone and is_mail and is_social_media:
+            domain = self.contact_cache.get_domain(website)
+        if domain is None:
+            return self.collect_contacts(
+                website, self.get_website_links(website, deadline, pages), is_phone, is_mail, is_social_media,
+                deadline=deadline, pages=pages,
+            )[0]
+
+        with self.contact_cache.collecting(domain, deadline) as collecting:
+            contacts = self.contact_cache.get(domain)
+            if contacts is not None:
+                self.logger.info('Contacts of %s read from the contact cache', domain)
+                return contacts
+            if not collecting:
+                self.logger.warning('Deadline reached for %s while its domain was collected', website)
+                return []
+            contacts, complete = self.collect_contacts(
+                website, self.get_website_links(website, deadline, pages), is_phone, is_mail, is_social_media,
+                deadline=deadline, pages=pages,
+            )
+            if complete and contacts:
+                self.contact_cache.store(domain, contacts)
+            return contacts
+
+    def get_website_links(self, website, deadline=None, pages=None):
+        """
+        Links of `website` to visit, in order, None when its home page could
+        not be fetched in time.
+        """
+        contact_links = self.get_contact_links(website, deadline=deadline, pages=pages)
+        if contact_links is None:
+            return None
+        if website and get_url_key(website) not in [get_url_key(link) for link in contact_links]:
+            contact_links.append(canonicalize_url(website))
+        contact_links.sort(key=lambda link: rank_contact_link(website, link))
+        return contact_links
+
+    def collect_contacts(self, website, contact_links, is_phone=True, is_mail=True, is_social_media=True, deadline=None,
+                         pages=None):
+        """
+        Contacts found on `contact_links`, without duplicated values, and
+        whether every link was visited before `deadline` or the contact
+        targets were found. A website cut short is not complete, for its
+        contacts not to be stored in the contact cache.
+        """
+        contacts = []
+        values = set()
+        if contact_links is None:
+            return contacts, False
         for contact_link in contact_links:
+            if deadline is not None and time.monotonic() >= deadline:
+                self.logger.warning('Deadline reached for %s, skipping remaining contact links', website)
+                return contacts, False
             try:
-                contacts = self.get_contact_items(contact_link, is_phone, is_mail, is_social_media)
+                items = self.get_contact_items(
+                    contact_link, is_phone, is_mail, is_social_media, deadline=deadline, pages=pages
+                )
             except urllib3.exceptions.LocationParseError:
                 continue
-            for contact in contacts or []:
-                if duplicates.count(contact.value) or not contact.value:
+            if items is None:
+                self.logger.warning('Gave up %s while waiting for its host', website)
+                return contacts, False
+            for contact in items:
+                if not contact.value or contact.value in values:
                     continue
-                duplicates.append(contact.value)
-                result = self.handle_contact(result, contact)
-        return self.clean_contacts(result)
+                values.add(contact.value)
+                contacts.append(contact)
+            if self.contact_targets is not None and self.contact_targets.is_satisfied(contacts):
+                self.logger.debug('Contact targets found for %s, skipping remaining contact links', website)
+                break
+        return contacts, True
 
     def handle_contact(self, result, contact: Contact):
 
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+from contextlib import contextmanager
+from threading import Lock
+import json
+import os
+import sqlite3
+import time
+
+import tldextract
+
+from googlemaps_matrix.results.models import Contact
+
+__all__ = ['ContactCache']
+
+
+class ContactCache(object):
+    """
+    Contacts collected on websites, stored by registrable domain in a SQLite
+    database, so that the results of a chain or a franchise sharing a website
+    are enriched by visiting it once, in a job and across jobs.
+
+    Threads collecting the contacts of a same domain wait for the first one
+    (see `collecting`) and read its contacts from the cache instead of
+    visiting the website again.
+
+    >>> cache = ContactCache('~/.cache/googlemaps_matrix/contacts.sqlite')  # doctest: +SKIP
+    >>> browser.set_contact_cache(cache)  # doctest: +SKIP
+    """
+
+    TTL = 7 * 24 * 3600
+    """
+    Default seconds during which the contacts of a domain are kept.
+    """
+
+    UNCACHED_DOMAINS = [
+        'facebook.com', 'instagram.com', 'linkedin.com', 'twitter.com', 'x.com',
+        'google.com', 'linktr.ee', 'pagesjaunes.fr', 'tripadvisor.com', 'tripadvisor.fr',
+    ]
+    """
+    Domains hosting pages of unrelated businesses, never cached.
+    """
+
+    def __init__(self, path, ttl=None):
+        self.path = os.path.expanduser(path)
+        if os.path.dirname(self.path) and not os.path.isdir(os.path.dirname(self.path)):
+            os.makedirs(os.path.dirname(self.path))
+        self.ttl = self.TTL if ttl is None else ttl
+        self.lock = Lock()
+        self.flights = {}
+        self.db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        self.db.execute('CREATE TABLE IF NOT EXISTS contacts (domain TEXT PRIMARY KEY, contacts TEXT, expires_at REAL)')
+        self.db.execute('DELETE FROM contacts WHERE expires_at <= ?', (time.time(),))
+
+    def close(self):
+        with self.lock:
+            self.db.close()
+
+    def get_domain(self, url):
+        """
+        Registrable domain of `url`, None when its contacts are not cached.
+
+        Private suffixes (e.g. github.io, blogspot.com) are kept, for the
+        websites of a hosting platform not to share their contacts.
+        """
+        if not url:
+            return None
+        extracted = tldextract.extract(url, include_psl_private_domains=True)
+        if not extracted.domain or not extracted.suffix:
+            return None
+        domain = '.'.join([extracted.domain, extracted.suffix]).lower()
+        if domain in self.UNCACHED_DOMAINS:
+            return None
+        return domain
+
+    def get(self, domain):
+        """
+        Contacts stored for `domain`, None if there are none or they expired.
+        """
+        with self.lock:
+            row = self.db.execute(
+                'SELECT contacts FROM contacts WHERE domain = ? AND expires_at > ?', (domain, time.time())
+            ).fetchone()
+        if row is None:
+            return None
+        return [Contact(**values) for values in json.loads(row[0])]
+
+    def store(self, domain, contacts):
+        if self.ttl <= 0:
+            return
+        values = json.dumps([
+            {'value': contact.value, 'type': contact.type, 'usage': contact.usage, 'source': contact.source}
+            for contact in contacts
+        ])
+        with self.lock:
+            self.db.execute('INSERT OR REPLACE INTO contacts VALUES (?, ?, ?)', (domain, values, time.time() + self.ttl))
+
+    @contextmanager
+    def collecting(self, domain, deadline=None):
+        """
+        Hold `domain` while its contacts are collected, waiting for the
+        thread holding it to be done.
+
+        Yields False when `deadline` (a time.monotonic() value) was reached
+        while waiting.
+        """
+        with self.lock:
+            flight = self.flights.setdefault(domain, [Lock(), 0])
+            flight[1] += 1
+        timeout = -1 if deadline is None else max(0, deadline - time.monotonic())
+        acquired = flight[0].acquire(timeout=timeout)
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                flight[0].release()
+            with self.lock:
+                flight[1] -= 1
+                if not flight[1]:
+                    del self.flights[domain]
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+from urllib.parse import urlsplit
+
+from googlemaps_matrix.module.urls import get_url_key
+
+__all__ = ['ContactTargets', 'rank_contact_link']
+
+
+# Contact type and usage of each target, None matching any usage
+TARGET_KINDS = {
+    'mail': ('MAIL', None),
+    'professional_mail': ('MAIL', 'PROFESSIONAL'),
+    'personal_mail': ('MAIL', 'PERSONAL'),
+    'phone': ('PHONE', None),
+    'professional_phone': ('PHONE', 'PROFESSIONAL'),
+    'personal_phone': ('PHONE', 'PERSONAL'),
+    'facebook': ('SOCIAL_MEDIA', 'FACEBOOK'),
+    'instagram': ('SOCIAL_MEDIA', 'INSTAGRAM'),
+    'twitter': ('SOCIAL_MEDIA', 'TWITTER'),
+    'linkedin': ('SOCIAL_MEDIA', 'LINKEDIN'),
+}
+
+# Keywords of the links visited first, by rank
+LINK_KEYWORDS = [
+    ('contact', 'kontakt'),
+    ('about', 'a-propos', 'qui-sommes-nous', 'ueber-uns'),
+]
+
+
+class ContactTargets(object):
+    """
+    Contacts after which the pages of a website are not visited any further.
+
+    >>> targets = ContactTargets.parse('professional_mail,facebook,instagram')
+    >>> targets.kinds
+    ['professional_mail', 'facebook', 'instagram']
+    """
+
+    def __init__(self, kinds):
+        unknown = [kind for kind in kinds if kind not in TARGET_KINDS]
+        if unknown:
+            raise ValueError('Unknown contact targets: %s. Available targets: %s' % (
+                ', '.join(unknown), ', '.join(sorted(TARGET_KINDS))))
+        self.kinds = list(kinds)
+
+    @classmethod
+    def parse(cls, value):
+        """
+        Targets from a comma separated string or a list of target names.
+        """
+        if isinstance(value, str):
+            value = value.split(',')
+        return cls([kind.strip().lower() for kind in value if kind.strip()])
+
+    def is_satisfied(self, contacts):
+        found = set()
+        for contact in contacts:
+            found.add((contact.type, contact.usage))
+            found.add((contact.type, None))
+        return all(TARGET_KINDS[kind] in found for kind in self.kinds)
+
+
+def get_link_depth(url):
+    return len([part for part in urlsplit(url).path.split('/') if part])
+
+
+def rank_contact_link(website, link):
+    """
+    Sort key of the links of `website`, visited in this order: the website
+    itself (whose page is already fetched for its links), contact pages,
+    about pages, then the others; links of the website host before the
+    others, shallow paths first.
+    """
+    key = get_url_key(link)
+    website_key = get_url_key(website) if website else None
+    if key == website_key:
+        return (0, 0, 0, 0)
+    path = urlsplit(link).path.lower()
+    rank = len(LINK_KEYWORDS) + 1
+    for index, keywords in enumerate(LINK_KEYWORDS):
+        if any(keyword in path for keyword in keywords):
+            rank = index + 1
+            break
+    same_host = website_key is not None and key.split('/')[0] == website_key.split('/')[0]
+    return (1, rank, 0 if same_host else 1, get_link_depth(link))
@@ -4,6 +4,9 @@ from requests.exceptions import ReadTimeout, ConnectTimeout, ConnectionError, To
 from ssl import SSLError
 from monseigneur.monseigneur.core.browser.exceptions import HTTPNotFound, ClientError, ServerError
 from lxml.etree import XMLSyntaxError
+from googlemaps_matrix.module.exceptions import (
+    HostThrottled, UnsupportedContentType, ResponseTooLarge, DownloadDeadlineExceeded,
+)
 
 
 def location_error_handler(func):
@@ -78,6 +81,18 @@ def location_error_handler(func):
         except ValueError as ve:
             self.logger.warning(ve)
             return []
+        except HostThrottled as ht:
+            self.logger.warning(ht)
+            return []
+        except UnsupportedContentType as uct:
+            self.logger.warning(uct)
+            return []
+        except ResponseTooLarge as rtl:
+            self.logger.warning(rtl)
+            return []
+        except DownloadDeadlineExceeded as dde:
+            self.logger.warning(dde)
+            return []
         except Exception as e:
             self.logger.error(traceback.format_exc())
             raise e
@@ -19,3 +19,19 @@ class WrongInput(Exception):
 
 class InvalidUrl(Exception):
     pass
+
+
+class HostThrottled(Exception):
+    pass
+
+
+class UnsupportedContentType(Exception):
+    pass
+
+
+class ResponseTooLarge(Exception):
+    pass
+
+
+class DownloadDeadlineExceeded(Exception):
+    pass
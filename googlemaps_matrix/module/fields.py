@@ -0,0 +1,332 @@
+# -*- coding: utf-8 -*-
+import json
+import re
+from urllib.parse import quote_plus
+
+from monseigneur.monseigneur.core.browser.filters.base import ItemNotFound
+from monseigneur.monseigneur.core.browser.filters.standard import CleanText
+
+from googlemaps_matrix.module.constants import COUNTRIES
+from googlemaps_matrix.results.models import Result
+
+
+__all__ = ['PlaceField', 'LISTING_FIELDS', 'DETAIL_FIELDS', 'extract_place', 'merge_place']
+
+
+countries_by_country_code = {
+    value.upper(): key for key, value in COUNTRIES.items()
+}
+
+NUMBER_DAYS = {
+    0: 'sundays',
+    1: 'mondays',
+    2: 'tuesdays',
+    3: 'wednesdays',
+    4: 'thursdays',
+    5: 'fridays',
+    6: 'saturdays'
+}
+
+_MISSING = object()
+
+
+def split_path(path):
+    """
+    Indexes of a '/' separated path in the place array.
+    """
+    return tuple(int(index) for index in path.split('/'))
+
+
+def get_path(place, indexes, default=None):
+    """
+    Value at `indexes` in the place array, `default` if it does not exist.
+    """
+    for index in indexes:
+        try:
+            place = place[index]
+        except (IndexError, KeyError, TypeError):
+            return default
+    return place
+
+
+class PlaceField(object):
+    """
+    How to read one Result field from a place array.
+
+    :param name: Result attribute
+    :param path: '/' separated indexes in the place array, None for computed fields
+    :param transform: called with the value found at `path`
+    :param compute: called with the place array and the result being filled, instead of reading a path
+    :param default: value used when `path` does not exist
+    :param required: raise ItemNotFound instead of using `default`
+    :param keep: keep the value already set on the result, if any, converted
+                 with `keep` when it is callable
+    """
+
+    __slots__ = ('name', 'path', 'indexes', 'transform', 'compute', 'default', 'required', 'keep')
+
+    def __init__(self, name, path=None, transform=None, compute=None, default=None, required=False, keep=True):
+        self.name = name
+        self.path = path
+        self.indexes = split_path(path) if path is not None else None
+        self.transform = transform
+        self.compute = compute
+        self.default = default
+        self.required = required
+        self.keep = keep
+
+    def __repr__(self):
+        return '<PlaceField %s %r>' % (self.name, self.path)
+
+
+def keep_value(obj, field):
+    """
+    Whether `obj` already has a value for `field`, converting it if needed.
+    """
+    value = getattr(obj, field.name)
+    if not value:
+        return False
+    if callable(field.keep):
+        setattr(obj, field.name, field.keep(value))
+    return True
+
+
+def extract_place(place, fields, obj=None):
+    """
+    Fill a Result from a place array, reading `fields` in order.
+
+    Fields can rely on the ones before them through the result, e.g. the url
+    is built from the name, coordinates and zero_x.
+    """
+    if obj is None:
+        obj = Result()
+    for field in fields:
+        if field.keep and keep_value(obj, field):
+            continue
+        if field.compute is not None:
+            value = field.compute(place, obj)
+        else:
+            value = get_path(place, field.indexes, _MISSING)
+            if value is _MISSING:
+                if field.required:
+                    raise ItemNotFound('Element %r not found' % (field.path,))
+                value = field.default
+            if field.transform is not None:
+                value = field.transform(value)
+        setattr(obj, field.name, value)
+    return obj
+
+
+def merge_place(obj, other, fields):
+    """
+    Fill `obj` with the values of `other`, another Result of the same place
+    extracted on its own, as extract_place would have done on `obj`.
+    """
+    for field in fields:
+        if field.keep and keep_value(obj, field):
+            continue
+        setattr(obj, field.name, getattr(other, field.name))
+    return obj
+
+
+def clean_google_redirect(url):
+    if url and url.startswith('/url'):
+        url = re.findall(r'q=(.*?)&', url)
+        return None if not url else url[0]
+    return url
+
+
+def clean_menu(menu):
+    if menu and 'search?q=' in menu:
+        menu = menu.split('&')[0]
+    return clean_google_redirect(menu)
+
+
+def format_opening_hours(days):
+    return ", ".join(day[0] + " " + " ".join(day[1]) for day in days or [])
+
+
+def format_popular_times(days):
+    popular_times = []
+    for i, v in enumerate(days):
+        day = NUMBER_DAYS[i]
+        e = v[1] if isinstance(v, list) and len(v) > 1 else None
+        if not e:
+            popular_times.append('{}: closed'.format(day))
+            continue
+        popular_times.append(day + ": " + ", ".join("{} {}".format(k[4], k[1]) for k in e))
+    return ', '.join(popular_times)
+
+
+def format_special_category(special_category):
+    if not special_category:
+        return None
+    if type(special_category) is list:
+        return ", ".join([CleanText().filter(el) for el in special_category])
+    return CleanText().filter(special_category)
+
+
+def format_main_image_url(value):
+    if value and not value.startswith('http'):
+        return "https://lh5.googleusercontent.com/p/{}".format(value)
+    return value
+
+
+def format_poi(features):
+    poi = []
+    for v in features:
+        for e in (v[2] if isinstance(v, list) and len(v) > 2 else None) or []:
+            if not e[3]:
+                poi.append(e[1])
+    return ", ".join(poi)
+
+
+def has_health_and_safety(features):
+    return any(v[0] == 'health_and_safety' for v in features)
+
+
+def extract_text(text) -> list:
+    text_list = []
+    if isinstance(text, str):
+        text_list.append(text)
+    elif isinstance(text, list):
+        for item in text:
+            if isinstance(item, int) or item is None:
+                continue
+            if isinstance(item, str) and re.search(r'http', item):
+                continue
+            if isinstance(item, list):
+                text_list.extend(extract_text(item))
+            elif isinstance(item, str):
+                text_list.append(item)
+    return text_list
+
+
+_ABOUT_TEXT = split_path('32')
+_FEATURES = split_path('100/1')
+_AMENITIES = split_path('64/2')
+_AMENITIES_FALLBACK = split_path('35/32/0/0/1')
+
+
+def compute_about(place, obj):
+    about = {}
+    text_about = get_path(place, _ABOUT_TEXT)
+    if text_about:
+        about['about_description'] = ' '.join(extract_text(text_about))
+
+    feature_section = get_path(place, _FEATURES)
+    if feature_section:
+        for feature_item in feature_section:
+            about[feature_item[0]] = [feature_value[1] for feature_value in feature_item[2]]
+
+    amenities = get_path(place, _AMENITIES) or get_path(place, _AMENITIES_FALLBACK)
+    if amenities:
+        amenities_list = [amenity[2] for amenity in amenities if amenity[3] == 1]
+        about['amenities'] = ', '.join(amenities_list)
+
+    return json.dumps(about)
+
+
+_G_URL = split_path('89')
+_PREVIEW_URL = split_path('42')
+_PLACE_ID = split_path('78')
+
+
+def compute_url(place, obj):
+    g_url = get_path(place, _G_URL)
+    preview_url = get_path(place, _PREVIEW_URL)
+    place_id = get_path(place, _PLACE_ID)
+    name = obj.name or " "
+    lat = round(obj.lat, 5)
+    lng = round(obj.lng, 5)
+    zero_x = obj.zero_x
+
+    if place_id:
+        url = f"https://www.google.com/maps/place/{quote_plus(name.replace(' ', '+'))}/data=!4m6!3m5!1s{zero_x}!8m2!3d{lat}!4d{lng}!19s{place_id}?authuser=0&hl=en&rclk=1"
+    elif g_url:
+        g_url = quote_plus(g_url)
+        if not zero_x:
+            url = f"https://www.google.com/maps/place/{quote_plus(name.replace(' ', '+'))}/@{lat},{lng}/data=!4m9!3m8!5m2!4m1!1i2!8m2!3d{lng}!4d3.1589799!16s{g_url}!17BQ0FF"
+        else:
+            url = f"https://www.google.com/maps/place/{quote_plus(name.replace(' ', '+'))}/@{lat},{lng}/data=!3m1!4b1!4m6!3m5!1s{zero_x}!8m2!3d{lat}!4d{lng}!16s{g_url}"
+    else:
+        url = preview_url
+    if place_id and len(url) > 1000:
+        url = f'https://www.google.com/maps/place/?q=place_id:{place_id}'
+    return url
+
+
+def compute_cid(place, obj):
+    if not obj.zero_x:
+        return None
+    return str(int(obj.zero_x.split(':')[-1], 16))
+
+
+def compute_country(place, obj):
+    if obj.country_code:
+        return countries_by_country_code.get(obj.country_code.upper())
+    return None
+
+
+def status_contains(text):
+    def transform(status):
+        return status is not None and text in status
+    return transform
+
+
+NAME = PlaceField('name', '11', required=True)
+ZERO_X = PlaceField('zero_x', '10', required=True)
+# Coordinates of a place URL are set as strings by go_results
+LAT = PlaceField('lat', '9/2', float, required=True, keep=float)
+LNG = PlaceField('lng', '9/3', float, required=True, keep=float)
+URL = PlaceField('url', compute=compute_url)
+WEBSITE = PlaceField('website', '7/0', clean_google_redirect)
+COUNTRY_CODE = PlaceField('country_code', '243')
+COUNTRY = PlaceField('country', compute=compute_country)
+ADDRESS = PlaceField('address', '39')
+ZIP_CODE = PlaceField('zip_code', '183/1/4')
+CITY = PlaceField('city', '183/1/3')
+PHONE = PlaceField('phone', '178/0/3')
+SCORE = PlaceField('score', '4/7')
+RATINGS = PlaceField('ratings', '4/8')
+PRICE = PlaceField('price', '4/10')
+DESCRIPTION = PlaceField('description', '32/1/1')
+OPENING_HOURS = PlaceField('opening_hours', '34/1', format_opening_hours)
+BOOKING_LINK = PlaceField('booking_link', '75/0/0/2/0/1/2/0')
+MENU = PlaceField('menu', '38/0', clean_menu, keep=False)
+IMAGES_COUNT = PlaceField('images_count', '37/1', lambda value: value or 0, default=0, keep=False)
+HAS_OWNER = PlaceField('has_owner', '49/1', lambda value: value.lower() != 'claim this business', default='', keep=False)
+POPULAR_TIMES = PlaceField('popular_times', '84/0', format_popular_times, default=[], keep=False)
+
+# Fields of a listing result, the place array being `el[14]` of the listing response
+LISTING_FIELDS = [
+    NAME, ZERO_X, LAT, LNG, URL,
+    PlaceField('cid', compute=compute_cid),
+    SCORE, RATINGS, ADDRESS, ZIP_CODE, COUNTRY_CODE, COUNTRY, CITY,
+    PlaceField('category', '13', lambda value: ", ".join(value or []), default=[]),
+    PlaceField('special_category', '64/3', format_special_category, default=[]),
+    PHONE, DESCRIPTION, WEBSITE,
+    PlaceField('main_image_url', '51/0/1/0', format_main_image_url),
+    PRICE, IMAGES_COUNT, OPENING_HOURS,
+    PlaceField('is_temporarily_closed', '160/0', bool),
+    PlaceField('is_permanently_closed', '23', bool),
+    HAS_OWNER, BOOKING_LINK, POPULAR_TIMES, MENU,
+]
+
+# Fields of a detail result, the place array being `doc[6]` of the preview response.
+# Values already known from the listing are kept.
+DETAIL_FIELDS = [
+    NAME, LAT, LNG, ZERO_X, URL, WEBSITE, COUNTRY_CODE, COUNTRY, ADDRESS, ZIP_CODE, CITY,
+    PHONE, SCORE, RATINGS, PRICE, OPENING_HOURS, BOOKING_LINK, MENU,
+    PlaceField('poi', '100/1', format_poi, default=[], keep=False),
+    DESCRIPTION,
+    PlaceField('plus_code', '183/2/2/0', keep=False),
+    PlaceField('last_opening_hours_updated_at', '203/5/0', keep=False),
+    PlaceField('health', '100/1', has_health_and_safety, default=[], keep=False),
+    POPULAR_TIMES, IMAGES_COUNT,
+    # The preview response reports the two statuses the other way around
+    PlaceField('is_temporarily_closed', '96/5/-1/3', status_contains('permanently closed'), keep=False),
+    PlaceField('is_permanently_closed', '96/5/-1/3', status_contains('temporarily closed'), keep=False),
+    HAS_OWNER,
+    PlaceField('about', compute=compute_about, keep=False),
+]
@@ -2,7 +2,12 @@
 
 from deproto import Protobuf
 from .browser import GoogleMapsBrowser
+from .cache import GoogleMapsHttpCache, GoogleMapsFingerprint
+from .contact_cache import ContactCache
+from .crawl_policy import ContactTargets
 from monseigneur.monseigneur.core.tools.backend import Module
+from monseigneur.monseigneur.core.browser.archive import ResponseArchive
+from monseigneur.monseigneur.core.browser.replay import ReplayProfile, ReplayStore, ReplayAdapter, ReplayServer
 from monseigneur.monseigneur.core.browser.filters.json import Dict
 
 
@@ -44,9 +49,9 @@ class GoogleMapsModule(Module):
         rid = Dict('3/1/4/3', default=0)(json_data)
         return ids[rid or 0]
 
-    def go_results(self, url, language="en", country="US", page=1, ratings=None):
+    def go_results(self, url, language="en", country="US", page=1, ratings=None, tiling=False, speculative=False):
         ratings = self.get_rating(ratings, *url.split('/data=', 1))
-        return self.browser.go_results(url, language, country, page, ratings)
+        return self.browser.go_results(url, language, country, page, ratings, tiling=tiling, speculative=speculative)
 
     def iter_results(self):
         return self.browser.iter_results()
@@ -66,14 +71,45 @@ class GoogleMapsModule(Module):
     def get_result(self, obj):
         return self.browser.get_result(obj)
 
-    def get_contacts(self, result):
-        return self.browser.get_contacts(result)
+    def set_http_cache(self, path, max_size=None):
+        self.browser.set_http_cache(GoogleMapsHttpCache(path, max_size))
+
+    def set_contact_cache(self, path, ttl=None):
+        self.browser.set_contact_cache(ContactCache(path, ttl))
+
+    def set_contact_targets(self, targets):
+        self.browser.set_contact_targets(ContactTargets.parse(targets) if targets else None)
+
+    def set_archive(self, directory, sample_rate=1.0):
+        self.browser.set_archive(ResponseArchive(directory, sample_rate=sample_rate, logger=self.logger))
+
+    def set_replay(self, directory, latency=0, jitter=0, error_rate=0, server=False):
+        store = ReplayStore(GoogleMapsFingerprint())
+        count = store.load_archive(directory)
+        self.logger.info('Replaying %d responses archived in %s', count, directory)
+        profile = ReplayProfile(latency=latency, jitter=jitter, error_rate=error_rate)
+        if server:
+            transport = ReplayServer(store, profile, logger=self.logger).start()
+            self.logger.info('Replay server listening on %s', transport.url)
+        else:
+            transport = ReplayAdapter(store, profile)
+        self.browser.set_replay(transport)
+        return transport
+
+    def get_contacts(self, result, deadline=None):
+        return self.browser.get_contacts(result, deadline=deadline)
+
+    def is_contact_host_ready(self, url):
+        return self.browser.is_contact_host_ready(url)
 
     def fill_result_details(self, result):
         if self.go_result(result):
             return self.get_result(obj=result)
         return result
 
+    def fill_results_details(self, results, concurrency=None):
+        return self.browser.fill_results_details(results, concurrency)
+
     def fill_images(self, result, cursor=None, img_id=None):
         return self.browser.fill_images(result, cursor, img_id)
 
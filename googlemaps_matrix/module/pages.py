@@ -2,33 +2,20 @@
 import json
 import re
 import tldextract
+from lxml import etree
 from .regexer import Regex
-from urllib.parse import quote_plus
+from .scanner import ContactScanner
+from .urls import canonicalize_url, get_url_key
 from json.decoder import JSONDecodeError
-from monseigneur.monseigneur.core.browser.elements import ItemElement, ListElement, method
-from monseigneur.monseigneur.core.browser.filters.standard import Field, CleanText
 from monseigneur.monseigneur.core.browser.filters.json import Dict
 from monseigneur.monseigneur.core.browser.pages import HTMLPage, JsonPage
 
-from googlemaps_matrix.module.constants import COUNTRIES
-from googlemaps_matrix.results.models import Result, Contact
-
-
-countries_by_country_code = {
-    value.upper(): key for key, value in COUNTRIES.items()
-}
+from googlemaps_matrix.module.exceptions import IncompletePageError
+from googlemaps_matrix.module.fields import extract_place, LISTING_FIELDS, DETAIL_FIELDS
+from googlemaps_matrix.results.models import Contact
 
 
 PER_PAGE = 200
-NUMBER_DAYS = {
-    0: 'sundays',
-    1: 'mondays',
-    2: 'tuesdays',
-    3: 'wednesdays',
-    4: 'thursdays',
-    5: 'fridays',
-    6: 'saturdays'
-}
 
 class ConsentPage(HTMLPage):
 
@@ -92,170 +79,10 @@ class ListingPage(JsonPage):
     def has_next_page(self):
         return not (len(Dict('0/1', default=[])(self.doc)) < PER_PAGE)
 
-    @method
-    class iter_results(ListElement):
-
-        def find_elements(self):
-            els = Dict('0/1', default=[])(self.page.doc)
-            for el in els:
-                if Dict('14/9/3', default=None)(el):
-                    yield el[14]
-
-        class get_result(ItemElement):
-            klass = Result
-
-            def obj_url(self):
-                name = Field('name')(self) or " "
-                lat = round(Field('lat')(self), 5)
-                lng = round(Field('lng')(self), 5)
-                zero_x = Field('zero_x')(self)
-                raw_url = Dict('89', default=None)(self)
-                preview_url = Dict('42', default=None)(self)
-                place_id = Dict('78', default=None)(self)
-
-                if place_id:
-                    url = f"https://www.google.com/maps/place/{quote_plus(name.replace(' ', '+'))}/data=!4m6!3m5!1s{zero_x}!8m2!3d{lat}!4d{lng}!19s{place_id}?authuser=0&hl=en&rclk=1"
-                elif raw_url:
-                    g_url = quote_plus(raw_url)
-                    if not zero_x:
-                        url = f"https://www.google.com/maps/place/{quote_plus(name.replace(' ', '+'))}/@{lat},{lng}/data=!4m9!3m8!5m2!4m1!1i2!8m2!3d{lng}!4d3.1589799!16s{g_url}!17BQ0FF"
-                    else:
-                        url = f"https://www.google.com/maps/place/{quote_plus(name.replace(' ', '+'))}/@{lat},{lng}/data=!3m1!4b1!4m6!3m5!1s{zero_x}!8m2!3d{lat}!4d{lng}!16s{g_url}"
-                else:
-                    url = preview_url
-                if place_id and len(url) > 1000:
-                    url = f'https://www.google.com/maps/place/?q=place_id:{place_id}'
-                return url
-
-            def obj_zero_x(self):
-                zero_x = Dict('10')(self)
-                return zero_x
-
-            def obj_cid(self):
-                zero_x = Field('zero_x')(self)
-                if not zero_x:
-                    return
-                zero_x = zero_x.split(':')[-1]
-                return str(int(zero_x, 16))
-
-            def obj_name(self):
-                return Dict('11')(self)
-
-            def obj_lng(self):
-                return Dict('9/3')(self)
-
-            def obj_lat(self):
-                return Dict('9/2')(self)
-
-            def obj_score(self):
-                return Dict('4/7', default=None)(self)
-
-            def obj_ratings(self):
-                return Dict('4/8', default=None)(self)
-
-            def obj_address(self):
-                return Dict('39', default=None)(self)
-
-            def obj_zip_code(self):
-                return Dict('183/1/4', default=None)(self)
-
-            def obj_country(self):
-                iso = Dict("243", default=None)(self)
-                if not iso:
-                    return
-                return countries_by_country_code.get(iso.upper())
-
-            def obj_country_code(self):
-                return Dict("243", default=None)(self)
-
-            def obj_city(self):
-                return Dict('183/1/3', default=None)(self)
-
-            def obj_category(self):
-                category = ", ".join(Dict('13', default=[])(self) or [])
-                return category
-
-            def obj_special_category(self):
-                special_category = Dict('64/3', default=[])(self)
-                if special_category:
-                    if type(special_category) is list:
-                        special_category = ", ".join([CleanText().filter(el) for el in special_category])
-                    else:
-                        special_category = CleanText().filter(special_category)
-                    return special_category
-                return None
-
-            def obj_phone(self):
-                return Dict('178/0/3', default=None)(self)
-
-            def obj_description(self):
-                return Dict('32/1/1', default=None)(self)
-
-            def obj_website(self):
-                website = Dict('7/0', default=None)(self)
-                if website and website.startswith('/url'):
-                    website = re.findall(r'q=(.*?)&', website)
-                    return None if not website else website[0]
-                return website
-
-            def obj_main_image_url(self):
-                v = Dict('51/0/1/0', default=None)(self)
-                if v and not v.startswith('http'):
-                    return "https://lh5.googleusercontent.com/p/{}".format(v)
-                return v
-
-            def obj_price(self):
-                return Dict('4/10', default=None)(self)
-
-            def obj_images_count(self):
-                return Dict('37/1', default=0)(self) or 0
-
-            def obj_opening_hours(self):
-                opening_hours = []
-                v = Dict('34/1', default=[])(self) or []
-                for e in v:
-                    opening_hours += [Dict('0')(e) + " " + " ".join(Dict('1')(e))]
-                return ", ".join(opening_hours)
-
-            def obj_is_temporarily_closed(self):
-                closed = Dict('160/0', default=None)(self)
-                return bool(closed)
-
-            def obj_is_permanently_closed(self):
-                closed = Dict('23', default=None)(self)
-                return bool(closed)
-
-            def obj_has_owner(self):
-                v = Dict('49/1', default='')(self).lower() == 'claim this business'
-                return not bool(v)
-
-            def obj_booking_link(self):
-                return Dict('75/0/0/2/0/1/2/0', default=None)(self)
-
-            def obj_popular_times(self):
-                popular_times = []
-                for i, v in enumerate(Dict('84/0', default=[])(self)):
-                    day = NUMBER_DAYS[i]
-                    e = Dict('1', default=None)(v)
-                    if not e:
-                        popular_times.append('{}: closed'.format(day))
-                        continue
-                    n = []
-                    for k in e:
-                        _time = Dict('4')(k)
-                        _value = Dict('1')(k)
-                        n += ["{} {}".format(_time, _value)]
-                    popular_times += [day + ": " + ", ".join(n)]
-                return ', '.join(popular_times)
-
-            def obj_menu(self):
-                menu = Dict('38/0', default=None)(self)
-                if menu and 'search?q=' in menu:
-                    menu = menu.split('&')[0]
-                if menu and menu.startswith('/url'):
-                    menu = re.findall(r'q=(.*?)&', menu)
-                    return None if not menu else menu[0]
-                return menu
+    def iter_results(self):
+        for el in Dict('0/1', default=[])(self.doc):
+            if Dict('14/9/3', default=None)(el):
+                yield extract_place(el[14], LISTING_FIELDS)
 
 
 class DetailPage(JsonPage):
@@ -272,202 +99,9 @@ class DetailPage(JsonPage):
         img = Dict('89', default=None)(self.doc)
         return img
 
-    @method
-    class get_result(ItemElement):
-        klass = Result
-
-        def obj_name(self):
-            return self.obj.name or Dict('11')(self)
-
-        def obj_lat(self):
-            return float(self.obj.lat or Dict('9/2')(self))
-
-        def obj_lng(self):
-            return float(self.obj.lng or Dict('9/3')(self))
-
-        def obj_zero_x(self):
-            return self.obj.zero_x or Dict('10')(self)
-
-        def obj_url(self):
-            if self.obj.url:
-                return self.obj.url
-            g_url = Dict('89', default=None)(self)
-            preview_url = Dict('42', default=None)(self)
-            place_id = Dict('78', default=None)(self)
-            lat = round(Field('lat')(self), 5)
-            lng = round(Field('lng')(self), 5)
-            zero_x = Field('zero_x')(self)
-            name = Field('name')(self)
-
-            if place_id:
-                url = f"https://www.google.com/maps/place/{quote_plus(name.replace(' ', '+'))}/data=!4m6!3m5!1s{zero_x}!8m2!3d{lat}!4d{lng}!19s{place_id}?authuser=0&hl=en&rclk=1"
-            elif g_url:
-                g_url = quote_plus(g_url)
-                if not zero_x:
-                    url = f"https://www.google.com/maps/place/{quote_plus(name.replace(' ', '+'))}/@{lat},{lng}/data=!4m9!3m8!5m2!4m1!1i2!8m2!3d{lng}!4d3.1589799!16s{g_url}!17BQ0FF"
-                else:
-                    url = f"https://www.google.com/maps/place/{quote_plus(name.replace(' ', '+'))}/@{lat},{lng}/data=!3m1!4b1!4m6!3m5!1s{zero_x}!8m2!3d{lat}!4d{lng}!16s{g_url}"
-            else:
-                url = preview_url
-            if place_id and len(url) > 1000:
-                url = f'https://www.google.com/maps/place/?q=place_id:{place_id}'
-            return url
-
-        def obj_website(self):
-            website = self.obj.website or Dict('7/0', default=None)(self)
-            if website and website.startswith('/url'):
-                website = re.findall(r'q=(.*?)&', website)
-                return None if not website else website[0]
-            return website
-
-        def obj_country(self):
-            if self.obj.country_name:
-                return self.obj.country_name
-            iso = self.obj.country_code or Dict("243", default=None)(self)
-            if iso:
-                return countries_by_country_code.get(iso.upper())
-            return None
+    def get_result(self, obj=None):
+        return extract_place(self.doc, DETAIL_FIELDS, obj)
 
-        def obj_country_code(self):
-            return self.obj.country_code or Dict("243", default=None)(self)
-
-        def obj_address(self):
-            return self.obj.address or Dict('39', default=None)(self)
-
-        def obj_zip_code(self):
-            return self.obj.zip_code or Dict('183/1/4', default=None)(self)
-
-        def obj_city(self):
-            return self.obj.city or Dict('183/1/3', default=None)(self)
-
-        def obj_phone(self):
-            return self.obj.phone or Dict('178/0/3', default=None)(self)
-
-        def obj_score(self):
-            return self.obj.score or Dict('4/7', default=None)(self)
-
-        def obj_ratings(self):
-            return self.obj.ratings or Dict('4/8', default=None)(self)
-
-        def obj_price(self):
-            return self.obj.price or Dict('4/10', default=None)(self)
-
-        def obj_opening_hours(self):
-            if self.obj.opening_hours:
-                return self.obj.opening_hours
-            opening_hours = []
-            v = Dict('34/1', default=[])(self) or []
-            for e in v:
-                opening_hours += [Dict('0')(e) + " " + " ".join(Dict('1')(e))]
-            return ", ".join(opening_hours)
-
-        def obj_booking_link(self):
-            return self.obj.booking_link or Dict('75/0/0/2/0/1/2/0', default=None)(self)
-
-        def obj_menu(self):
-            menu = Dict('38/0', default=None)(self)
-            if menu and 'search?q=' in menu:
-                menu = menu.split('&')[0]
-            if menu and menu.startswith('/url'):
-                menu = re.findall(r'q=(.*?)&', menu)
-                return None if not menu else menu[0]
-            return menu
-
-        def obj_poi(self):
-            poi = []
-            for v in Dict('100/1', default=[])(self):
-                for e in Dict('2', default=[])(v):
-                    if not Dict('3')(e):
-                        poi.append(Dict('1')(e))
-            return ", ".join(poi)
-
-        def obj_description(self):
-            return self.obj.description or Dict('32/1/1', default=None)(self)
-
-        def obj_plus_code(self):
-            return Dict('183/2/2/0', default=None)(self)
-
-        def obj_last_opening_hours_updated_at(self):
-            return Dict('203/5/0', default=None)(self)
-
-        def obj_health(self):
-            for v in Dict('100/1', default=[])(self):
-                if v[0] == 'health_and_safety':
-                    return True
-            return False
-
-        def obj_popular_times(self):
-            popular_times = []
-            for i, v in enumerate(Dict('84/0', default=[])(self)):
-                day = NUMBER_DAYS[i]
-                e = Dict('1', default=None)(v)
-                if not e:
-                    popular_times.append('{}: closed'.format(day))
-                    continue
-                n = []
-                for k in e:
-                    _time = Dict('4')(k)
-                    _value = Dict('1')(k)
-                    n += ["{} {}".format(_time, _value)]
-                popular_times += [day + ": " + ", ".join(n)]
-            return ', '.join(popular_times)
-
-        def obj_images_count(self):
-            return Dict('37/1', default=0)(self) or 0
-
-        def obj_is_temporarily_closed(self):
-            status_obj = Dict('96/5/-1/3', default=None)(self)
-            if status_obj is not None and 'permanently closed' in status_obj:
-                return True
-            return False
-
-        def obj_is_permanently_closed(self):
-            status_obj = Dict('96/5/-1/3', default=None)(self)
-            if status_obj is not None and 'temporarily closed' in status_obj:
-                return True
-            return False
-
-        def obj_has_owner(self):
-            v = Dict('49/1', default='')(self).lower() == 'claim this business'
-            return not bool(v)
-
-        def obj_about(self):
-            about = {}
-            text_about = Dict('32', default=None)(self)
-            if text_about:
-                about['about_description'] = ' '.join(self.extract_text(text_about))
-
-            feature_section = Dict('100/1', default=None)(self)
-            if feature_section:
-                for feature_item in feature_section:
-                    feature_items = []
-                    feature_key = Dict('0')(feature_item)
-                    for feature_value in Dict('2')(feature_item):
-                        feature_items.append(Dict('1')(feature_value))
-                    about[feature_key] = feature_items
-
-            amenities = Dict('64/2', default=None)(self) or Dict('35/32/0/0/1', default=None)(self)
-            if amenities:
-                amenities_list = [amenity[2] for amenity in amenities if amenity[3] == 1]
-                about['amenities'] = ', '.join(amenities_list)
-
-            return json.dumps(about)
-
-        def extract_text(self, text) -> list:
-            text_list = []
-            if isinstance(text, str):
-                text_list.append(text)
-            elif isinstance(text, list):
-                for item in text:
-                    if isinstance(item, int) or item is None:
-                        continue
-                    if isinstance(item, str) and re.search(r'http', item):
-                        continue
-                    if isinstance(item, list):
-                        text_list.extend(self.extract_text(item))
-                    elif isinstance(item, str):
-                        text_list.append(item)
-            return text_list
 
 class PersoPage(HTMLPage):
 
@@ -478,10 +112,29 @@ class PersoPage(HTMLPage):
         'yahoo', 'icloud', 'protonmail', 'free.fr', 'aol', 'mail',
         'orange.fr', 'sfr.fr', 'yandex', 'gmx'
     ]
+    # Attributes that might contain emails, in document order
+    MAIL_ATTRIBUTES = etree.XPath('//@href | //@data-email | //@content | //@value', smart_strings=False)
+    MAIL_ATTRIBUTES_MAX = 1000000
+    """
+    Characters of attribute values searched for emails, the others are
+    ignored on pages with a huge number of links.
+    """
+
+    _scanned_contacts = None
 
     def is_here(self):
         return True
 
+    @property
+    def scanned_contacts(self):
+        """
+        Contacts of the page text, found in a single pass shared by
+        iter_mails, iter_phones and iter_social_media.
+        """
+        if self._scanned_contacts is None:
+            self._scanned_contacts = ContactScanner().scan(self.response.text)
+        return self._scanned_contacts
+
     @property
     def domain(self):
         extracted = tldextract.extract(self.url)
@@ -502,7 +155,8 @@ class PersoPage(HTMLPage):
         xpath = f"//*[{' or '.join(conditions)}]/@href"
         links = self.doc.xpath(xpath)
 
-        # Process and yield valid URLs
+        # Process and yield valid URLs, once per page whatever their tracking
+        # parameters, scheme or www prefix
         seen_links = set()
         for link in links:
             if not link:  # Skip empty links
@@ -518,8 +172,10 @@ class PersoPage(HTMLPage):
                 # Basic URL validation
                 if not any(clean_link.startswith(prefix) for prefix in ['http://', 'https://']):
                     continue
-                if clean_link not in seen_links:
-                    seen_links.add(clean_link)
+                clean_link = canonicalize_url(clean_link)
+                key = get_url_key(clean_link)
+                if key not in seen_links:
+                    seen_links.add(key)
                     yield clean_link
             except Exception:
                 continue
@@ -534,27 +190,24 @@ class PersoPage(HTMLPage):
 
     def iter_mails(self):
         """Extract and normalize email addresses from the page content."""
-        # Get both visible text and element attributes that might contain emails
-        content = self.response.text
-        # Also check common attributes that might contain emails
-        for element in self.doc.xpath('//*[@href or @data-email or @content or @value]'):
-            for attr in ['href', 'data-email', 'content', 'value']:
-                attr_value = element.get(attr, '')
-                if attr_value:
-                    content += ' ' + attr_value
-
-        # Handle common email obfuscation techniques
-        content = (content.replace(r'\u0040', '@')
-                        .replace('[at]', '@')
-                        .replace('(at)', '@')
-                        .replace(' at ', '@')
-                        .replace('[dot]', '.')
-                        .replace('(dot)', '.')
-                        .replace(' dot ', '.'))
+        # Emails of the page text, found by the contact scanner
+        emails = list(self.scanned_contacts.mails)
+        # Also check common attributes that might contain emails, their
+        # entities being decoded
+        attr_values = []
+        length = 0
+        for attr_value in self.MAIL_ATTRIBUTES(self.doc):
+            if '@' in attr_value or 'at' in attr_value:
+                attr_values.append(attr_value)
+                length += len(attr_value) + 1
+                if length >= self.MAIL_ATTRIBUTES_MAX:
+                    break
+        if attr_values:
+            emails += ContactScanner().iter_mails(' ' + ' '.join(attr_values))
 
         # Find all potential email addresses
         seen_emails = set()
-        for email in Regex.mail.findall(content):
+        for email in emails:
             # Skip if contains excluded extensions
             if any(ext in email.lower() for ext in self.EXCLUDED_EXTENSIONS):
                 continue
@@ -603,7 +256,7 @@ class PersoPage(HTMLPage):
 
     def iter_phones(self):
         contact_list = []
-        phones_table = list(set([el for el in Regex.phone.findall(self.response.text)]))
+        phones_table = list(dict.fromkeys(self.scanned_contacts.phones))
 
         if phones_table:
             for phone in phones_table:
@@ -624,10 +277,11 @@ class PersoPage(HTMLPage):
 
     def iter_social_media(self):
         social_media_list = []
-        instagrams_table = list(set([el for el in Regex.instagram.findall(self.response.text)]))
-        facebooks_table = list(set([el for el in Regex.facebook.findall(self.response.text)]))
-        twitters_table = list(set([el for el in Regex.twitter.findall(self.response.text)]))
-        linkedins_table = list(set([el for el in Regex.linkedin.findall(self.response.text)]))
+        scanned_contacts = self.scanned_contacts
+        instagrams_table = list(dict.fromkeys(scanned_contacts.instagram))
+        facebooks_table = list(dict.fromkeys(scanned_contacts.facebook))
+        twitters_table = list(dict.fromkeys(scanned_contacts.twitter))
+        linkedins_table = list(dict.fromkeys(scanned_contacts.linkedin))
 
         _domain = self.domain
         if 'facebook.com' in _domain:
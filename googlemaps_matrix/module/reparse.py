@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+import logging
+import os
+import re
+
+import tldextract
+
+from monseigneur.monseigneur.core.browser import Browser
+from monseigneur.monseigneur.core.browser.archive import ArchiveReader
+
+from googlemaps_matrix.module.fields import DETAIL_FIELDS, merge_place
+from googlemaps_matrix.module.pages import ListingPage, DetailPage, PersoPage
+
+
+__all__ = ['ArchiveReparser']
+
+
+LISTING_URL = re.compile(r'^https://www\.google\.[a-z.]+/search\?tbm=map')
+DETAIL_URL = re.compile(r'^https://www\.google\.[a-z.]+/maps/(preview/)?place')
+GOOGLE_URL = re.compile(r'^https?://[^/]*google\.')
+
+CONTACT_ATTRIBUTES = {
+    'FACEBOOK': 'facebook',
+    'INSTAGRAM': 'instagram',
+    'MAIL': 'email',
+    'PHONE': 'additional_phone',
+}
+MAX_CONTACTS = 10
+
+
+def get_kind(entry):
+    if entry.status != 200:
+        return None
+    if LISTING_URL.match(entry.url):
+        return 'listing'
+    if DETAIL_URL.match(entry.url):
+        return 'detail'
+    if GOOGLE_URL.match(entry.url) or entry.content_type != 'text/html':
+        return None
+    return 'website'
+
+
+def get_domain(url):
+    extracted = tldextract.extract(url)
+    return '.'.join([extracted.domain, extracted.suffix])
+
+
+class ReparseBrowser(Browser):
+    """
+    Browser the pages are built with, which never writes a response.
+    """
+
+    def save_custom_response(self, content, ext, precision=""):
+        pass
+
+
+_browser = None
+
+
+def get_browser():
+    """
+    Browser the pages are built with, one per worker process.
+    """
+    global _browser
+    if _browser is None:
+        logger = logging.getLogger('reparse')
+        logger.settings = {'ssl_insecure': False}
+        _browser = ReparseBrowser(logger=logger)
+        _browser.save_logs = False
+    return _browser
+
+
+def parse_chunk(directory, entries, collect_contact=True):
+    """
+    Parse archived responses in a worker process.
+
+    Returns listing results in archive order, detail results by zero_x and
+    contacts by website domain.
+    """
+    reader = ArchiveReader(directory)
+    browser = get_browser()
+    listings, details, contacts = [], {}, {}
+    errors = 0
+    for entry, header, content in reader.iter_read(entries):
+        kind = get_kind(entry)
+        try:
+            response = reader.build_response(header, content)
+            if kind == 'listing':
+                listings.extend(ListingPage(browser, response).iter_results())
+            elif kind == 'detail':
+                result = DetailPage(browser, response).get_result()
+                details[result.zero_x] = result
+            elif kind == 'website' and collect_contact:
+                page = PersoPage(browser, response)
+                found = contacts.setdefault(page.domain, [])
+                found.extend(page.iter_mails())
+                found.extend(page.iter_phones())
+                found.extend(page.iter_social_media())
+        except Exception as e:
+            errors += 1
+            browser.logger.debug('Unable to reparse %s: %r', entry.url, e)
+    return listings, details, contacts, errors
+
+
+class ArchiveReparser(object):
+    """
+    Extract results again from the responses of a ResponseArchive.
+
+    Listing, detail and website responses are parsed by the current pages
+    across `workers` processes; each listing result is then filled with the
+    details and the contacts found on its website, as a scraping run would
+    have. Results only known from a detail response come last.
+
+    Results are yielded as the chunks are parsed, once their detail was
+    seen and, for their website pages, WAIT_CHUNKS more chunks were parsed,
+    so that only the results still waiting (and the contacts by domain) are
+    held in memory. Chunks parsed ahead are bounded to `workers * IN_FLIGHT`.
+    Results come in the order they are complete, not in archive order.
+
+    >>> for result in ArchiveReparser('~/logging/archive'):  # doctest: +SKIP
+    ...     print(result.name)
+    """
+
+    CHUNK_SIZE = 500
+    """
+    Archived responses parsed per worker task.
+    """
+
+    IN_FLIGHT = 2
+    """
+    Chunks submitted per worker before waiting for the oldest one.
+    """
+
+    WAIT_CHUNKS = 2
+    """
+    Chunks parsed after the detail of a result with a website before it is
+    yielded, its website being visited after its detail during a run.
+    """
+
+    def __init__(self, directory, workers=None, collect_contact=True, logger=None):
+        self.directory = directory
+        self.workers = workers
+        self.collect_contact = collect_contact
+        self.logger = logger or logging.getLogger('reparse')
+        self.reader = ArchiveReader(directory)
+
+    def iter_chunks(self):
+        chunk = []
+        for entry in self.reader.iter_entries():
+            if get_kind(entry) is None:
+                continue
+            chunk.append(entry)
+            if len(chunk) >= self.CHUNK_SIZE:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def iter_parsed_chunks(self):
+        """
+        Outcome of parse_chunk for every chunk, in archive order.
+        """
+        max_in_flight = (self.workers or os.cpu_count() or 1) * self.IN_FLIGHT
+        with ProcessPoolExecutor(self.workers) as executor:
+            futures = deque()
+            for chunk in self.iter_chunks():
+                futures.append(executor.submit(parse_chunk, self.directory, chunk, self.collect_contact))
+                if len(futures) >= max_in_flight:
+                    yield futures.popleft().result()
+            while futures:
+                yield futures.popleft().result()
+
+    def apply_contacts(self, result, contacts):
+        """
+        Set contacts found on the website of a result the way ContactBrowser does.
+        """
+        values = {}
+        for contact in contacts:
+            attr = CONTACT_ATTRIBUTES.get(contact.usage) or CONTACT_ATTRIBUTES.get(contact.type)
+            if attr is None or not contact.value:
+                continue
+            found = values.setdefault(attr, [])
+            if contact.value not in found:
+                found.append(contact.value)
+        for attr, found in values.items():
+            setattr(result, attr, ', '.join(found[:MAX_CONTACTS]))
+        return result
+
+    def is_ready(self, result, details, domains, index):
+        """
+        Whether the detail and the website pages of a result were parsed,
+        `details` holding the detail and the chunk it was found in.
+        """
+        if result.zero_x not in details:
+            return False
+        if self.collect_contact and result.website:
+            # the pages of a website can spread over several chunks
+            seen_at = domains.get(get_domain(result.website), -1)
+            return index - details[result.zero_x][1] >= self.WAIT_CHUNKS and seen_at < index
+        return True
+
+    def complete(self, result, details, contacts):
+        detail, _ = details.pop(result.zero_x, (None, None))
+        if detail is not None and detail is not result:
+            merge_place(result, detail, DETAIL_FIELDS)
+        if self.collect_contact and result.website:
+            self.apply_contacts(result, contacts.get(get_domain(result.website), []))
+        return result
+
+    def __iter__(self):
+        # listing results waiting for their detail or contacts, details not
+        # merged yet, contacts by domain and the last chunk of each domain
+        pending, details, contacts, domains = OrderedDict(), {}, {}, {}
+        listed = set()
+        errors = 0
+        for index, (chunk_listings, chunk_details, chunk_contacts, chunk_errors) in enumerate(self.iter_parsed_chunks()):
+            for result in chunk_listings:
+                if result.zero_x not in listed:
+                    listed.add(result.zero_x)
+                    pending[result.zero_x] = result
+            for zero_x, detail in chunk_details.items():
+                # details of results already yielded are dropped
+                if zero_x not in listed or zero_x in pending:
+                    details[zero_x] = (detail, index)
+            for domain, found in chunk_contacts.items():
+                contacts.setdefault(domain, []).extend(found)
+                domains[domain] = index
+            errors += chunk_errors
+            for zero_x, result in list(pending.items()):
+                if self.is_ready(result, details, domains, index):
+                    del pending[zero_x]
+                    yield self.complete(result, details, contacts)
+        if errors:
+            self.logger.warning('%d archived responses could not be parsed', errors)
+
+        for result in pending.values():
+            yield self.complete(result, details, contacts)
+        for detail, _ in list(details.values()):
+            yield self.complete(detail, details, contacts)
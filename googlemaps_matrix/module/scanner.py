@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+import re
+
+from googlemaps_matrix.module.regexer import Regex
+
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+
+__all__ = ['ContactScanner', 'ScannedContacts', 'deobfuscate', 'match_address']
+
+
+# Obfuscations of email addresses, replaced in this order
+OBFUSCATIONS = [
+    (r'\u0040', '@'),
+    ('[at]', '@'),
+    ('(at)', '@'),
+    (' at ', '@'),
+    ('[dot]', '.'),
+    ('(dot)', '.'),
+    (' dot ', '.'),
+]
+
+
+def compile_linear(pattern):
+    """
+    Compile `pattern` with RE2, whose matching time is linear in the text,
+    when it is installed and supports the pattern.
+    """
+    if re2 is not None:
+        try:
+            return re2.compile(pattern)
+        except re2.error:
+            pass
+    return re.compile(pattern)
+
+
+# Literal prefixes of the contacts, found in a single pass over the page:
+# at signs (plain or obfuscated), links and the start of french phone
+# numbers. Every alternative starts with a literal, for the regex engine to
+# skip the other characters without trying the pattern.
+ANCHORS = compile_linear(
+    r'@|\\u0040|\[at\]|\(at\)| at '
+    r'|h(?i:ref="http)|H(?i:ref="http)'
+    r'|\+33|0033|0[1-9]'
+)
+MAIL_ANCHORS = frozenset('@\\[( ')
+HREF_ANCHORS = frozenset('hH')
+
+# What has to surround an at sign for an email address to be there
+LOCAL_PART_END = re.compile(r'(?:[\w.\-]|\[dot\]|\(dot\)| dot )$')
+DOMAIN_START = re.compile(r'[\w\-]{2,100}(?:\.|\[dot\]|\(dot\)| dot )')
+
+WHITESPACE = re.compile(r'\s')
+
+# Parts of Regex.mail, matched one after the other around an at sign. None
+# of them can backtrack: each is a single repeated character class.
+LOCAL_PART = re.compile(r'[\w.\-]*')
+DOMAIN_LABEL = re.compile(r'[\w\-]*')
+LETTERS = re.compile(r'[a-z]*')
+DOTS = re.compile(r'\.*')
+ADDRESS_END = re.compile(r'[\s"<?>()]')
+
+# Longest local part, domain label and first top level domain part matched
+# by Regex.mail
+LOCAL_PART_MAX = 100
+DOMAIN_LABEL_MAX = 100
+TOP_LEVEL_MAX = 100
+
+SOCIAL_NETWORKS = [
+    ('instagram', Regex.instagram),
+    ('facebook', Regex.facebook),
+    ('twitter', Regex.twitter),
+    ('linkedin', Regex.linkedin),
+]
+
+
+def deobfuscate(text):
+    for obfuscation, replacement in OBFUSCATIONS:
+        text = text.replace(obfuscation, replacement)
+    return text
+
+
+def match_address(text, at):
+    """
+    Span of the email address Regex.mail finds around the at sign of `text`
+    at `at`, or None.
+
+    The parts of the pattern are matched one by one, in a time linear in
+    the length of the address: Regex.mail finds the same address, but may
+    backtrack through every length of its bounded repeats first.
+    """
+    local_part = LOCAL_PART.match(text[max(0, at - LOCAL_PART_MAX):at][::-1]).end()
+    if local_part < 2:
+        return None
+    label_end = DOMAIN_LABEL.match(text, at + 1, at + DOMAIN_LABEL_MAX + 2).end()
+    if not 2 <= label_end - at - 1 <= DOMAIN_LABEL_MAX or text[label_end:label_end + 1] != '.':
+        return None
+    top_level = label_end + 1
+    end = LETTERS.match(text, top_level).end()
+    if end - top_level < 2:
+        return None
+    if end - top_level <= TOP_LEVEL_MAX:
+        end = LETTERS.match(text, DOTS.match(text, end).end()).end()
+    if end < len(text) and not ADDRESS_END.match(text, end):
+        return None
+    return at - local_part, end
+
+
+class ScannedContacts(object):
+    """
+    Raw contact values found in a page, in order of appearance.
+    """
+
+    __slots__ = ('mails', 'phones', 'instagram', 'facebook', 'twitter', 'linkedin')
+
+    def __init__(self):
+        self.mails = []
+        self.phones = []
+        self.instagram = []
+        self.facebook = []
+        self.twitter = []
+        self.linkedin = []
+
+    def iter_social_media(self):
+        for name, _ in SOCIAL_NETWORKS:
+            for value in getattr(self, name):
+                yield name, value
+
+
+class ContactScanner(object):
+    """
+    Find the email addresses, phone numbers and social network links of a
+    page in a single pass.
+
+    Instead of running every Regex pattern over the whole page (and once
+    more for each obfuscation replaced), the page is scanned once for the
+    literal prefixes of the contacts; the Regex patterns are then only
+    matched where a prefix was found. Email addresses are matched in a
+    window around their at sign, once its obfuscations are replaced.
+
+    Every match reads a bounded part of the page, so that minified scripts
+    or base64 blobs cannot make the scan quadratic: phone numbers are
+    bounded by their pattern, addresses by MAIL_SCAN_MAX and links by
+    LINK_MAX. The prefixes are found with RE2 when it is installed.
+
+    >>> contacts = ContactScanner().scan('<a href="mailto:hello@example.com">')
+    >>> contacts.mails
+    ['hello@example.com']
+    """
+
+    MAIL_WINDOW = 512
+    """
+    Characters around an at sign searched for the email address it belongs
+    to, longer than any address and its obfuscations.
+    """
+
+    MAIL_SCAN_MAX = 4096
+    """
+    Characters after an at sign beyond which an address is given up, many
+    more than the 254 characters of the longest valid one even obfuscated.
+    """
+
+    LINK_MAX = 2048
+    """
+    Longest social network link kept, as browsers do not handle longer URLs.
+    """
+
+    def scan(self, text, mails=True, phones=True, social_media=True):
+        contacts = ScannedContacts()
+        phone_end = 0
+        for anchor in ANCHORS.finditer(text):
+            start = anchor.start()
+            first = text[start]
+            if first in MAIL_ANCHORS:
+                if mails:
+                    mail = self.match_mail(text, start, anchor.end())
+                    if mail is not None:
+                        contacts.mails.append(mail)
+            elif first not in HREF_ANCHORS:
+                # the pattern looks behind for the character before the number
+                if phones and start >= phone_end:
+                    match = Regex.phone.match(text, start)
+                    if match is not None:
+                        contacts.phones.append(match.group())
+                        phone_end = match.end()
+            elif social_media:
+                # the patterns look behind for the href attribute
+                start = anchor.end() - len('http')
+                for name, regex in SOCIAL_NETWORKS:
+                    match = regex.match(text, start, start + self.LINK_MAX)
+                    if match is not None and match.end() < start + self.LINK_MAX:
+                        getattr(contacts, name).append(match.group())
+        return contacts
+
+    def iter_mails(self, text):
+        return self.scan(text, phones=False, social_media=False).mails
+
+    def match_mail(self, text, start, end):
+        """
+        Email address containing the at sign found between `start` and `end`.
+        """
+        if not LOCAL_PART_END.search(text, max(0, start - 5), start) or not DOMAIN_START.match(text, end):
+            return None
+
+        low = max(0, start - self.MAIL_WINDOW)
+        high = end + self.MAIL_WINDOW
+        while True:
+            if high < len(text):
+                # cut the window on a whitespace, for its end not to be
+                # taken for the end of an address
+                whitespace = WHITESPACE.search(text, high, high + self.MAIL_WINDOW)
+                high = whitespace.start() if whitespace else high
+            window_end = min(high, len(text))
+            before = deobfuscate(text[low:start])
+            window = before + deobfuscate(text[start:window_end])
+            span = match_address(window, len(before))
+            if span is None:
+                return None
+            if span[1] < len(window) or window_end == len(text):
+                return window[span[0]:span[1]]
+            # the address may go on after the window
+            if window_end - end >= self.MAIL_SCAN_MAX:
+                return None
+            high = window_end + self.MAIL_WINDOW
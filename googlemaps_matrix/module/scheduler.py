@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from threading import Condition
+from urllib.parse import urlparse
+import time
+
+from googlemaps_matrix.module.exceptions import HostThrottled
+
+
+__all__ = ['HostScheduler']
+
+
+class HostState(object):
+    def __init__(self, burst):
+        self.active = 0
+        self.tokens = float(burst)
+        self.refilled_at = time.monotonic()
+        self.deferred_until = 0.0
+
+
+class HostScheduler(object):
+    """
+    Politeness scheduler shared by the threads of a browser.
+
+    Each host gets at most `concurrency` requests at the same time and a token
+    bucket refilled with `rate` tokens per second, up to `burst` tokens. A 429
+    or 503 response carrying a `Retry-After` header defers the whole host.
+    Idle hosts whose bucket is full again are forgotten, as a new state would
+    be the same as theirs.
+
+    >>> scheduler = HostScheduler(concurrency=2, rate=1, burst=2)
+    >>> with scheduler.slot('https://example.com/contact', deadline=time.monotonic() + 10):  # doctest: +SKIP
+    ...     response = browser.open('https://example.com/contact')
+    """
+
+    PRUNE_MIN = 1000
+    """
+    Hosts kept before idle ones are swept, the sweep runs again once the
+    hosts left doubled.
+    """
+
+    def __init__(self, concurrency=2, rate=1.0, burst=2, max_retry_after=120, respect_retry_after=True):
+        self.concurrency = concurrency
+        self.rate = rate
+        self.burst = burst
+        self.max_retry_after = max_retry_after
+        self.respect_retry_after = respect_retry_after
+        self.hosts = {}
+        self.prune_at = self.PRUNE_MIN
+        self.condition = Condition()
+
+    @staticmethod
+    def get_host(url):
+        host = urlparse(url if '//' in url else '//' + url).netloc.lower()
+        return host[4:] if host.startswith('www.') else host
+
+    def _state(self, host):
+        state = self.hosts.get(host)
+        if state is None:
+            if len(self.hosts) >= self.prune_at:
+                self._prune(time.monotonic())
+            state = self.hosts[host] = HostState(self.burst)
+        return state
+
+    def _is_idle(self, state, now):
+        if state.active or state.deferred_until > now:
+            return False
+        self._refill(state, now)
+        return state.tokens >= self.burst
+
+    def _prune(self, now):
+        for host, state in list(self.hosts.items()):
+            if self._is_idle(state, now):
+                del self.hosts[host]
+        self.prune_at = max(self.PRUNE_MIN, 2 * len(self.hosts))
+
+    def _refill(self, state, now):
+        state.tokens = min(self.burst, state.tokens + (now - state.refilled_at) * self.rate)
+        state.refilled_at = now
+
+    def _delay(self, state, now):
+        """
+        Seconds to wait before a request can be sent to this host, None if it
+        has to wait for another request to finish.
+        """
+        if state.deferred_until > now:
+            return state.deferred_until - now
+        if state.active >= self.concurrency:
+            return None
+        self._refill(state, now)
+        if state.tokens < 1:
+            return (1 - state.tokens) / self.rate
+        return 0
+
+    def ready(self, url):
+        """
+        Whether a request to the host of `url` would be sent right away.
+        """
+        with self.condition:
+            state = self.hosts.get(self.get_host(url))
+            return state is None or self._delay(state, time.monotonic()) == 0
+
+    def acquire(self, url, deadline=None):
+        host = self.get_host(url)
+        with self.condition:
+            while True:
+                # idle states are dropped while we wait, always use the current one
+                state = self._state(host)
+                now = time.monotonic()
+                delay = self._delay(state, now)
+                if delay == 0:
+                    state.active += 1
+                    state.tokens -= 1
+                    return host
+                if deadline is not None:
+                    if now >= deadline or (delay is not None and now + delay > deadline):
+                        raise HostThrottled('Host %s is throttled' % host)
+                    delay = deadline - now if delay is None else delay
+                self.condition.wait(delay)
+
+    def release(self, host):
+        with self.condition:
+            state = self.hosts[host]
+            state.active -= 1
+            if self._is_idle(state, time.monotonic()):
+                del self.hosts[host]
+            self.condition.notify_all()
+
+    @contextmanager
+    def slot(self, url, deadline=None):
+        """
+        Hold a request slot of the host of `url`, waiting at most until
+        `deadline` (a time.monotonic() value) to get it.
+        """
+        host = self.acquire(url, deadline)
+        try:
+            yield
+        finally:
+            self.release(host)
+
+    def get_retry_after(self, value):
+        try:
+            return float(value)
+        except ValueError:
+            pass
+        try:
+            return parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+
+    def observe(self, response, **kwargs):
+        """
+        Response hook deferring hosts which asked us to slow down.
+        """
+        if not self.respect_retry_after or response.status_code not in (429, 503):
+            return
+        retry_after = self.get_retry_after(response.headers.get('Retry-After') or '')
+        if retry_after is None or retry_after <= 0:
+            return
+        with self.condition:
+            state = self._state(self.get_host(response.url))
+            state.deferred_until = max(state.deferred_until, time.monotonic() + min(retry_after, self.max_retry_after))
+            self.condition.notify_all()
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+import math
+
+
+__all__ = ['Tile']
+
+TILE_SIZE = 256
+SCREEN_PIXEL_WIDTH = 1024
+SCREEN_PIXEL_HEIGHT = 768
+
+
+class Tile(object):
+    """
+    A rectangular piece of the search viewport.
+
+    A tile is described the same way a listing request is: a center and a zoom
+    level, the viewport being the 1024x768 pixels screen sent in the `pb`
+    parameter. Splitting a tile gives its four quadrants, one zoom level deeper.
+    """
+
+    def __init__(self, lat, lng, zoom, depth=0):
+        self.lat = float(lat)
+        self.lng = float(lng)
+        self.zoom = int(zoom)
+        self.depth = depth
+
+    def __repr__(self):
+        return '<Tile lat=%.6f lng=%.6f zoom=%d depth=%d>' % (self.lat, self.lng, self.zoom, self.depth)
+
+    @property
+    def lng_span(self):
+        return SCREEN_PIXEL_WIDTH * 360.0 / (TILE_SIZE * 2 ** self.zoom)
+
+    @property
+    def lat_span(self):
+        return SCREEN_PIXEL_HEIGHT * 360.0 / (TILE_SIZE * 2 ** self.zoom) * math.cos(math.radians(self.lat))
+
+    @property
+    def bounds(self):
+        """(south, west, north, east) of the viewport covered by this tile."""
+        return (
+            self.lat - self.lat_span / 2,
+            self.lng - self.lng_span / 2,
+            self.lat + self.lat_span / 2,
+            self.lng + self.lng_span / 2,
+        )
+
+    def split(self):
+        lat_offset = self.lat_span / 4
+        lng_offset = self.lng_span / 4
+        return [
+            Tile(self.lat + lat_sign * lat_offset, self.lng + lng_sign * lng_offset, self.zoom + 1, self.depth + 1)
+            for lat_sign in (1, -1)
+            for lng_sign in (-1, 1)
+        ]
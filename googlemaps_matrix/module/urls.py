@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+from urllib.parse import urlsplit, urlunsplit
+
+__all__ = ['canonicalize_url', 'get_url_key']
+
+
+# Query parameters only used to track visits, by name and by prefix
+TRACKING_PARAMS = frozenset([
+    'gclid', 'gbraid', 'wbraid', 'dclid', 'fbclid', 'msclkid', 'yclid', 'igshid', 'srsltid',
+    'mc_cid', 'mc_eid', '_ga', '_gl', '_hsenc', '_hsmi',
+])
+TRACKING_PREFIXES = ('utm_', 'hsa_', 'pk_', 'mtm_')
+
+DEFAULT_PORTS = {'http': ':80', 'https': ':443'}
+
+
+def is_tracking_param(param):
+    name = param.split('=', 1)[0].lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+
+def canonicalize_url(url):
+    """
+    `url` without its tracking parameters nor fragment, its scheme and host
+    in lower case and without default port. http is used when there is no
+    scheme. The other parameters are kept as they are, in their order.
+
+    >>> canonicalize_url('HTTPS://WWW.Example.fr:443/Contact?utm_source=google_my_business&id=2#map')
+    'https://www.example.fr/Contact?id=2'
+    """
+    if not url.lower().startswith('http'):
+        url = 'http://' + url
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return url
+    scheme = parts.scheme.lower()
+    netloc = parts.netloc.lower()
+    port = DEFAULT_PORTS.get(scheme)
+    if port and netloc.endswith(port):
+        netloc = netloc[:-len(port)]
+    query = '&'.join(param for param in parts.query.split('&') if param and not is_tracking_param(param))
+    return urlunsplit((scheme, netloc, parts.path or '/', query, ''))
+
+
+def get_url_key(url):
+    """
+    Key shared by the URLs of a same page: its canonical URL without scheme,
+    `www.` prefix and trailing slash, with sorted parameters.
+
+    >>> get_url_key('http://www.example.fr/contact/?b=2&a=1') == get_url_key('https://example.fr/contact?a=1&b=2')
+    True
+    """
+    url = canonicalize_url(url)
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return url
+    netloc = parts.netloc
+    if netloc.startswith('www.'):
+        netloc = netloc[len('www.'):]
+    key = netloc + parts.path.rstrip('/')
+    if parts.query:
+        key += '?' + '&'.join(sorted(parts.query.split('&')))
+    return key
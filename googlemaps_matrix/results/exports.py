@@ -0,0 +1,294 @@
+from abc import ABC, abstractmethod
+import csv
+import json
+import os
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+
+__all__ = ['COLUMNS', 'OPTIONAL_COLUMNS', 'FIELDS', 'CsvResultWriter', 'JsonlResultWriter', 'ParquetResultWriter', 'WRITERS']
+
+
+# Columns written for every result
+COLUMNS = [
+    'name', 'address', 'city', 'zip_code', 'country', 'phone', 'additional_phone',
+    'email', 'website', 'facebook', 'instagram', 'category', 'score', 'ratings',
+    'opening_hours', 'is_temporarily_closed', 'is_permanently_closed',
+    'lat', 'lng', 'url'
+]
+
+# Optional columns that might not be present in all results
+OPTIONAL_COLUMNS = [
+    'description', 'price', 'menu', 'booking_link', 'popular_times',
+    'special_category', 'has_owner', 'about', 'poi'
+]
+
+# Streamed files always have the optional columns, as the schema has to be known
+# before the first row; save_to_csv only keeps the ones results have.
+FIELDS = COLUMNS + OPTIONAL_COLUMNS
+
+
+class ResultWriter(ABC):
+    """
+    Stream results to a file as they come
+
+    Rows are written to `<filepath>.part`, synced to disk every
+    `fsync_every` rows, and the file is renamed to `filepath` once closed
+    without error. After a failure the `.part` file is left with the rows
+    written so far.
+
+    Usage:
+    ```python
+    with CsvResultWriter("results.csv") as writer:
+        for result in backend.iter_results():
+            writer.write(result)
+    ```
+    """
+
+    EXTENSION = None
+    FSYNC_EVERY = 1000
+
+    def __init__(self, filepath, fields=None, fsync_every=None):
+        self.filepath = filepath
+        self.part_filepath = filepath + '.part'
+        self.fields = list(fields or FIELDS)
+        self.fsync_every = fsync_every or self.FSYNC_EVERY
+        self.count = 0
+        self.file = self.open_file()
+        self.write_header()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.file.closed:
+            # discarded already
+            return
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def open_file(self):
+        return open(self.part_filepath, 'w', newline='', encoding='utf-8')
+
+    def write_header(self):
+        pass
+
+    @abstractmethod
+    def write_row(self, result):
+        """
+        Write one result, in the format of the subclass
+        """
+
+    def write(self, result):
+        self.write_row(result)
+        self.count += 1
+        if self.count % self.fsync_every == 0:
+            self.sync()
+
+    def write_all(self, results):
+        for result in results:
+            self.write(result)
+        return self.count
+
+    def sync(self):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def close(self):
+        """
+        Sync the remaining rows and move the file to its final path
+        """
+        self.sync()
+        self.file.close()
+        os.replace(self.part_filepath, self.filepath)
+
+    def abort(self):
+        self.file.close()
+
+    def discard(self):
+        """
+        Close and remove the file, e.g. when no result was written
+        """
+        self.abort()
+        os.remove(self.part_filepath)
+
+
+class CsvResultWriter(ResultWriter):
+    EXTENSION = 'csv'
+
+    def __init__(self, *args, **kwargs):
+        self.writer = None
+        super(CsvResultWriter, self).__init__(*args, **kwargs)
+
+    def write_header(self):
+        self.writer = csv.writer(self.file, quoting=csv.QUOTE_MINIMAL)
+        self.writer.writerow(self.fields)
+
+    def write_row(self, result):
+        row = []
+        for column in self.fields:
+            if hasattr(result, column):
+                value = getattr(result, column)
+                # Handle lists and complex objects
+                if isinstance(value, (list, tuple)):
+                    value = ', '.join(str(v) for v in value)
+                row.append(value)
+            else:
+                row.append('')
+        self.writer.writerow(row)
+
+
+class JsonlResultWriter(ResultWriter):
+    EXTENSION = 'jsonl'
+
+    def write_row(self, result):
+        row = {column: getattr(result, column, None) for column in self.fields}
+        self.file.write(json.dumps(row, ensure_ascii=False, default=str))
+        self.file.write('\n')
+
+
+def to_text(value):
+    """
+    Strings are kept, nested values (e.g. image dicts, raw opening hours)
+    are written as JSON for other tools to read them back.
+    """
+    if isinstance(value, str):
+        return value
+    return json.dumps(value, ensure_ascii=False, default=str)
+
+
+def to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def to_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError, OverflowError):
+        pass
+    try:
+        return int(float(value))
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+def to_list(value):
+    if value is None or value == '':
+        return None
+    if isinstance(value, str):
+        return value.split(', ')
+    return [to_text(v) for v in value]
+
+
+def to_map(value):
+    """
+    `about` is a JSON object whose keys depend on the place, with either a
+    string or a list of strings as values.
+    """
+    if isinstance(value, str):
+        value = json.loads(value) if value else None
+    if not value:
+        return None
+    return [(key, [item] if isinstance(item, str) else [to_text(v) for v in item]) for key, item in value.items()]
+
+
+class ParquetResultWriter(ResultWriter):
+    """
+    Write results to Parquet with typed columns
+
+    Rows are buffered and written `row_group_size` at a time. Low cardinality
+    columns are dictionary encoded.
+    """
+
+    EXTENSION = 'parquet'
+    ROW_GROUP_SIZE = 10000
+    DICTIONARY_COLUMNS = ['category', 'city', 'country', 'country_code']
+
+    # Parquet fields added to the export schema, which have no CSV column
+    EXTRA_FIELDS = ['zero_x', 'cid', 'country_code', 'plus_code', 'images_count', 'images']
+
+    def __init__(self, filepath, fields=None, fsync_every=None, row_group_size=None):
+        if pyarrow is None:
+            raise ImportError('Please install pyarrow to export results to Parquet')
+        self.row_group_size = row_group_size or self.ROW_GROUP_SIZE
+        self.schema = None
+        self.writer = None
+        self.buffer = []
+        fields = list(fields or FIELDS)
+        fields += [field for field in self.EXTRA_FIELDS if field not in fields]
+        super(ParquetResultWriter, self).__init__(filepath, fields, fsync_every)
+
+    def open_file(self):
+        return open(self.part_filepath, 'wb')
+
+    def get_types(self):
+        string_list = pyarrow.list_(pyarrow.string())
+        return {
+            'lat': (pyarrow.float64(), to_float),
+            'lng': (pyarrow.float64(), to_float),
+            'score': (pyarrow.float64(), to_float),
+            'ratings': (pyarrow.int64(), to_int),
+            'images_count': (pyarrow.int64(), to_int),
+            'is_temporarily_closed': (pyarrow.bool_(), bool),
+            'is_permanently_closed': (pyarrow.bool_(), bool),
+            'has_owner': (pyarrow.bool_(), bool),
+            'email': (string_list, to_list),
+            'facebook': (string_list, to_list),
+            'instagram': (string_list, to_list),
+            'images': (string_list, to_list),
+            'about': (pyarrow.map_(pyarrow.string(), string_list), to_map),
+        }
+
+    def write_header(self):
+        types = self.get_types()
+        self.converters = {}
+        schema_fields = []
+        for column in self.fields:
+            arrow_type, converter = types.get(column, (pyarrow.string(), to_text))
+            self.converters[column] = converter
+            schema_fields.append(pyarrow.field(column, arrow_type))
+        self.schema = pyarrow.schema(schema_fields)
+        self.writer = pyarrow.parquet.ParquetWriter(
+            self.file,
+            self.schema,
+            use_dictionary=[column for column in self.DICTIONARY_COLUMNS if column in self.fields],
+        )
+
+    def write_row(self, result):
+        row = {}
+        for column, converter in self.converters.items():
+            value = getattr(result, column, None)
+            row[column] = None if value is None else converter(value)
+        self.buffer.append(row)
+        if len(self.buffer) >= self.row_group_size:
+            self.write_row_group()
+
+    def write_row_group(self):
+        if self.buffer:
+            self.writer.write_table(pyarrow.Table.from_pylist(self.buffer, schema=self.schema))
+            self.buffer = []
+
+    def close(self):
+        self.write_row_group()
+        self.writer.close()
+        super(ParquetResultWriter, self).close()
+
+    def abort(self):
+        self.writer.close()
+        super(ParquetResultWriter, self).abort()
+
+
+WRITERS = {
+    'csv': CsvResultWriter,
+    'jsonl': JsonlResultWriter,
+    'parquet': ParquetResultWriter,
+}
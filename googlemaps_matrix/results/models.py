@@ -1,4 +1,5 @@
 from datetime import datetime
+from operator import attrgetter
 from typing import List, Dict, Any, Optional, Union
 
 
@@ -34,10 +35,60 @@ class Activity:
         return self.activity or ""
 
 
+# Fields of Result, in the order of its constructor arguments
+RESULT_FIELDS = (
+    'id', 'zero_x', 'cid', 'name', 'address', 'country', 'country_code', 'zip_code', 'city',
+    'description', 'main_image_url', 'lat', 'lng', 'url', 'ratings', 'score', 'category',
+    'special_category', 'phone', 'website', 'menu', 'plus_code', 'is_temporarily_closed',
+    'is_permanently_closed', 'opening_hours', 'poi', 'price', 'images_count', 'images',
+    'last_opening_hours_updated_at', 'has_owner', 'booking_link', 'health', 'popular_times',
+    'about', 'email', 'facebook', 'instagram', 'additional_phone', 'metadata_activity',
+    'metadata_city', 'metadata_country', 'classified_emails', 'ai_emails_discovery',
+    'ai_emails_discovery_done', 'ai_emails_discovery_time', 'raw_ai_answer', 'scraping_time',
+    'filling_details',
+)
+
+# Container fields, allocated on first access
+RESULT_CONTAINERS = {
+    'images': list,
+    'about': dict,
+    'classified_emails': dict,
+    'ai_emails_discovery': dict,
+    'filling_details': dict,
+}
+
+RESULT_SLOTS = tuple('_' + name if name in RESULT_CONTAINERS else name for name in RESULT_FIELDS)
+
+get_result_slots = attrgetter(*RESULT_SLOTS)
+
+
+def lazy_container(name, factory):
+    slot = '_' + name
+
+    def getter(self):
+        value = getattr(self, slot)
+        if value is None:
+            value = factory()
+            setattr(self, slot, value)
+        return value
+
+    def setter(self, value):
+        setattr(self, slot, value)
+
+    return property(getter, setter)
+
+
 class Result:
     """
     Regular Python class equivalent to SQLAlchemy Result
+
+    Fields are stored in __slots__ rather than in a per-instance __dict__, and
+    containers (images, about, ...) are only allocated when first read.
+    Attributes which are not fields, like `linkedin` set by the contact
+    collector, still work and go to a __dict__ created on demand.
     """
+    __slots__ = RESULT_SLOTS + ('__dict__',)
+
     def __init__(
         self,
         id: Optional[int] = None,
@@ -118,13 +169,13 @@ class Result:
         self.poi = poi
         self.price = price
         self.images_count = images_count
-        self.images = images or []
+        self._images = images
         self.last_opening_hours_updated_at = last_opening_hours_updated_at
         self.has_owner = has_owner
         self.booking_link = booking_link
         self.health = health
         self.popular_times = popular_times
-        self.about = about or {}
+        self._about = about
         self.email = email
         self.facebook = facebook
         self.instagram = instagram
@@ -132,29 +183,42 @@ class Result:
         self.metadata_activity = metadata_activity
         self.metadata_city = metadata_city
         self.metadata_country = metadata_country
-        self.classified_emails = classified_emails or {}
-        self.ai_emails_discovery = ai_emails_discovery or {}
+        self._classified_emails = classified_emails
+        self._ai_emails_discovery = ai_emails_discovery
         self.ai_emails_discovery_done = ai_emails_discovery_done
         self.ai_emails_discovery_time = ai_emails_discovery_time
         self.raw_ai_answer = raw_ai_answer
         self.scraping_time = scraping_time
-        self.filling_details = filling_details or {}
+        self._filling_details = filling_details
+
+    images = lazy_container('images', list)
+    about = lazy_container('about', dict)
+    classified_emails = lazy_container('classified_emails', dict)
+    ai_emails_discovery = lazy_container('ai_emails_discovery', dict)
+    filling_details = lazy_container('filling_details', dict)
 
     def to_dict(self) -> Dict[str, Any]:
         """
         Convert the Result object to a dictionary
         """
-        return {
-            key: value for key, value in self.__dict__.items()
-            if not key.startswith('_')
-        }
+        data = dict(zip(RESULT_FIELDS, get_result_slots(self)))
+        for name, factory in RESULT_CONTAINERS.items():
+            if data[name] is None:
+                data[name] = factory()
+        for key, value in self.__dict__.items():
+            if not key.startswith('_'):
+                data[key] = value
+        return data
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Result':
         """
         Create a Result object from a dictionary
         """
-        return cls(**data)
+        result = cls()
+        for key, value in data.items():
+            setattr(result, key, value)
+        return result
 
 
 class Contact:
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+
+from unittest import TestCase
+import logging
+import os
+import shutil
+import tempfile
+import time
+
+from backend import Backend
+from googlemaps_matrix.results.exports import pyarrow
+from googlemaps_matrix.results.models import Result
+
+
+class MyModule(object):
+    def is_contact_host_ready(self, url):
+        return True
+
+    def get_contacts(self, result, deadline=None):
+        # slow websites do not give up at their deadline
+        time.sleep(0.6 if 'slow' in result.website else 0.02)
+        result.email = 'contact@example.fr'
+        return result
+
+
+def make_backend(**kwargs):
+    backend = Backend.__new__(Backend)
+    backend.logger = logging.getLogger('tests')
+    backend.module = MyModule()
+    backend.contact_workers = 2
+    backend.contact_timeout = 0.2
+    backend.contact_deadline = None
+    backend.contact_order = 'completion'
+    for key, value in kwargs.items():
+        setattr(backend, key, value)
+    return backend
+
+
+class IterEnrichedResultsTest(TestCase):
+
+    def test_timed_out_workers_are_still_busy(self):
+        results = [Result(name='slow%d' % index, website='https://slow%d.fr/' % index) for index in range(2)]
+        results += [Result(name='fast%d' % index, website='https://fast%d.fr/' % index) for index in range(4)]
+        emails = {result.name: result.email for result, _ in make_backend().iter_enriched_results(results)}
+        self.assertEqual(emails['slow0'], None)
+        self.assertEqual(emails['slow1'], None)
+        # their timeout starts once a slow worker is done, not when they were submitted
+        for index in range(4):
+            self.assertEqual(emails['fast%d' % index], 'contact@example.fr')
+
+    def test_original_order(self):
+        results = [Result(name=str(index), website='https://fast%d.fr/' % index if index % 2 else None) for index in range(6)]
+        enriched = list(make_backend(contact_order='original').iter_enriched_results(results))
+        self.assertEqual([result.name for result, _ in enriched], [str(index) for index in range(6)])
+        self.assertEqual([result.email for result, _ in enriched], [None, 'contact@example.fr'] * 3)
+
+
+class SaveResultsTest(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.backend = make_backend()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_save_results(self):
+        path = self.backend.save_results(iter([Result(name='Bakery')]), filename='results.csv', directory=self.directory)
+        self.assertEqual(path, os.path.join(self.directory, 'results.csv'))
+        self.assertEqual(os.listdir(self.directory), ['results.csv'])
+
+    def test_no_file_without_results(self):
+        for format in ['csv', 'jsonl'] + (['parquet'] if pyarrow else []):
+            self.assertIsNone(self.backend.save_results(iter([]), directory=self.directory, format=format))
+        self.assertEqual(os.listdir(self.directory), [])
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+
+from unittest import TestCase, mock
+import logging
+import os
+import shutil
+import tempfile
+
+from requests.models import Request, Response
+
+from monseigneur.monseigneur.core.browser.replay import ReplayAdapter, ReplayStore
+from googlemaps_matrix.module.browser import GoogleMapsBrowser
+from googlemaps_matrix.module.cache import GoogleMapsFingerprint, GoogleMapsHttpCache
+from googlemaps_matrix.module.exceptions import IncompletePageError
+from googlemaps_matrix.module.pages import ListingPage
+
+
+LISTING_URL = 'https://www.google.com/search?tbm=map&gl=US&hl=en&pb=!4m8&q=restaurants&psi=abc.123.1'
+JSON_HEADERS = {'Content-Type': 'application/json; charset=utf-8'}
+
+
+def make_browser():
+    logger = logging.getLogger('tests')
+    logger.settings = {'ssl_insecure': False}
+    browser = GoogleMapsBrowser(logger=logger)
+    browser.save_logs = False
+    browser.contact_collector.save_logs = False
+    browser.save_custom_response = mock.Mock()
+    return browser
+
+
+class ListingPageTest(TestCase):
+
+    def test_truncated_listing(self):
+        page = ListingPage.__new__(ListingPage)
+        self.assertRaises(IncompletePageError, page.build_doc, ")]}'\n[[1,2")
+
+
+class ForgetResponseTest(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache = GoogleMapsHttpCache(os.path.join(self.directory, 'http.sqlite'))
+        self.store = ReplayStore(GoogleMapsFingerprint())
+        self.store.add_response(LISTING_URL, ")]}'\n[[null,[]]]", headers=JSON_HEADERS)
+        self.browser = make_browser()
+        self.browser.set_replay(ReplayAdapter(self.store))
+        self.browser.set_http_cache(self.cache)
+
+    def tearDown(self):
+        self.cache.close()
+        shutil.rmtree(self.directory)
+
+    def cache_broken_listing(self):
+        request = Request('GET', LISTING_URL).prepare()
+        response = Response()
+        response.status_code = 200
+        response.url = LISTING_URL
+        # framed like a listing, so it passes is_valid, but cut short
+        response._content = b")]}'\n[[1,2]"
+        response._content_consumed = True
+        self.cache.store(request, response)
+        self.assertIsNotNone(self.cache.get(request))
+
+    def test_broken_listing_is_refetched(self):
+        self.cache_broken_listing()
+        with mock.patch('monseigneur.monseigneur.core.tools.decorators.time.sleep'):
+            page = self.browser.fetch_listing_page(LISTING_URL, 'restaurants')
+        self.assertEqual(page.doc, [[None, []]])
+        self.assertEqual(self.cache.get(Request('GET', LISTING_URL).prepare()).content, b")]}'\n[[null,[]]]")
+
+    def test_forget_response(self):
+        self.cache_broken_listing()
+        self.browser.forget_response(LISTING_URL.replace('abc.123', 'xyz.456'))
+        self.assertIsNone(self.cache.get(Request('GET', LISTING_URL).prepare()))
+
+
+class RetryTest(TestCase):
+
+    def test_listing_retries_are_not_multiplied(self):
+        browser = make_browser()
+        browser.open = mock.Mock(side_effect=IncompletePageError())
+        with mock.patch('monseigneur.monseigneur.core.tools.decorators.time.sleep'):
+            self.assertRaises(
+                IncompletePageError, browser.go_results,
+                'https://www.google.com/maps/search/restaurants/@48.8566,2.3522,14z', 'en', 'US', 1,
+            )
+        self.assertEqual(browser.open.call_count, 3)
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+
+from unittest import TestCase, mock
+import logging
+import os
+import shutil
+import tempfile
+import time
+
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+
+from googlemaps_matrix.module.contact_browser import ContactBrowser
+from googlemaps_matrix.module.contact_cache import ContactCache
+
+
+def make_browser():
+    logger = logging.getLogger('tests')
+    logger.settings = {'ssl_insecure': False}
+    browser = ContactBrowser(logger=logger)
+    browser.save_logs = False
+    return browser
+
+
+class ContactBrowserTest(TestCase):
+
+    def setUp(self):
+        self.browser = make_browser()
+        self.acquire = self.browser.scheduler.acquire
+
+        def slow_acquire(url, deadline=None):
+            # the slot is given right at the deadline
+            time.sleep(max(0, deadline - time.monotonic()))
+            return self.acquire(url)
+
+        self.browser.scheduler.acquire = slow_acquire
+        self.browser.open = mock.Mock(side_effect=AssertionError('no request is sent without time left'))
+
+    def test_timeout_is_computed_once_the_slot_is_held(self):
+        deadline = time.monotonic() + 0.05
+        self.assertIsNone(self.browser.get_contact_items('https://example.fr/contact', True, True, True, deadline=deadline))
+        self.assertIsNone(self.browser.get_contact_links('https://example.fr/', deadline=time.monotonic() + 0.05))
+        self.assertFalse(self.browser.open.called)
+
+    def test_site_is_incomplete(self):
+        deadline = time.monotonic() + 0.05
+        contacts, complete = self.browser.collect_contacts('https://example.fr/', ['https://example.fr/contact'], deadline=deadline)
+        self.assertEqual(contacts, [])
+        self.assertFalse(complete)
+
+
+class ThrottledHostTest(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache = ContactCache(os.path.join(self.directory, 'contacts.sqlite'))
+        self.browser = make_browser()
+        self.browser.set_contact_cache(self.cache)
+        self.browser.open = mock.Mock(side_effect=AssertionError('a throttled host is not requested'))
+        response = Response()
+        response.status_code = 429
+        response.url = 'https://www.example.fr/'
+        response.headers = CaseInsensitiveDict({'Retry-After': '60'})
+        self.browser.scheduler.observe(response)
+
+    def tearDown(self):
+        self.cache.close()
+        shutil.rmtree(self.directory)
+
+    def test_throttled_page_is_not_visited(self):
+        deadline = time.monotonic() + 1
+        self.assertIsNone(self.browser.get_contact_links('https://example.fr/', deadline=deadline))
+        self.assertIsNone(self.browser.get_website_links('https://example.fr/', deadline=deadline))
+        self.assertEqual(self.browser.collect_contacts('https://example.fr/', None, deadline=deadline), ([], False))
+
+    def test_partial_contacts_are_not_cached(self):
+        contacts = [mock.Mock(value='contact@example.fr')]
+        with mock.patch.object(self.browser, 'collect_contacts', return_value=(contacts, False)):
+            self.assertEqual(self.browser.get_website_contacts('https://example.fr/', deadline=time.monotonic() + 1), contacts)
+        self.assertIsNone(self.cache.get('example.fr'))
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+
+from threading import Event, Thread
+from unittest import TestCase, mock
+import os
+import shutil
+import tempfile
+import time
+
+from googlemaps_matrix.module.contact_cache import ContactCache
+from googlemaps_matrix.results.models import Contact
+
+
+CONTACTS = [
+    Contact(value='contact@example.fr', type='MAIL', usage='PROFESSIONAL', source='https://www.example.fr/contact'),
+    Contact(value='https://www.facebook.com/example', type='SOCIAL_MEDIA', usage='FACEBOOK', source='https://www.example.fr/'),
+]
+
+
+class ContactCacheTest(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'contacts.sqlite')
+        self.cache = ContactCache(self.path, ttl=60)
+
+    def tearDown(self):
+        self.cache.close()
+        shutil.rmtree(self.directory)
+
+    def test_get_domain(self):
+        self.assertEqual(self.cache.get_domain('https://www.example.fr/magasin-1/?utm_source=x'), 'example.fr')
+        self.assertEqual(self.cache.get_domain('shop.example.co.uk'), 'example.co.uk')
+        # websites of a hosting platform do not share their contacts
+        self.assertEqual(self.cache.get_domain('https://bakery.github.io/'), 'bakery.github.io')
+        self.assertIsNone(self.cache.get_domain('https://www.facebook.com/example'))
+        self.assertIsNone(self.cache.get_domain('http://localhost:8000/'))
+        self.assertIsNone(self.cache.get_domain(None))
+
+    def test_store_and_get(self):
+        self.cache.store('example.fr', CONTACTS)
+        contacts = self.cache.get('example.fr')
+        self.assertEqual(
+            [(contact.value, contact.type, contact.usage, contact.source) for contact in contacts],
+            [(contact.value, contact.type, contact.usage, contact.source) for contact in CONTACTS],
+        )
+        self.assertIsNone(self.cache.get('other.fr'))
+
+    def test_contacts_are_kept_across_instances(self):
+        self.cache.store('example.fr', CONTACTS)
+        other = ContactCache(self.path)
+        try:
+            self.assertEqual(len(other.get('example.fr')), 2)
+        finally:
+            other.close()
+
+    def test_expiry(self):
+        with mock.patch('googlemaps_matrix.module.contact_cache.time') as fake_time:
+            fake_time.time.return_value = 1000
+            self.cache.store('example.fr', CONTACTS)
+            fake_time.time.return_value = 1059
+            self.assertIsNotNone(self.cache.get('example.fr'))
+            fake_time.time.return_value = 1060
+            self.assertIsNone(self.cache.get('example.fr'))
+
+    def test_ttl_zero_stores_nothing(self):
+        cache = ContactCache(os.path.join(self.directory, 'disabled.sqlite'), ttl=0)
+        try:
+            cache.store('example.fr', CONTACTS)
+            self.assertIsNone(cache.get('example.fr'))
+        finally:
+            cache.close()
+
+    def test_collecting_waits_for_the_first_thread(self):
+        holding = Event()
+        release = Event()
+
+        def hold():
+            with self.cache.collecting('example.fr') as collecting:
+                self.assertTrue(collecting)
+                holding.set()
+                release.wait(5)
+                self.cache.store('example.fr', CONTACTS)
+
+        thread = Thread(target=hold)
+        thread.start()
+        holding.wait(5)
+        Thread(target=lambda: (time.sleep(0.05), release.set())).start()
+        with self.cache.collecting('example.fr') as collecting:
+            self.assertTrue(collecting)
+            self.assertIsNotNone(self.cache.get('example.fr'))
+        thread.join()
+        self.assertEqual(self.cache.flights, {})
+
+    def test_collecting_timeout(self):
+        holding = Event()
+        release = Event()
+
+        def hold():
+            with self.cache.collecting('example.fr'):
+                holding.set()
+                release.wait(5)
+
+        thread = Thread(target=hold)
+        thread.start()
+        holding.wait(5)
+        start = time.monotonic()
+        with self.cache.collecting('example.fr', deadline=time.monotonic() + 0.1) as collecting:
+            self.assertFalse(collecting)
+        self.assertLess(time.monotonic() - start, 1)
+        # other domains are not held
+        with self.cache.collecting('other.fr', deadline=time.monotonic()) as collecting:
+            self.assertTrue(collecting)
+        release.set()
+        thread.join()
+        self.assertEqual(self.cache.flights, {})
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+
+from unittest import TestCase
+
+from googlemaps_matrix.module.crawl_policy import ContactTargets, rank_contact_link
+from googlemaps_matrix.results.models import Contact
+
+
+MAIL = Contact(value='contact@example.fr', type='MAIL', usage='PROFESSIONAL')
+PERSONAL_MAIL = Contact(value='jean@gmail.com', type='MAIL', usage='PERSONAL')
+FACEBOOK = Contact(value='https://www.facebook.com/example', type='SOCIAL_MEDIA', usage='FACEBOOK')
+PHONE = Contact(value='+33123456789', type='PHONE', usage='PROFESSIONAL')
+
+
+class ContactTargetsTest(TestCase):
+
+    def test_parse(self):
+        self.assertEqual(ContactTargets.parse(' Professional_Mail, facebook,,').kinds, ['professional_mail', 'facebook'])
+        self.assertEqual(ContactTargets.parse(['phone']).kinds, ['phone'])
+
+    def test_unknown_target(self):
+        self.assertRaises(ValueError, ContactTargets.parse, 'mail,fax')
+
+    def test_is_satisfied(self):
+        targets = ContactTargets.parse('professional_mail,facebook')
+        self.assertFalse(targets.is_satisfied([]))
+        self.assertFalse(targets.is_satisfied([MAIL]))
+        self.assertFalse(targets.is_satisfied([PERSONAL_MAIL, FACEBOOK]))
+        self.assertTrue(targets.is_satisfied([PHONE, FACEBOOK, MAIL]))
+
+    def test_any_usage(self):
+        targets = ContactTargets.parse('mail')
+        self.assertTrue(targets.is_satisfied([PERSONAL_MAIL]))
+        self.assertTrue(targets.is_satisfied([MAIL]))
+        self.assertFalse(targets.is_satisfied([PHONE]))
+
+    def test_no_target(self):
+        self.assertTrue(ContactTargets([]).is_satisfied([]))
+
+
+class RankContactLinkTest(TestCase):
+
+    def test_order(self):
+        website = 'https://www.example.fr/'
+        links = [
+            'https://other.fr/contact',
+            'https://example.fr/blog/2020/post',
+            'https://example.fr/mentions-legales',
+            'https://example.fr/a-propos',
+            'https://example.fr/fr/contact',
+            'https://example.fr/contact',
+            'http://example.fr/?utm_source=google_my_business',
+        ]
+        self.assertEqual(sorted(links, key=lambda link: rank_contact_link(website, link)), [
+            'http://example.fr/?utm_source=google_my_business',
+            'https://example.fr/contact',
+            'https://example.fr/fr/contact',
+            'https://other.fr/contact',
+            'https://example.fr/a-propos',
+            'https://example.fr/mentions-legales',
+            'https://example.fr/blog/2020/post',
+        ])
+
+    def test_without_website(self):
+        self.assertLess(rank_contact_link(None, 'https://example.fr/contact'), rank_contact_link(None, 'https://example.fr/'))
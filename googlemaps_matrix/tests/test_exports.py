@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+
+from unittest import TestCase, skipIf
+import csv
+import json
+import os
+import shutil
+import tempfile
+
+from googlemaps_matrix.results.exports import (
+    FIELDS, ResultWriter, CsvResultWriter, JsonlResultWriter, ParquetResultWriter, pyarrow, to_int, to_float,
+)
+from googlemaps_matrix.results.models import Result
+
+
+def make_result(index=0):
+    result = Result(name='Place %d' % index, city='Paris', score=4.5, ratings=12, lat=48.85, lng=2.35)
+    result.email = ['a@example.fr', 'b@example.fr']
+    return result
+
+
+class ResultWriterTest(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_write_row_is_abstract(self):
+        self.assertRaises(TypeError, ResultWriter, os.path.join(self.directory, 'results'))
+
+    def test_csv(self):
+        path = os.path.join(self.directory, 'results.csv')
+        with CsvResultWriter(path) as writer:
+            self.assertEqual(writer.write_all(make_result(index) for index in range(3)), 3)
+        self.assertFalse(os.path.exists(path + '.part'))
+        with open(path, newline='', encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(list(rows[0]), FIELDS)
+        self.assertEqual([row['name'] for row in rows], ['Place 0', 'Place 1', 'Place 2'])
+        self.assertEqual(rows[0]['email'], 'a@example.fr, b@example.fr')
+        self.assertEqual(rows[0]['score'], '4.5')
+
+    def test_jsonl(self):
+        path = os.path.join(self.directory, 'results.jsonl')
+        with JsonlResultWriter(path, fields=['name', 'email', 'score']) as writer:
+            writer.write(make_result())
+        with open(path, encoding='utf-8') as f:
+            rows = [json.loads(line) for line in f]
+        self.assertEqual(rows, [{'name': 'Place 0', 'email': ['a@example.fr', 'b@example.fr'], 'score': 4.5}])
+
+    def test_failure_leaves_the_part_file(self):
+        path = os.path.join(self.directory, 'results.csv')
+        with self.assertRaises(RuntimeError):
+            with CsvResultWriter(path) as writer:
+                writer.write(make_result())
+                raise RuntimeError()
+        self.assertFalse(os.path.exists(path))
+        with open(path + '.part', encoding='utf-8') as f:
+            self.assertEqual(len(f.readlines()), 2)
+
+    def test_discard(self):
+        path = os.path.join(self.directory, 'results.csv')
+        with CsvResultWriter(path) as writer:
+            writer.discard()
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_fsync_every(self):
+        path = os.path.join(self.directory, 'results.csv')
+        with CsvResultWriter(path, fsync_every=2) as writer:
+            writer.write_all(make_result(index) for index in range(3))
+            self.assertEqual(writer.count, 3)
+
+
+class ConvertersTest(TestCase):
+
+    def test_to_float(self):
+        self.assertEqual(to_float('4,5'), None)
+        self.assertEqual(to_float('4.5'), 4.5)
+        self.assertEqual(to_float([]), None)
+
+    def test_to_int(self):
+        self.assertEqual(to_int('12'), 12)
+        self.assertEqual(to_int('12.0'), 12)
+        self.assertEqual(to_int('1 234'), None)
+        self.assertEqual(to_int(float('inf')), None)
+
+
+@skipIf(pyarrow is None, 'pyarrow is not installed')
+class ParquetResultWriterTest(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'results.parquet')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def read(self):
+        import pyarrow.parquet
+        return pyarrow.parquet.read_table(self.path)
+
+    def test_types(self):
+        with ParquetResultWriter(self.path, row_group_size=2) as writer:
+            writer.write_all(make_result(index) for index in range(3))
+        table = self.read()
+        self.assertEqual(table.num_rows, 3)
+        self.assertEqual(str(table.schema.field('score').type), 'double')
+        self.assertEqual(str(table.schema.field('ratings').type), 'int64')
+        row = table.to_pylist()[0]
+        self.assertEqual(row['score'], 4.5)
+        self.assertEqual(row['ratings'], 12)
+        self.assertEqual(row['email'], ['a@example.fr', 'b@example.fr'])
+
+    def test_nested_values_are_json(self):
+        result = make_result()
+        result.images = [{'url': 'https://example.fr/1.jpg', 'width': 10}]
+        result.opening_hours = [['lundi', ['9:00-18:00']]]
+        result.popular_times = {'lundi': [10, 20]}
+        result.about = {'Accessibility': ['Wheelchair accessible entrance'], 'Payments': 'Cash'}
+        with ParquetResultWriter(self.path) as writer:
+            writer.write(result)
+        row = self.read().to_pylist()[0]
+        self.assertEqual([json.loads(image) for image in row['images']], [{'url': 'https://example.fr/1.jpg', 'width': 10}])
+        self.assertEqual(json.loads(row['opening_hours']), [['lundi', ['9:00-18:00']]])
+        self.assertEqual(json.loads(row['popular_times']), {'lundi': [10, 20]})
+        self.assertEqual(row['about'], [('Accessibility', ['Wheelchair accessible entrance']), ('Payments', ['Cash'])])
+
+    def test_bad_numbers_are_null(self):
+        result = make_result()
+        result.score = 'N/A'
+        result.ratings = '1 234'
+        with ParquetResultWriter(self.path) as writer:
+            writer.write(result)
+        row = self.read().to_pylist()[0]
+        self.assertIsNone(row['score'])
+        self.assertIsNone(row['ratings'])
+        self.assertEqual(row['lat'], 48.85)
@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+
+from unittest import TestCase
+
+from googlemaps_matrix.module.fields import DETAIL_FIELDS, LISTING_FIELDS, extract_place, merge_place
+from googlemaps_matrix.results.models import Result
+
+
+def make_place(lat=48.8566, lng=2.3522):
+    place = [None] * 79
+    place[9] = [None, None, lat, lng]
+    place[10] = '0x1:0x2'
+    place[11] = 'Bakery'
+    place[78] = 'ChIJ'
+    return place
+
+
+class ExtractPlaceTest(TestCase):
+
+    def test_listing(self):
+        result = extract_place(make_place(), LISTING_FIELDS)
+        self.assertEqual((result.name, result.zero_x, result.lat, result.lng), ('Bakery', '0x1:0x2', 48.8566, 2.3522))
+        self.assertEqual(result.cid, '2')
+
+    def test_coordinates_of_a_place_url_are_floats(self):
+        result = Result(name='Bakery', lat='48.85', lng='2.35', zero_x='0x1:0x2')
+        result = extract_place(make_place(), DETAIL_FIELDS, result)
+        self.assertEqual((result.lat, result.lng), (48.85, 2.35))
+        self.assertIn('!3d48.85!4d2.35', result.url)
+
+    def test_merge_keeps_the_listing_values(self):
+        result = Result(name='Bakery', lat='48.85', lng='2.35', zero_x='0x1:0x2')
+        merge_place(result, extract_place(make_place(), DETAIL_FIELDS), DETAIL_FIELDS)
+        self.assertEqual((result.lat, result.lng), (48.85, 2.35))
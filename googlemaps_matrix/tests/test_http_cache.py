@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+
+from unittest import TestCase
+import os
+import shutil
+import tempfile
+
+from requests.models import Request, Response
+
+from googlemaps_matrix.module.cache import GoogleMapsHttpCache
+
+
+LISTING_URL = 'https://www.google.com/search?tbm=map&pb=!4m8&q=restaurants&psi=abc.123.1'
+PLACE_URL = 'https://www.google.com/maps/preview/place?pb=!1m14!1s0x1:0x2&q=name'
+WEBSITE_URL = 'https://www.example.fr/contact'
+
+
+def make_response(url, content):
+    response = Response()
+    response.status_code = 200
+    response.url = url
+    response._content = content
+    response._content_consumed = True
+    return response
+
+
+class GoogleMapsHttpCacheTest(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache = GoogleMapsHttpCache(os.path.join(self.directory, 'http.sqlite'))
+
+    def tearDown(self):
+        self.cache.close()
+        shutil.rmtree(self.directory)
+
+    def is_valid(self, url, content):
+        request = Request('GET', url).prepare()
+        return self.cache.is_valid(request, make_response(url, content))
+
+    def test_framed_json_is_valid(self):
+        self.assertTrue(self.is_valid(PLACE_URL, b")]}'\n[null,[1,2]]"))
+        self.assertTrue(self.is_valid(LISTING_URL, b'{"c":0,"d":")]}\'\\n[[1]]"}/*""*/'))
+
+    def test_truncated_or_html_json_is_invalid(self):
+        self.assertFalse(self.is_valid(PLACE_URL, b")]}'\n[null,[1,"))
+        self.assertFalse(self.is_valid(LISTING_URL, b'<html><body>Error</body></html>'))
+        self.assertFalse(self.is_valid(PLACE_URL, b''))
+
+    def test_websites_are_not_checked(self):
+        self.assertTrue(self.is_valid(WEBSITE_URL, b'<html>'))
+
+    def test_random_listing_tokens_share_an_entry(self):
+        request = Request('GET', LISTING_URL).prepare()
+        self.cache.store(request, make_response(LISTING_URL, b")]}'\n[[1]]"))
+        other = Request('GET', LISTING_URL.replace('abc.123', 'xyz.456')).prepare()
+        self.assertEqual(self.cache.get(other).content, b")]}'\n[[1]]")
+        self.cache.delete(other)
+        self.assertIsNone(self.cache.get(request))
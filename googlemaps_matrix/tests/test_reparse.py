@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+
+from datetime import timedelta
+from unittest import TestCase
+import json
+import shutil
+import tempfile
+
+from requests.models import Request, Response
+from requests.structures import CaseInsensitiveDict
+
+from monseigneur.monseigneur.core.browser.archive import ResponseArchive
+from googlemaps_matrix.module.reparse import ArchiveReparser
+
+
+def make_response(url, content, content_type):
+    response = Response()
+    response.status_code = 200
+    response.reason = 'OK'
+    response.headers = CaseInsensitiveDict({'Content-Type': content_type})
+    response.url = url
+    response.request = Request('GET', url).prepare()
+    response._content = content.encode('utf-8')
+    response._content_consumed = True
+    response.elapsed = timedelta(0)
+    return response
+
+
+def make_place(index, detail=False):
+    place = [None] * 184
+    place[7] = ['/url?q=https://www.site%d.fr/&opi=1' % index]
+    place[9] = [None, None, 48.8 + index / 100, 2.3]
+    place[10] = '0x1:0x%x' % index
+    place[11] = 'Place %d' % index
+    if detail:
+        place[183] = [None, None, [None, None, ['8FW4V75V+%d' % index]]]
+    return place
+
+
+def add_json(archive, url, doc):
+    archive.add(make_response(url, ")]}'\n" + json.dumps(doc), 'application/json; charset=utf-8'))
+
+
+class MyArchiveReparser(ArchiveReparser):
+    CHUNK_SIZE = 2
+
+    def iter_chunks(self):
+        self.chunks = 0
+        for chunk in super(MyArchiveReparser, self).iter_chunks():
+            self.chunks += 1
+            yield chunk
+
+
+class ArchiveReparserTest(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        archive = ResponseArchive(self.directory)
+        listing = [[None, [[None] * 14 + [make_place(index)] for index in range(8)]]]
+        add_json(archive, 'https://www.google.com/search?tbm=map&q=places', listing)
+        for index in range(8):
+            add_json(archive, 'https://www.google.com/maps/preview/place?q=%d' % index, [None] * 6 + [make_place(index, detail=True)])
+            archive.add(make_response(
+                'https://www.site%d.fr/' % index,
+                '<html><body><a href="mailto:hello@site%d.fr">Mail</a></body></html>' % index,
+                'text/html; charset=utf-8',
+            ))
+        # the same listing again, and a place only known from its detail
+        add_json(archive, 'https://www.google.com/search?tbm=map&q=places&page=2', listing)
+        add_json(archive, 'https://www.google.com/maps/preview/place?q=8', [None] * 6 + [make_place(8, detail=True)])
+        archive.close()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_results(self):
+        results = list(MyArchiveReparser(self.directory, workers=1))
+        self.assertEqual(sorted(result.name for result in results), ['Place %d' % index for index in range(9)])
+        self.assertEqual(results[-1].name, 'Place 8')
+        for result in results[:-1]:
+            index = int(result.zero_x.split('x')[-1], 16)
+            self.assertEqual(result.plus_code, '8FW4V75V+%d' % index)
+            self.assertEqual(result.email, 'hello@site%d.fr' % index)
+
+    def test_results_are_streamed(self):
+        reparser = MyArchiveReparser(self.directory, workers=1)
+        results = iter(reparser)
+        next(results)
+        # 19 responses in 10 chunks of 2, with at most 2 chunks parsed ahead
+        self.assertLess(reparser.chunks, 10)
+        self.assertEqual(len(list(results)), 8)
+
+    def test_without_contacts(self):
+        results = list(MyArchiveReparser(self.directory, workers=1, collect_contact=False))
+        self.assertEqual(len(results), 9)
+        self.assertFalse(any(result.email for result in results))
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+
+from threading import Event, Thread
+from unittest import TestCase
+import time
+
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+
+from googlemaps_matrix.module.exceptions import HostThrottled
+from googlemaps_matrix.module.scheduler import HostScheduler
+
+
+def make_response(url, status, retry_after=None):
+    response = Response()
+    response.status_code = status
+    response.url = url
+    response.headers = CaseInsensitiveDict({'Retry-After': retry_after} if retry_after else {})
+    return response
+
+
+class HostSchedulerTest(TestCase):
+
+    def test_get_host(self):
+        self.assertEqual(HostScheduler.get_host('https://WWW.Example.fr/contact'), 'example.fr')
+        self.assertEqual(HostScheduler.get_host('example.fr/contact'), 'example.fr')
+
+    def test_concurrency(self):
+        scheduler = HostScheduler(concurrency=2, rate=1000, burst=10)
+        scheduler.acquire('https://example.fr/a')
+        scheduler.acquire('https://www.example.fr/b')
+        self.assertFalse(scheduler.ready('https://example.fr/c'))
+        self.assertTrue(scheduler.ready('https://other.fr/'))
+        self.assertRaises(HostThrottled, scheduler.acquire, 'https://example.fr/c', deadline=time.monotonic() + 0.05)
+        scheduler.release('example.fr')
+        self.assertTrue(scheduler.ready('https://example.fr/c'))
+
+    def test_rate(self):
+        scheduler = HostScheduler(concurrency=10, rate=20, burst=2)
+        start = time.monotonic()
+        for _ in range(4):
+            with scheduler.slot('https://example.fr/'):
+                pass
+        # two requests of burst, then one every 50ms
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+
+    def test_rate_deadline(self):
+        scheduler = HostScheduler(concurrency=10, rate=0.1, burst=1)
+        with scheduler.slot('https://example.fr/'):
+            pass
+        self.assertRaises(HostThrottled, scheduler.acquire, 'https://example.fr/', deadline=time.monotonic() + 1)
+
+    def test_retry_after(self):
+        scheduler = HostScheduler(max_retry_after=60)
+        scheduler.observe(make_response('https://example.fr/', 429, '30'))
+        self.assertFalse(scheduler.ready('https://example.fr/'))
+        self.assertRaises(HostThrottled, scheduler.acquire, 'https://example.fr/', deadline=time.monotonic() + 1)
+        deferred_until = scheduler.hosts['example.fr'].deferred_until
+        self.assertAlmostEqual(deferred_until - time.monotonic(), 30, delta=1)
+
+    def test_retry_after_is_capped_and_optional(self):
+        scheduler = HostScheduler(max_retry_after=5)
+        scheduler.observe(make_response('https://example.fr/', 503, '3600'))
+        self.assertLessEqual(scheduler.hosts['example.fr'].deferred_until - time.monotonic(), 5)
+        scheduler = HostScheduler(respect_retry_after=False)
+        scheduler.observe(make_response('https://example.fr/', 429, '30'))
+        self.assertTrue(scheduler.ready('https://example.fr/'))
+        scheduler = HostScheduler()
+        scheduler.observe(make_response('https://example.fr/', 200, '30'))
+        scheduler.observe(make_response('https://example.fr/', 429, 'soon'))
+        self.assertTrue(scheduler.ready('https://example.fr/'))
+
+    def test_idle_hosts_are_forgotten(self):
+        scheduler = HostScheduler(concurrency=2, rate=1, burst=2)
+        with scheduler.slot('https://example.fr/'):
+            self.assertIn('example.fr', scheduler.hosts)
+        # a token was spent, the bucket is not full yet
+        self.assertIn('example.fr', scheduler.hosts)
+        scheduler.hosts['example.fr'].refilled_at -= 1
+        scheduler.acquire('https://example.fr/')
+        scheduler.hosts['example.fr'].refilled_at -= 1
+        scheduler.release('example.fr')
+        self.assertNotIn('example.fr', scheduler.hosts)
+
+    def test_deferred_hosts_are_kept(self):
+        scheduler = HostScheduler(concurrency=2, rate=1000, burst=2)
+        scheduler.observe(make_response('https://example.fr/', 429, '30'))
+        scheduler.prune_at = 0
+        with scheduler.slot('https://other.fr/'):
+            pass
+        self.assertIn('example.fr', scheduler.hosts)
+
+    def test_sweep(self):
+        scheduler = HostScheduler(concurrency=2, rate=1, burst=2)
+        scheduler.prune_at = 10
+        for index in range(10):
+            with scheduler.slot('https://site%d.fr/' % index):
+                pass
+        for state in scheduler.hosts.values():
+            state.refilled_at -= 1
+        with scheduler.slot('https://last.fr/'):
+            self.assertEqual(list(scheduler.hosts), ['last.fr'])
+        self.assertEqual(scheduler.prune_at, HostScheduler.PRUNE_MIN)
+
+    def test_waiter_uses_the_current_state(self):
+        scheduler = HostScheduler(concurrency=1, rate=1000, burst=1)
+        scheduler.acquire('https://x.fr/')
+        acquired = Event()
+        release = Event()
+        errors = []
+
+        def wait():
+            try:
+                with scheduler.slot('https://x.fr/', deadline=time.monotonic() + 5):
+                    acquired.set()
+                    release.wait(5)
+            except Exception as e:
+                errors.append(e)
+
+        thread = Thread(target=wait)
+        thread.start()
+        time.sleep(0.05)
+        # the host is idle and forgotten before the waiter wakes up
+        scheduler.release('x.fr')
+        self.assertTrue(acquired.wait(5))
+        self.assertFalse(scheduler.ready('https://x.fr/'))
+        self.assertEqual(scheduler.hosts['x.fr'].active, 1)
+        release.set()
+        thread.join()
+        self.assertEqual(errors, [])
+        self.assertNotIn('x.fr', [host for host, state in scheduler.hosts.items() if state.active])
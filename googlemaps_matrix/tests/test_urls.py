@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+
+from unittest import TestCase
+
+from googlemaps_matrix.module.urls import canonicalize_url, get_url_key
+
+
+class CanonicalizeUrlTest(TestCase):
+
+    def test_docstring_example(self):
+        self.assertEqual(
+            canonicalize_url('HTTPS://WWW.Example.fr:443/Contact?utm_source=google_my_business&id=2#map'),
+            'https://www.example.fr/Contact?id=2',
+        )
+
+    def test_tracking_params_are_dropped(self):
+        self.assertEqual(
+            canonicalize_url('https://example.fr/?gclid=1&fbclid=2&UTM_medium=3&hsa_acc=4&page=2&_ga=5'),
+            'https://example.fr/?page=2',
+        )
+
+    def test_other_params_keep_their_order(self):
+        self.assertEqual(canonicalize_url('https://example.fr/a?b=2&a=1'), 'https://example.fr/a?b=2&a=1')
+
+    def test_default_port_and_scheme(self):
+        self.assertEqual(canonicalize_url('example.fr'), 'http://example.fr/')
+        self.assertEqual(canonicalize_url('http://example.fr:80/a'), 'http://example.fr/a')
+        self.assertEqual(canonicalize_url('http://example.fr:8080/a'), 'http://example.fr:8080/a')
+
+    def test_path_case_is_kept(self):
+        self.assertEqual(canonicalize_url('https://EXAMPLE.fr/Page'), 'https://example.fr/Page')
+
+    def test_invalid_url_is_returned_as_is(self):
+        self.assertEqual(canonicalize_url('http://[::1'), 'http://[::1')
+
+
+class GetUrlKeyTest(TestCase):
+
+    def test_docstring_example(self):
+        self.assertEqual(
+            get_url_key('http://www.example.fr/contact/?b=2&a=1'),
+            get_url_key('https://example.fr/contact?a=1&b=2'),
+        )
+
+    def test_key(self):
+        self.assertEqual(get_url_key('https://www.example.fr/contact/?utm_source=x#form'), 'example.fr/contact')
+        self.assertEqual(get_url_key('https://www.example.fr/'), 'example.fr')
+
+    def test_different_pages(self):
+        self.assertNotEqual(get_url_key('https://example.fr/contact'), get_url_key('https://example.fr/about'))
+        self.assertNotEqual(get_url_key('https://example.fr/?page=1'), get_url_key('https://example.fr/?page=2'))
+        self.assertNotEqual(get_url_key('https://shop.example.fr/'), get_url_key('https://example.fr/'))
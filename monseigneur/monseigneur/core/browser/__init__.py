@@ -2,7 +2,8 @@
 
 from .browsers import Browser, DomainBrowser, UrlNotAllowed, PagesBrowser, LoginBrowser, need_login, AbstractBrowser, StatesMixin
 from .url import URL
+from .aio import AsyncBrowserMixin
 
 
 __all__ = ['Browser', 'DomainBrowser', 'UrlNotAllowed', 'PagesBrowser', 'URL',
-           'LoginBrowser', 'need_login', 'AbstractBrowser', 'StatesMixin']
+           'LoginBrowser', 'need_login', 'AbstractBrowser', 'StatesMixin', 'AsyncBrowserMixin']
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+
+from requests.adapters import HTTPAdapter
+
+from .sessions import FuturesSession
+
+__all__ = ['AsyncBrowserMixin']
+
+
+class AsyncBrowserMixin(object):
+    """
+    Mixin to inherit in a Browser, before the browser class itself, to await
+    requests from an asyncio event loop.
+
+    Requests go through the usual :meth:`Browser.open` path (hooks, URL/Page
+    matching, status checks), only they are sent by the session executor and
+    the event loop awaits them instead of blocking on the socket:
+
+    >>> async def fetch_all(browser, urls):  # doctest: +SKIP
+    ...     responses = await asyncio.gather(*(browser.aopen(url) for url in urls))
+    ...     return [response.page for response in responses]
+    """
+
+    MAX_IN_FLIGHT = 100
+    """
+    Maximum of requests awaited at the same time, also used to size the
+    executor and the connection pools.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._aio_loop = None
+        self._aio_semaphore = None
+        super(AsyncBrowserMixin, self).__init__(*args, **kwargs)
+        self.resize_pools()
+
+    def _create_session(self):
+        return FuturesSession(max_workers=max(self.MAX_WORKERS, self.MAX_IN_FLIGHT), max_retries=self.MAX_RETRIES)
+
+    def resize_pools(self):
+        """
+        Grow the mounted adapters so that MAX_IN_FLIGHT requests do not fight
+        for a few pooled connections. Call it again after mounting new adapters,
+        the ones already grown are left with their pools.
+        """
+        for adapter in self.session.adapters.values():
+            if isinstance(adapter, HTTPAdapter) and adapter._pool_maxsize < self.MAX_IN_FLIGHT:
+                # as HTTPAdapter.__init__ does, proxy managers are sized from these
+                adapter._pool_connections = self.MAX_IN_FLIGHT
+                adapter._pool_maxsize = self.MAX_IN_FLIGHT
+                adapter.poolmanager.clear()
+                adapter.init_poolmanager(self.MAX_IN_FLIGHT, self.MAX_IN_FLIGHT, block=adapter._pool_block)
+                # built with the previous size, created again on their next use
+                for manager in adapter.proxy_manager.values():
+                    manager.clear()
+                adapter.proxy_manager.clear()
+
+    @property
+    def in_flight(self):
+        """
+        Semaphore of the running event loop, asyncio primitives can not be
+        shared between loops.
+        """
+        loop = asyncio.get_running_loop()
+        if self._aio_loop is not loop:
+            self._aio_loop = loop
+            self._aio_semaphore = asyncio.Semaphore(self.MAX_IN_FLIGHT)
+        return self._aio_semaphore
+
+    async def aopen(self, *args, **kwargs):
+        """
+        Same as :meth:`open`, awaitable.
+        """
+        kwargs.pop('async', None)
+        kwargs.pop('is_async', None)
+        async with self.in_flight:
+            future = self.open(*args, is_async=True, **kwargs)
+            return await asyncio.wrap_future(future)
+
+    async def alocation(self, *args, **kwargs):
+        """
+        Same as :meth:`location`, awaitable.
+
+        Only one location should be awaited at a time, as it changes the
+        current url, response and page of the browser; use :meth:`aopen` to
+        run requests concurrently.
+        """
+        page = getattr(self, 'page', None)
+        if page is not None:
+            # Call leave hook.
+            page.on_leave()
+        response = await self.aopen(*args, **kwargs)
+
+        self.response = response
+        self.url = response.url
+        if hasattr(response, 'page'):
+            self.page = response.page
+            if self.page is not None:
+                # Call load hook.
+                self.page.on_load()
+
+        # Returns self.response in case on_load recalls location()
+        return self.response
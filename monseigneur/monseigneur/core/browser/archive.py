@@ -0,0 +1,307 @@
+# -*- coding: utf-8 -*-
+
+from datetime import timedelta
+from queue import Queue, Full
+from threading import Thread
+import atexit
+import glob
+import json
+import logging
+import os
+import random
+import time
+import zlib
+
+from requests.models import Request, Response
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+__all__ = ['ResponseArchive', 'ArchiveReader', 'ArchiveEntry']
+
+
+INDEX_EXTENSION = '.idx'
+
+
+class ArchiveEntry(object):
+    """
+    Index line of an archived response.
+    """
+
+    __slots__ = ('segment', 'offset', 'length', 'time', 'status', 'content_type', 'url')
+
+    def __init__(self, segment, offset, length, time, status, content_type, url):
+        self.segment = segment
+        self.offset = int(offset)
+        self.length = int(length)
+        self.time = float(time)
+        self.status = int(status)
+        self.content_type = content_type
+        self.url = url
+
+    def __repr__(self):
+        return '<ArchiveEntry %s %d %s>' % (os.path.basename(self.segment), self.status, self.url)
+
+    def to_line(self):
+        return '%s\t%d\t%d\t%.3f\t%d\t%s\t%s\n' % (
+            os.path.basename(self.segment), self.offset, self.length, self.time, self.status, self.content_type, self.url
+        )
+
+    @classmethod
+    def from_line(cls, directory, line):
+        segment, offset, length, time, status, content_type, url = line.rstrip('\n').split('\t', 6)
+        return cls(os.path.join(directory, segment), offset, length, time, status, content_type, url)
+
+
+class ResponseArchive(object):
+    """
+    Append-only archive of responses, to use instead of one file per response.
+
+    Records are compressed one by one (zstd when `zstandard` is installed,
+    zlib otherwise) and appended to segment files, each one with an index
+    file giving the url, status and position of its records. Segments are
+    rotated once they reach `segment_size` bytes or `segment_age` seconds,
+    and only the `max_segments` most recent ones are kept.
+
+    Responses are compressed and written by a background thread. When it
+    lags behind, responses are dropped instead of slowing down the requests.
+    Only `sample_rate` of the responses are archived, plus every error when
+    `keep_errors` is true.
+
+    >>> archive = ResponseArchive('~/logging/archive', sample_rate=0.1)  # doctest: +SKIP
+    >>> browser.archive = archive  # doctest: +SKIP
+    """
+
+    SEGMENT_SIZE = 256 * 1024 ** 2
+    SEGMENT_AGE = 3600
+    QUEUE_SIZE = 1000
+    COMPRESSION_LEVEL = 3
+
+    def __init__(self, directory, sample_rate=1.0, keep_errors=True, segment_size=None, segment_age=None,
+                 max_segments=None, logger=None):
+        self.directory = os.path.expanduser(directory)
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory)
+        self.sample_rate = sample_rate
+        self.keep_errors = keep_errors
+        self.segment_size = segment_size or self.SEGMENT_SIZE
+        self.segment_age = segment_age or self.SEGMENT_AGE
+        self.max_segments = max_segments
+        self.logger = logger or logging.getLogger('archive')
+        self.dropped = 0
+
+        if zstandard is not None:
+            self.extension = '.zst'
+            self.compress = zstandard.ZstdCompressor(level=self.COMPRESSION_LEVEL).compress
+        else:
+            self.extension = '.zz'
+            self.compress = lambda data: zlib.compress(data, self.COMPRESSION_LEVEL)
+
+        self.segment = None
+        self.segment_file = None
+        self.index_file = None
+        self.segment_opened_at = None
+        self.segment_count = 0
+
+        self.queue = Queue(self.QUEUE_SIZE)
+        self.thread = Thread(target=self.run, name='response-archive', daemon=True)
+        self.thread.start()
+        atexit.register(self.close)
+
+    def should_archive(self, response):
+        if self.keep_errors and response.status_code >= 400:
+            return True
+        return self.sample_rate >= 1 or random.random() < self.sample_rate
+
+    def add(self, response):
+        """
+        Queue a response to be archived, to call from a response hook as the
+        content is read by the calling thread.
+        """
+        if self.thread is None or not self.should_archive(response):
+            return False
+        request = response.request
+        body = request.body
+        if isinstance(body, bytes):
+            body = body.decode('utf-8', 'replace')
+        header = {
+            'url': response.url,
+            'method': request.method,
+            'status': response.status_code,
+            'reason': response.reason,
+            'elapsed': response.elapsed.total_seconds() if hasattr(response.elapsed, 'total_seconds') else None,
+            'time': time.time(),
+            'request_headers': dict(request.headers),
+            'request_body': body if isinstance(body, str) else None,
+            'headers': dict(response.headers),
+        }
+        try:
+            self.queue.put_nowait((header, response.content))
+        except Full:
+            self.dropped += 1
+            return False
+        return True
+
+    def run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            try:
+                self.write(*item)
+            except Exception:
+                self.logger.exception('Unable to archive %s', item[0]['url'])
+        self.close_segment()
+
+    def write(self, header, content):
+        if self.segment is None or self.should_rotate():
+            self.rotate()
+        data = self.compress(json.dumps(header, default=str).encode('utf-8') + b'\n' + content)
+        entry = ArchiveEntry(
+            self.segment, self.segment_file.tell(), len(data), header['time'], header['status'],
+            header['headers'].get('Content-Type', '').split(';')[0], header['url'],
+        )
+        self.segment_file.write(data)
+        self.index_file.write(entry.to_line())
+        if self.queue.empty():
+            # data and index are flushed together, so that readers do not
+            # find index lines pointing after the end of a segment
+            self.segment_file.flush()
+            self.index_file.flush()
+
+    def should_rotate(self):
+        return (self.segment_file.tell() >= self.segment_size
+                or time.time() - self.segment_opened_at >= self.segment_age)
+
+    def rotate(self):
+        self.close_segment()
+        self.segment_count += 1
+        name = 'segment-%s-%d-%04d%s' % (time.strftime('%Y%m%d%H%M%S'), os.getpid(), self.segment_count, self.extension)
+        self.segment = os.path.join(self.directory, name)
+        self.segment_file = open(self.segment, 'ab')
+        self.index_file = open(self.segment + INDEX_EXTENSION, 'a', encoding='utf-8')
+        self.segment_opened_at = time.time()
+        self.prune()
+
+    def close_segment(self):
+        if self.segment_file is not None:
+            self.segment_file.close()
+            self.index_file.close()
+            self.segment_file = self.index_file = None
+
+    def prune(self):
+        if not self.max_segments:
+            return
+        for segment in ArchiveReader(self.directory).segments[:-self.max_segments]:
+            for path in (segment, segment + INDEX_EXTENSION):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def close(self):
+        """
+        Write the queued responses and close the current segment.
+        """
+        if self.thread is None:
+            return
+        self.queue.put(None)
+        self.thread.join()
+        self.thread = None
+        if self.dropped:
+            self.logger.warning('%d responses were not archived, the archive could not keep up', self.dropped)
+
+
+class ArchiveReader(object):
+    """
+    Read the responses of a :class:`ResponseArchive` directory.
+
+    >>> reader = ArchiveReader('~/logging/archive')  # doctest: +SKIP
+    >>> for entry in reader.iter_entries():  # doctest: +SKIP
+    ...     header, content = reader.read(entry)
+    """
+
+    def __init__(self, directory):
+        self.directory = os.path.expanduser(directory)
+        self._decompressors = {}
+
+    @property
+    def segments(self):
+        """Segment paths, oldest first."""
+        segments = glob.glob(os.path.join(self.directory, 'segment-*.zst'))
+        segments += glob.glob(os.path.join(self.directory, 'segment-*.zz'))
+        return sorted(segments, key=lambda path: (os.path.getmtime(path), path))
+
+    def iter_entries(self, segment=None):
+        for path in [segment] if segment else self.segments:
+            try:
+                with open(path + INDEX_EXTENSION, encoding='utf-8') as f:
+                    for line in f:
+                        if line.endswith('\n'):
+                            yield ArchiveEntry.from_line(self.directory, line)
+            except FileNotFoundError:
+                continue
+
+    def decompress(self, segment, data):
+        if segment.endswith('.zz'):
+            return zlib.decompress(data)
+        if zstandard is None:
+            raise ImportError('Please install zstandard to read %s' % segment)
+        decompressor = self._decompressors.get('zst')
+        if decompressor is None:
+            decompressor = self._decompressors['zst'] = zstandard.ZstdDecompressor()
+        return decompressor.decompress(data)
+
+    def read(self, entry):
+        """
+        Header dict and content of an archived response.
+        """
+        with open(entry.segment, 'rb') as f:
+            f.seek(entry.offset)
+            data = f.read(entry.length)
+        header, content = self.decompress(entry.segment, data).split(b'\n', 1)
+        return json.loads(header), content
+
+    def iter_read(self, entries):
+        """
+        Read several entries, opening each segment once.
+        """
+        f = None
+        try:
+            for entry in entries:
+                if f is None or f.name != entry.segment:
+                    if f is not None:
+                        f.close()
+                    f = open(entry.segment, 'rb')
+                f.seek(entry.offset)
+                header, content = self.decompress(entry.segment, f.read(entry.length)).split(b'\n', 1)
+                yield entry, json.loads(header), content
+        finally:
+            if f is not None:
+                f.close()
+
+    def build_response(self, header, content):
+        """
+        requests Response of an archived response, to build pages from.
+        """
+        request = Request(header['method'], header['url'], headers=header['request_headers']).prepare()
+        response = Response()
+        response.status_code = header['status']
+        response.reason = header['reason']
+        response.headers = CaseInsensitiveDict(header['headers'])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = header['url']
+        response.request = request
+        response._content = content
+        response._content_consumed = True
+        response.elapsed = timedelta(seconds=header['elapsed'] or 0)
+        return response
+
+    def __iter__(self):
+        for segment in self.segments:
+            for item in self.iter_read(self.iter_entries(segment)):
+                yield item
@@ -171,6 +171,9 @@ class Browser(object):
         self.delete_logs = kwargs.pop('delete_logs', True)
         self.delete_logs_limit = kwargs.pop('delete_logs_limit', 10000)
 
+        # ResponseArchive used instead of writing one file per response
+        self.archive = kwargs.pop('archive', None)
+
         self.thread_id = self.get_thread_id()
 
     def deinit(self):
@@ -194,6 +197,9 @@ class Browser(object):
         socket = None
 
     def save_custom_response(self, content, ext, precision=""):
+        if self.archive is not None:
+            # the raw response is already archived
+            return
         response_filepath = os.path.join(self.responses_dirname, "mycustomresponse-{}{}{}{}".format(precision, self.thread_id, self.custom_responses_count, ext))
         with open(response_filepath, 'w', encoding='utf-8') as f:
             f.write(content)
@@ -216,6 +222,9 @@ class Browser(object):
 
     @handle_directory_error
     def save_response(self, response, warning=False, **kwargs):
+        if self.save_logs is not False and self.archive is not None:
+            self.archive.add(response)
+            return
         if self.save_logs is not False:
             if self.responses_dirname is None:
                 if self.backend_name is None:
@@ -1,6 +1,22 @@
 # -*- coding: utf-8 -*-
 
-__all__ = ['CacheMixin']
+from datetime import timedelta
+from hashlib import sha1
+from threading import Lock
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+import io
+import json
+import os
+import re
+import sqlite3
+import time
+
+from requests.adapters import BaseAdapter
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+__all__ = ['CacheMixin', 'RequestFingerprint', 'HttpCache', 'HttpCacheAdapter']
 
 
 class CacheEntry(object):
@@ -79,3 +95,244 @@ class CacheMixin(object):
 
         self.logger.debug('cache MISS for %r', request.url)
         return response
+
+
+class RequestFingerprint(object):
+    """
+    Key of a request, computed on its method, body and URL once the
+    parameters listed in `VOLATILE_PARAMS` are removed, so that requests only
+    differing by a random token or a timestamp share the same key.
+    """
+
+    VOLATILE_PARAMS = []
+    """
+    Query parameters ignored to compute request fingerprints.
+    """
+
+    def normalize_params(self, url, params):
+        """
+        Query parameters used in the fingerprint of `url`, to override to
+        strip volatile parts of parameter values.
+        """
+        return sorted((key, value) for key, value in params if key not in self.VOLATILE_PARAMS)
+
+    def __call__(self, request):
+        parts = urlsplit(request.url)
+        params = self.normalize_params(request.url, parse_qsl(parts.query, keep_blank_values=True))
+        url = urlunsplit((parts.scheme, parts.netloc.lower(), parts.path, urlencode(params), ''))
+        body = request.body or b''
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        return sha1(b'\n'.join([request.method.encode('ascii'), url.encode('utf-8'), body])).hexdigest()
+
+
+class HttpCache(object):
+    """
+    Persistent HTTP cache stored in a SQLite database.
+
+    Responses are keyed by a :class:`RequestFingerprint`, so that requests
+    only differing by a random token or a timestamp share an entry.
+    Only valid (see `is_valid`) 200 responses of URLs which have a TTL (see
+    `TTLS`) are stored, and an entry whose page turns out to be broken can be
+    dropped with `delete`, for a retry not to be answered the same content.
+    Once the stored content goes over `max_size` bytes, expired entries
+    then least recently used ones are evicted.
+
+    The cache can be shared by the threads and the browsers of a process:
+
+    >>> cache = HttpCache('~/.cache/monseigneur/http.sqlite')  # doctest: +SKIP
+    >>> cache.install(browser.session)  # doctest: +SKIP
+    """
+
+    FINGERPRINT = RequestFingerprint
+    """
+    Class of the fingerprint keying the responses.
+    """
+
+    TTLS = []
+    """
+    List of (regex, seconds) tried in order on the URL of a request, the first
+    match giving how long its response is kept. 0 means never cached.
+    """
+
+    DEFAULT_TTL = 0
+    """
+    TTL of URLs not matched by `TTLS`.
+    """
+
+    MAX_SIZE = 1024 ** 3
+    """
+    Default bytes of content kept before evicting entries.
+    """
+
+    LOW_WATERMARK = 0.9
+    """
+    Eviction stops when the stored content is under this ratio of `max_size`.
+    """
+
+    SKIPPED_HEADERS = ('content-encoding', 'content-length', 'transfer-encoding', 'set-cookie')
+    """
+    Headers not stored, as cached contents are stored decoded and cookies are
+    not replayed.
+    """
+
+    def __init__(self, path, max_size=None):
+        self.fingerprint = self.FINGERPRINT()
+        self.path = os.path.expanduser(path)
+        if os.path.dirname(self.path) and not os.path.isdir(os.path.dirname(self.path)):
+            os.makedirs(os.path.dirname(self.path))
+        self.max_size = max_size or self.MAX_SIZE
+        self.ttls = [(re.compile(pattern), ttl) for pattern, ttl in self.TTLS]
+        self.lock = Lock()
+        self.db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        self.db.execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            'key TEXT PRIMARY KEY, url TEXT, status INTEGER, reason TEXT, headers TEXT, content BLOB, '
+            'size INTEGER, expires_at REAL, accessed_at REAL)'
+        )
+        self.db.execute('CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)')
+        self.size = self.db.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+
+    def close(self):
+        with self.lock:
+            self.db.close()
+
+    def install(self, session):
+        """
+        Wrap the adapters mounted on a session, to call once they are all mounted.
+        """
+        for prefix, adapter in list(session.adapters.items()):
+            if not isinstance(adapter, HttpCacheAdapter):
+                session.mount(prefix, HttpCacheAdapter(self, adapter))
+
+    def get_ttl(self, url):
+        for regex, ttl in self.ttls:
+            if regex.search(url):
+                return ttl
+        return self.DEFAULT_TTL
+
+    def get(self, request):
+        """
+        Cached response of `request`, None if there is none or it expired.
+        """
+        if self.get_ttl(request.url) <= 0:
+            return None
+        key = self.fingerprint(request)
+        now = time.time()
+        with self.lock:
+            row = self.db.execute(
+                'SELECT url, status, reason, headers, content FROM responses WHERE key = ? AND expires_at > ?',
+                (key, now),
+            ).fetchone()
+            if row is None:
+                return None
+            self.db.execute('UPDATE responses SET accessed_at = ? WHERE key = ?', (now, key))
+        url, status, reason, headers, content = row
+        return self.build_response(request, url, status, reason, json.loads(headers), content)
+
+    def build_response(self, request, url, status, reason, headers, content):
+        response = Response()
+        response.status_code = status
+        response.reason = reason
+        response.headers = CaseInsensitiveDict(headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = url
+        response.request = request
+        response.raw = io.BytesIO(content)
+        response._content = content
+        response._content_consumed = True
+        response.elapsed = timedelta(0)
+        response.from_cache = True
+        return response
+
+    def is_valid(self, request, response):
+        """
+        Whether the content of `response` can be stored, to override with a
+        cheap check that it is not truncated or an error page.
+        """
+        return True
+
+    def store(self, request, response):
+        if response.status_code != 200:
+            return
+        ttl = self.get_ttl(request.url)
+        if ttl <= 0:
+            return
+        key = self.fingerprint(request)
+        content = response.content
+        if not self.is_valid(request, response):
+            return
+        headers = json.dumps({
+            name: value for name, value in response.headers.items() if name.lower() not in self.SKIPPED_HEADERS
+        })
+        now = time.time()
+        with self.lock:
+            previous = self.db.execute('SELECT size FROM responses WHERE key = ?', (key,)).fetchone()
+            self.db.execute(
+                'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (key, response.url, response.status_code, response.reason, headers, content, len(content), now + ttl, now),
+            )
+            self.size += len(content) - (previous[0] if previous else 0)
+            if self.size > self.max_size:
+                self.evict(now)
+
+    def delete(self, request):
+        """
+        Drop the cached response of `request`, if any.
+        """
+        key = self.fingerprint(request)
+        with self.lock:
+            previous = self.db.execute('SELECT size FROM responses WHERE key = ?', (key,)).fetchone()
+            if previous is None:
+                return
+            self.db.execute('DELETE FROM responses WHERE key = ?', (key,))
+            self.size -= previous[0]
+
+    def evict(self, now):
+        """
+        Delete expired entries, then the least recently used ones. The lock
+        has to be held.
+        """
+        self.db.execute('DELETE FROM responses WHERE expires_at <= ?', (now,))
+        self.size = self.db.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        target = self.max_size * self.LOW_WATERMARK
+        while self.size > target:
+            rows = self.db.execute('SELECT key, size FROM responses ORDER BY accessed_at LIMIT 100').fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                self.db.execute('DELETE FROM responses WHERE key = ?', (key,))
+                self.size -= size
+                if self.size <= target:
+                    break
+
+
+class HttpCacheAdapter(BaseAdapter):
+    """
+    Transport adapter answering from an :class:`HttpCache` when possible, and
+    sending the requests with the wrapped adapter otherwise.
+
+    Session hooks still run on cached responses, so that pages are matched
+    and built the same way.
+    """
+
+    def __init__(self, cache, adapter):
+        super(HttpCacheAdapter, self).__init__()
+        self.cache = cache
+        self.adapter = adapter
+
+    def send(self, request, stream=False, **kwargs):
+        response = self.cache.get(request)
+        if response is not None:
+            response.connection = self
+            return response
+        response = self.adapter.send(request, stream=stream, **kwargs)
+        # Browser.open streams every request, the content of cacheable
+        # responses is read here instead of by the page.
+        self.cache.store(request, response)
+        return response
+
+    def close(self):
+        self.adapter.close()
@@ -23,6 +23,9 @@ from .filters.html import AttributeNotFound, XPathNotFound
 __all__ = ['DataError', 'AbstractElement', 'ListElement', 'ItemElement', 'TableElement', 'SkipItem']
 
 
+filters_logger = getLogger('b2filters')
+
+
 def generate_table_element(doc, head_xpath, cleaner=CleanText):
     """
     Prints generated base code for TableElement/TableCell usage.
@@ -354,8 +357,8 @@ class ItemElement(with_metaclass(_ItemElementMeta, AbstractElement)):
                 raise
             else:
                 value = FetchError
-        logger = getLogger('b2filters')
-        logger.log(DEBUG_FILTERS, "%s.%s = %r" % (self._random_id, key, value))
+        if filters_logger.isEnabledFor(DEBUG_FILTERS):
+            filters_logger.log(DEBUG_FILTERS, "%s.%s = %r" % (self._random_id, key, value))
         setattr(self.obj, key, value)
 
 
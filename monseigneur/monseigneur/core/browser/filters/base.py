@@ -81,9 +81,14 @@ def debug(*args):
     It prints by default the name of the Filter and the input value.
     """
     def wraper(function):
+        logger = getLogger('b2filters')
+
         @wraps(function)
         def print_debug(self, value):
-            logger = getLogger('b2filters')
+            if not logger.isEnabledFor(DEBUG_FILTERS):
+                # Formatting the input value is far more expensive than most
+                # filters, only do it when it is going to be logged.
+                return function(self, value)
             result = ''
             outputvalue = value
             if isinstance(value, list):
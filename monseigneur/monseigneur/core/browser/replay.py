@@ -0,0 +1,313 @@
+# -*- coding: utf-8 -*-
+
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock, Thread
+import io
+import logging
+import random
+import time
+
+from requests.adapters import BaseAdapter
+from requests.exceptions import ConnectionError
+from requests.models import Request, Response
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from .archive import ArchiveReader
+from .cache import RequestFingerprint
+
+__all__ = ['ReplayProfile', 'ReplayStore', 'ReplayAdapter', 'ReplayServer', 'ReplayServerAdapter']
+
+
+SKIPPED_HEADERS = ('content-encoding', 'content-length', 'transfer-encoding', 'connection')
+
+
+class ReplayProfile(object):
+    """
+    Latency and failures applied to replayed responses.
+
+    :param latency: mean delay before each response, in seconds
+    :param jitter: the delay is drawn uniformly in latency ± jitter
+    :param error_rate: ratio of responses replaced by an `error_status` response
+    :param error_status: status code of the injected errors
+    :param connection_error_rate: ratio of requests failing with a connection error
+    :param seed: seed of the draws, to replay the same failures from a run to another
+    """
+
+    def __init__(self, latency=0, jitter=0, error_rate=0, error_status=503, connection_error_rate=0, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.connection_error_rate = connection_error_rate
+        self.random = random.Random(seed)
+
+    def delay(self):
+        return max(0, self.latency + self.random.uniform(-self.jitter, self.jitter))
+
+    def draw_failure(self):
+        """
+        'connection' for a connection error, a status code for an error
+        response, None to replay the recorded response.
+        """
+        draw = self.random.random()
+        if draw < self.connection_error_rate:
+            return 'connection'
+        if draw < self.connection_error_rate + self.error_rate:
+            return self.error_status
+        return None
+
+
+class ReplayStore(object):
+    """
+    Recorded responses, keyed by the :class:`RequestFingerprint` of their request.
+
+    A request recorded several times gets its responses in turn. Records are
+    the header dicts and contents written by a :class:`ResponseArchive`, so
+    that a run recorded with an archive can be replayed as is.
+
+    >>> store = ReplayStore()
+    >>> store.load_archive('~/logging/archive')  # doctest: +SKIP
+    """
+
+    def __init__(self, fingerprint=None):
+        self.fingerprint = fingerprint or RequestFingerprint()
+        self.records = {}
+        self.positions = {}
+        self.lock = Lock()
+
+    def __len__(self):
+        return sum(len(records) for records in self.records.values())
+
+    def add(self, header, content):
+        request = Request(
+            header.get('method', 'GET'), header['url'],
+            headers=header.get('request_headers'), data=header.get('request_body'),
+        ).prepare()
+        self.records.setdefault(self.fingerprint(request), []).append((header, content))
+
+    def add_response(self, url, content, status=200, headers=None, method='GET', body=None, reason='OK'):
+        """
+        Record a response built by hand, e.g. by a benchmark.
+        """
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        self.add({
+            'url': url,
+            'method': method,
+            'status': status,
+            'reason': reason,
+            'request_body': body,
+            'headers': headers or {},
+        }, content)
+
+    def load_archive(self, directory):
+        """
+        Record the responses of a :class:`ResponseArchive` directory, returns
+        how many were loaded.
+        """
+        count = 0
+        for entry, header, content in ArchiveReader(directory):
+            self.add(header, content)
+            count += 1
+        return count
+
+    def get(self, request):
+        """
+        Header dict and content recorded for `request`, None if there is none.
+        """
+        records = self.records.get(self.fingerprint(request))
+        if not records:
+            return None
+        key = id(records)
+        with self.lock:
+            position = self.positions.get(key, 0)
+            self.positions[key] = position + 1
+        return records[position % len(records)]
+
+
+class ReplayAdapter(BaseAdapter):
+    """
+    Transport adapter answering every request from a :class:`ReplayStore`,
+    without any network access.
+
+    Requests which were not recorded get a 404 response and are counted in
+    `misses`. Session hooks still run on replayed responses, so that pages
+    are matched and built the same way.
+
+    >>> adapter = ReplayAdapter(store, ReplayProfile(latency=0.2, jitter=0.1))  # doctest: +SKIP
+    >>> adapter.install(browser.session)  # doctest: +SKIP
+    """
+
+    MISSING_STATUS = 404
+
+    def __init__(self, store, profile=None):
+        super(ReplayAdapter, self).__init__()
+        self.store = store
+        self.profile = profile or ReplayProfile()
+        self.misses = 0
+
+    def install(self, session):
+        session.mount('https://', self)
+        session.mount('http://', self)
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        delay = self.profile.delay()
+        if delay:
+            time.sleep(delay)
+        failure = self.profile.draw_failure()
+        if failure == 'connection':
+            raise ConnectionError('Replayed connection error', request=request)
+        if failure is not None:
+            return self.build_response(request, failure, 'Replayed Error', {}, b'', request.url, delay)
+
+        record = self.store.get(request)
+        if record is None:
+            self.misses += 1
+            return self.build_response(request, self.MISSING_STATUS, 'Not Recorded', {}, b'', request.url, delay)
+        header, content = record
+        return self.build_response(
+            request, header['status'], header.get('reason'), header.get('headers') or {}, content, request.url, delay,
+        )
+
+    def build_response(self, request, status, reason, headers, content, url, elapsed=0):
+        response = Response()
+        response.status_code = status
+        response.reason = reason
+        response.headers = CaseInsensitiveDict(
+            (name, value) for name, value in headers.items() if name.lower() not in SKIPPED_HEADERS
+        )
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = url
+        response.request = request
+        response.raw = io.BytesIO(content)
+        response._content = content
+        response._content_consumed = True
+        response.elapsed = timedelta(seconds=elapsed)
+        response.connection = self
+        return response
+
+    def close(self):
+        pass
+
+
+class ReplayServer(object):
+    """
+    Local HTTP server replaying a :class:`ReplayStore`, for benchmarks going
+    through real sockets and connection pools.
+
+    The original URL is given as the path, e.g.
+    ``http://127.0.0.1:8000/https://www.google.com/search?tbm=map``; once
+    installed on a session, requests are rewritten this way by a
+    :class:`ReplayServerAdapter`. Connection errors close the connection
+    without answering.
+
+    >>> server = ReplayServer(store, ReplayProfile(latency=0.2)).start()  # doctest: +SKIP
+    >>> server.install(browser.session)  # doctest: +SKIP
+    """
+
+    def __init__(self, store, profile=None, host='127.0.0.1', port=0, logger=None):
+        self.store = store
+        self.profile = profile or ReplayProfile()
+        self.logger = logger or logging.getLogger('replay')
+        self.misses = 0
+        self.httpd = ThreadingHTTPServer((host, port), self.make_handler())
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return 'http://%s:%d' % (host, port)
+
+    def make_handler(self):
+        server = self
+
+        class ReplayHandler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format, *args):
+                server.logger.debug(format, *args)
+
+            def handle_one(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                body = self.rfile.read(length) if length else None
+                request = Request(self.command, self.path[1:], data=body).prepare()
+
+                delay = server.profile.delay()
+                if delay:
+                    time.sleep(delay)
+                failure = server.profile.draw_failure()
+                if failure == 'connection':
+                    self.close_connection = True
+                    return
+                if failure is not None:
+                    return self.reply(failure, {}, b'')
+
+                record = server.store.get(request)
+                if record is None:
+                    server.misses += 1
+                    return self.reply(ReplayAdapter.MISSING_STATUS, {}, b'')
+                header, content = record
+                self.reply(header['status'], header.get('headers') or {}, content)
+
+            def reply(self, status, headers, content):
+                self.send_response(status)
+                for name, value in headers.items():
+                    if name.lower() not in SKIPPED_HEADERS:
+                        self.send_header(name, value)
+                self.send_header('Content-Length', str(len(content)))
+                self.end_headers()
+                if self.command != 'HEAD':
+                    self.wfile.write(content)
+
+            do_GET = do_POST = do_HEAD = do_PUT = do_DELETE = handle_one
+
+        return ReplayHandler
+
+    def start(self):
+        self.thread = Thread(target=self.httpd.serve_forever, name='replay-server', daemon=True)
+        self.thread.start()
+        return self
+
+    def install(self, session):
+        """
+        Send the requests of a session to this server, to call once its
+        adapters are all mounted.
+        """
+        for prefix, adapter in list(session.adapters.items()):
+            if not isinstance(adapter, ReplayServerAdapter):
+                session.mount(prefix, ReplayServerAdapter(self.url, adapter))
+
+    def stop(self):
+        if self.thread is not None:
+            self.httpd.shutdown()
+            self.thread.join()
+            self.thread = None
+        self.httpd.server_close()
+
+
+class ReplayServerAdapter(BaseAdapter):
+    """
+    Transport adapter sending requests to a :class:`ReplayServer` with the
+    wrapped adapter, responses keeping the original URL.
+    """
+
+    def __init__(self, server_url, adapter):
+        super(ReplayServerAdapter, self).__init__()
+        self.server_url = server_url
+        self.adapter = adapter
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        local = request.copy()
+        local.url = '%s/%s' % (self.server_url, request.url)
+        # the recorded Host header would be sent to the local server otherwise
+        local.headers.pop('Host', None)
+        response = self.adapter.send(local, stream=stream, timeout=timeout, verify=verify, cert=cert, proxies={})
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        self.adapter.close()
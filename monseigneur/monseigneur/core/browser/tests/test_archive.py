@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+
+from datetime import timedelta
+from unittest import TestCase
+import os
+import shutil
+import tempfile
+
+from requests.models import Request, Response
+from requests.structures import CaseInsensitiveDict
+
+from monseigneur.monseigneur.core.browser.archive import ResponseArchive, ArchiveReader
+
+
+def make_response(url, content, status=200, method='GET', data=None):
+    response = Response()
+    response.status_code = status
+    response.reason = 'OK'
+    response.headers = CaseInsensitiveDict({'Content-Type': 'text/html; charset=utf-8'})
+    response.url = url
+    response.request = Request(method, url, data=data).prepare()
+    response._content = content
+    response._content_consumed = True
+    response.elapsed = timedelta(seconds=0.25)
+    return response
+
+
+class ResponseArchiveTest(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_round_trip(self):
+        archive = ResponseArchive(self.directory)
+        self.assertTrue(archive.add(make_response('https://example.com/a', b'<html>a</html>')))
+        self.assertTrue(archive.add(make_response('https://example.com/b', b'form', method='POST', data={'q': '1'})))
+        archive.close()
+
+        reader = ArchiveReader(self.directory)
+        items = list(reader)
+        self.assertEqual([entry.url for entry, header, content in items], ['https://example.com/a', 'https://example.com/b'])
+        entry, header, content = items[0]
+        self.assertEqual(content, b'<html>a</html>')
+        self.assertEqual(entry.status, 200)
+        self.assertEqual(entry.content_type, 'text/html')
+        self.assertEqual(reader.read(entry), (header, content))
+        entry, header, content = items[1]
+        self.assertEqual(header['method'], 'POST')
+        self.assertEqual(header['request_body'], 'q=1')
+
+        response = reader.build_response(header, content)
+        self.assertEqual(response.content, b'form')
+        self.assertEqual(response.request.method, 'POST')
+        self.assertEqual(response.encoding, 'utf-8')
+        self.assertEqual(response.elapsed, timedelta(seconds=0.25))
+
+    def test_sampling_keeps_errors(self):
+        archive = ResponseArchive(self.directory, sample_rate=0)
+        self.assertFalse(archive.add(make_response('https://example.com/a', b'a')))
+        self.assertTrue(archive.add(make_response('https://example.com/b', b'b', status=503)))
+        archive.close()
+        self.assertEqual([entry.url for entry in ArchiveReader(self.directory).iter_entries()], ['https://example.com/b'])
+
+    def test_rotation_and_pruning(self):
+        archive = ResponseArchive(self.directory, segment_size=1, max_segments=2)
+        for index in range(4):
+            archive.add(make_response('https://example.com/%d' % index, b'content'))
+        archive.close()
+        reader = ArchiveReader(self.directory)
+        self.assertEqual(len(reader.segments), 2)
+        self.assertEqual([entry.url for entry in reader.iter_entries()], ['https://example.com/2', 'https://example.com/3'])
+
+    def test_add_after_close(self):
+        archive = ResponseArchive(self.directory)
+        archive.close()
+        self.assertFalse(archive.add(make_response('https://example.com/a', b'a')))
@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+
+from unittest import TestCase, mock
+import os
+import shutil
+import tempfile
+
+from requests.models import Request, Response
+from requests.structures import CaseInsensitiveDict
+
+from monseigneur.monseigneur.core.browser.cache import HttpCache, HttpCacheAdapter, RequestFingerprint
+
+
+class MyHttpCache(HttpCache):
+    TTLS = [
+        (r'^https://example\.com/never', 0),
+        (r'^https://example\.com/', 60),
+    ]
+
+
+class MyFingerprint(RequestFingerprint):
+    VOLATILE_PARAMS = ['token']
+
+
+class MyMockAdapter(object):
+    def __init__(self, status=200, content=b'<html></html>'):
+        self.status = status
+        self.content = content
+        self.sent = 0
+
+    def send(self, request, **kwargs):
+        self.sent += 1
+        return make_response(request, self.status, self.content)
+
+    def close(self):
+        pass
+
+
+def make_request(url, method='GET', data=None):
+    return Request(method, url, data=data).prepare()
+
+
+def make_response(request, status=200, content=b'<html></html>'):
+    response = Response()
+    response.status_code = status
+    response.reason = 'OK'
+    response.headers = CaseInsensitiveDict({'Content-Type': 'text/html', 'Set-Cookie': 'a=b'})
+    response.url = request.url
+    response.request = request
+    response._content = content
+    response._content_consumed = True
+    return response
+
+
+class RequestFingerprintTest(TestCase):
+
+    def test_volatile_params_are_ignored(self):
+        fingerprint = MyFingerprint()
+        self.assertEqual(
+            fingerprint(make_request('https://example.com/a?b=1&token=x')),
+            fingerprint(make_request('https://example.com/a?token=y&b=1')),
+        )
+
+    def test_method_and_body_are_kept(self):
+        fingerprint = RequestFingerprint()
+        self.assertNotEqual(
+            fingerprint(make_request('https://example.com/a')),
+            fingerprint(make_request('https://example.com/a', 'POST', {'q': 1})),
+        )
+
+
+class HttpCacheTest(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache = MyHttpCache(os.path.join(self.directory, 'http.sqlite'))
+
+    def tearDown(self):
+        self.cache.close()
+        shutil.rmtree(self.directory)
+
+    def test_store_and_get(self):
+        request = make_request('https://example.com/page')
+        self.cache.store(request, make_response(request, content=b'cached'))
+        response = self.cache.get(make_request('https://example.com/page'))
+        self.assertEqual(response.content, b'cached')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.from_cache)
+        self.assertNotIn('Set-Cookie', response.headers)
+        self.assertEqual(self.cache.size, len(b'cached'))
+
+    def test_ttl_zero_and_errors_are_not_stored(self):
+        request = make_request('https://example.com/never')
+        self.cache.store(request, make_response(request))
+        self.assertIsNone(self.cache.get(request))
+        request = make_request('https://other.com/')
+        self.cache.store(request, make_response(request))
+        self.assertIsNone(self.cache.get(request))
+        request = make_request('https://example.com/error')
+        self.cache.store(request, make_response(request, status=500))
+        self.assertIsNone(self.cache.get(request))
+
+    def test_expired_entries_are_not_returned(self):
+        request = make_request('https://example.com/page')
+        with mock.patch('monseigneur.monseigneur.core.browser.cache.time') as fake_time:
+            fake_time.time.return_value = 1000
+            self.cache.store(request, make_response(request))
+            fake_time.time.return_value = 1059
+            self.assertIsNotNone(self.cache.get(request))
+            fake_time.time.return_value = 1060
+            self.assertIsNone(self.cache.get(request))
+
+    def test_invalid_responses_are_not_stored(self):
+        request = make_request('https://example.com/page')
+        with mock.patch.object(MyHttpCache, 'is_valid', return_value=False):
+            self.cache.store(request, make_response(request))
+        self.assertIsNone(self.cache.get(request))
+
+    def test_delete(self):
+        request = make_request('https://example.com/page')
+        self.cache.store(request, make_response(request))
+        self.cache.delete(make_request('https://example.com/page'))
+        self.assertIsNone(self.cache.get(request))
+        self.assertEqual(self.cache.size, 0)
+        # deleting a missing entry is a no-op
+        self.cache.delete(request)
+
+    def test_eviction(self):
+        self.cache.max_size = 100
+        with mock.patch('monseigneur.monseigneur.core.browser.cache.time') as fake_time:
+            for index in range(5):
+                fake_time.time.return_value = 1000 + index
+                request = make_request('https://example.com/%d' % index)
+                self.cache.store(request, make_response(request, content=b'x' * 30))
+            self.assertLessEqual(self.cache.size, 100 * MyHttpCache.LOW_WATERMARK)
+            # least recently used first
+            self.assertIsNone(self.cache.get(make_request('https://example.com/0')))
+            self.assertIsNotNone(self.cache.get(make_request('https://example.com/4')))
+
+
+class HttpCacheAdapterTest(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache = MyHttpCache(os.path.join(self.directory, 'http.sqlite'))
+
+    def tearDown(self):
+        self.cache.close()
+        shutil.rmtree(self.directory)
+
+    def test_second_request_is_answered_from_cache(self):
+        wrapped = MyMockAdapter(content=b'page')
+        adapter = HttpCacheAdapter(self.cache, wrapped)
+        adapter.send(make_request('https://example.com/page'))
+        response = adapter.send(make_request('https://example.com/page'))
+        self.assertEqual(wrapped.sent, 1)
+        self.assertEqual(response.content, b'page')
+        self.assertIs(response.connection, adapter)
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+
+from datetime import timedelta
+from unittest import TestCase
+import shutil
+import tempfile
+
+import requests
+from requests.models import Request, Response
+from requests.structures import CaseInsensitiveDict
+
+from monseigneur.monseigneur.core.browser.archive import ResponseArchive
+from monseigneur.monseigneur.core.browser.replay import ReplayProfile, ReplayStore, ReplayAdapter, ReplayServer
+
+
+class ReplayStoreTest(TestCase):
+
+    def test_round_robin(self):
+        store = ReplayStore()
+        store.add_response('https://example.com/a', 'first')
+        store.add_response('https://example.com/a', 'second')
+        request = Request('GET', 'https://example.com/a').prepare()
+        contents = [store.get(request)[1] for _ in range(3)]
+        self.assertEqual(contents, [b'first', b'second', b'first'])
+        self.assertEqual(len(store), 2)
+
+    def test_miss(self):
+        store = ReplayStore()
+        store.add_response('https://example.com/a', 'a')
+        self.assertIsNone(store.get(Request('GET', 'https://example.com/b').prepare()))
+        self.assertIsNone(store.get(Request('POST', 'https://example.com/a', data={'q': 1}).prepare()))
+
+    def test_load_archive(self):
+        directory = tempfile.mkdtemp()
+        try:
+            archive = ResponseArchive(directory)
+            response = Response()
+            response.status_code = 200
+            response.reason = 'OK'
+            response.headers = CaseInsensitiveDict({'Content-Type': 'text/html'})
+            response.url = 'https://example.com/a'
+            response.request = Request('GET', response.url).prepare()
+            response._content = b'archived'
+            response.elapsed = timedelta(0)
+            archive.add(response)
+            archive.close()
+
+            store = ReplayStore()
+            self.assertEqual(store.load_archive(directory), 1)
+            self.assertEqual(store.get(Request('GET', 'https://example.com/a').prepare())[1], b'archived')
+        finally:
+            shutil.rmtree(directory)
+
+
+class ReplayAdapterTest(TestCase):
+
+    def setUp(self):
+        self.store = ReplayStore()
+        self.store.add_response('https://example.com/a', 'a', headers={'Content-Type': 'text/html', 'Content-Length': '1'})
+        self.session = requests.Session()
+
+    def test_replay_and_miss(self):
+        adapter = ReplayAdapter(self.store)
+        adapter.install(self.session)
+        response = self.session.get('https://example.com/a')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.text, 'a')
+        self.assertNotIn('Content-Length', response.headers)
+        response = self.session.get('https://example.com/b')
+        self.assertEqual(response.status_code, ReplayAdapter.MISSING_STATUS)
+        self.assertEqual(adapter.misses, 1)
+
+    def test_profile_failures(self):
+        ReplayAdapter(self.store, ReplayProfile(error_rate=1, error_status=429)).install(self.session)
+        self.assertEqual(self.session.get('https://example.com/a').status_code, 429)
+        ReplayAdapter(self.store, ReplayProfile(connection_error_rate=1)).install(self.session)
+        self.assertRaises(requests.exceptions.ConnectionError, self.session.get, 'https://example.com/a')
+
+    def test_profile_delay(self):
+        profile = ReplayProfile(latency=0.1, jitter=0.05, seed=0)
+        delays = [profile.delay() for _ in range(100)]
+        self.assertTrue(all(0.05 <= delay <= 0.15 for delay in delays))
+        self.assertEqual(ReplayProfile(latency=0.1, jitter=0.05, seed=0).delay(), delays[0])
+
+
+class ReplayServerTest(TestCase):
+
+    def test_replay_through_sockets(self):
+        store = ReplayStore()
+        store.add_response('https://example.com/a?b=1', 'served', headers={'Content-Type': 'text/plain'})
+        server = ReplayServer(store).start()
+        try:
+            session = requests.Session()
+            server.install(session)
+            response = session.get('https://example.com/a?b=1')
+            self.assertEqual(response.text, 'served')
+            self.assertEqual(response.url, 'https://example.com/a?b=1')
+            self.assertEqual(session.get('https://example.com/missing').status_code, 404)
+        finally:
+            server.stop()
@@ -48,13 +48,33 @@ def setup_environment():
 def parse_arguments():
     """Parse command line arguments"""
     parser = argparse.ArgumentParser(description="Google Maps Scraper")
+    parser.add_argument("command", nargs="?", default="scrape", choices=["scrape", "reparse", "bench"], help="scrape a URL, reparse the responses of --archive-dir, or run the benchmarks (default: scrape)")
     parser.add_argument("--url", type=str, help="Google Maps URL to scrape")
     parser.add_argument("--language", type=str, default="en", help="Language code (default: en)")
     parser.add_argument("--country", type=str, default="US", help="Country code (default: US)")
     parser.add_argument("--rating", type=str, default="Any rating", help="Rating filter (default: Any rating)")
     parser.add_argument("--collect-contact", action="store_true", help="Collect contact information from websites")
+    parser.add_argument("--tiling", action="store_true", help="Split the search area into tiles to go past the 200 results limit")
+    parser.add_argument("--speculative", action="store_true", help="Request all the listing pages at once instead of one after the other")
+    parser.add_argument("--http-cache", type=str, help="SQLite file caching responses across runs (default: no cache)")
+    parser.add_argument("--contact-targets", type=str, help="Contacts after which a website is not visited any further, e.g. professional_mail,facebook,instagram (default: every contact link is visited)")
+    parser.add_argument("--contact-cache", type=str, help="SQLite file caching the contacts of each website domain across runs (default: no cache)")
+    parser.add_argument("--contact-cache-ttl", type=int, help="Seconds during which cached contacts are reused (default: 7 days)")
+    parser.add_argument("--archive-dir", type=str, help="Archive responses in compressed segments in this directory instead of one file per response")
+    parser.add_argument("--archive-sample-rate", type=float, default=1.0, help="Ratio of responses archived, errors are always archived (default: 1.0)")
+    parser.add_argument("--replay-dir", type=str, help="Answer requests from the responses archived in this directory, without any network access")
+    parser.add_argument("--replay-latency", type=float, default=0, help="Mean delay of the replayed responses, in seconds (default: 0)")
+    parser.add_argument("--replay-jitter", type=float, default=0, help="Replayed responses are delayed by latency +/- jitter seconds (default: 0)")
+    parser.add_argument("--replay-error-rate", type=float, default=0, help="Ratio of replayed responses replaced by a 503 error (default: 0)")
+    parser.add_argument("--replay-server", action="store_true", help="Replay through a local HTTP server instead of an in-process adapter")
+    parser.add_argument("--workers", type=int, help="Processes used by reparse (default: number of CPUs)")
+    parser.add_argument("--bench", action="append", help="Benchmark run by bench, can be repeated (default: all of them)")
+    parser.add_argument("--baseline", type=str, help="Baseline file the benchmarks are compared to (default: bench/baselines.json)")
+    parser.add_argument("--save-baseline", action="store_true", help="Store the benchmark measures as the new baseline")
+    parser.add_argument("--threshold", type=float, help="Relative change of a benchmark metric reported as a regression (default: 0.25)")
     parser.add_argument("--output", type=str, help="Output filename (default: timestamped filename)")
     parser.add_argument("--output-dir", type=str, default="results", help="Output directory (default: results)")
+    parser.add_argument("--format", type=str, default="csv", choices=["csv", "jsonl", "parquet"], help="Output format, parquet requires pyarrow (default: csv)")
     
     return parser.parse_args()
 
@@ -77,6 +97,37 @@ def main():
         logger.error(f"  pip install -r requirements-{system}.txt")
         sys.exit(1)
     
+    # Run the benchmarks and compare them to the baseline
+    if args.command == "bench":
+        from bench.suite import main as run_benchmarks
+        try:
+            sys.exit(run_benchmarks(args.bench, args.baseline, args.save_baseline, args.threshold))
+        except ValueError as e:
+            logger.error(str(e))
+            sys.exit(1)
+
+    # Extract results again from archived responses
+    if args.command == "reparse":
+        if not args.archive_dir:
+            logger.error("No archive provided. Please specify the archive directory with --archive-dir")
+            sys.exit(1)
+        try:
+            backend = Backend(collect_contact=args.collect_contact)
+            output_path = backend.reparse(
+                args.archive_dir,
+                filename=args.output,
+                directory=args.output_dir,
+                format=args.format,
+                workers=args.workers
+            )
+            logger.info(f"Results saved to: {output_path}")
+        except Exception as e:
+            logger.error(f"Error reparsing archive: {str(e)}")
+            import traceback
+            logger.error(traceback.format_exc())
+            sys.exit(1)
+        return
+
     # Run scraper
     try:
         logger.info("Initializing Google Maps Scraper")
@@ -84,7 +135,20 @@ def main():
             language=args.language,
             country=args.country,
             default_rating=args.rating,
-            collect_contact=args.collect_contact
+            collect_contact=args.collect_contact,
+            tiling=args.tiling,
+            speculative=args.speculative,
+            http_cache=args.http_cache,
+            contact_targets=args.contact_targets,
+            contact_cache=args.contact_cache,
+            contact_cache_ttl=args.contact_cache_ttl,
+            archive_dir=args.archive_dir,
+            archive_sample_rate=args.archive_sample_rate,
+            replay_dir=args.replay_dir,
+            replay_latency=args.replay_latency,
+            replay_jitter=args.replay_jitter,
+            replay_error_rate=args.replay_error_rate,
+            replay_server=args.replay_server
         )
         
         if not args.url:
@@ -94,26 +158,30 @@ def main():
         logger.info(f"Scraping URL: {args.url}")
         backend.go_results(args.url)
         
-        total_pages = backend.module.get_total_pages()
+        # Only the first listing page is fetched so far, the next ones are listed while iterating
         total_results = backend.module.get_total_results()
-        logger.info(f"Found {total_results} results across {total_pages} pages")
+        logger.info(f"Found {total_results} results listed so far")
         
-        # Collect results
-        all_results = []
-        for result in backend.iter_results():
-            all_results.append(result)
-            logger.info(f"Processed: {result.name}")
-        
-        # Save results
-        if all_results:
-            csv_path = backend.save_to_csv(
-                all_results,
-                filename=args.output,
-                directory=args.output_dir
-            )
-            logger.info(f"Results saved to: {csv_path}")
-        else:
-            logger.warning("No results found to save")
+        # Stream results to the output file as they are processed
+        processed = 0
+
+        def processed_results():
+            nonlocal processed
+            for result in backend.iter_results():
+                logger.info(f"Processed: {result.name}")
+                processed += 1
+                yield result
+
+        output_path = backend.save_results(
+            processed_results(),
+            filename=args.output,
+            directory=args.output_dir,
+            format=args.format
+        )
+        # save_results leaves no file for a search without results
+        if output_path:
+            logger.info(f"Found {processed} results in total")
+            logger.info(f"Results saved to: {output_path}")
         
     except Exception as e:
         logger.error(f"Error running scraper: {str(e)}")